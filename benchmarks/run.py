@@ -0,0 +1,506 @@
+"""Throughput benchmarks of the client against the in-process fake Firefly API.
+
+Run from the repository root::
+
+    python -m benchmarks.run --sizes 1000 10000 100000 --output bench.json
+    python -m benchmarks.run --sizes 1000 --baseline bench.json
+
+Every benchmark reports the best of ``--repeat`` runs. With ``--baseline``
+the results are compared with an earlier JSON report and the process exits
+with status 1 if any benchmark got slower by more than ``--tolerance``.
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+from fireflyiii_enricher_core.batch import TransactionUpdate, apply_updates
+from fireflyiii_enricher_core.codec import iter_compact_transactions
+from fireflyiii_enricher_core.filters import (
+    filter_by_description,
+    filter_single_part,
+    filter_without_category,
+    iter_compact,
+    simplify_transactions,
+)
+from fireflyiii_enricher_core.firefly_client import FireflyClient
+from fireflyiii_enricher_core.matcher import (
+    FuzzyTransactionMatcher,
+    IndexedTransactionMatcher,
+    TransactionMatcher,
+)
+from fireflyiii_enricher_core.models import SimplifiedItem
+from fireflyiii_enricher_core.parallel import reconcile
+from fireflyiii_enricher_core.retry import RetryPolicy
+from fireflyiii_enricher_core.rules import DescriptionRule, RuleSet
+from tests.fake_firefly import FakeFirefly, make_transaction
+
+ROOT = Path(__file__).resolve().parent.parent
+TOKEN = "benchmark-token"
+FAST_RETRY = RetryPolicy(max_attempts=10, backoff_base=0.001, backoff_max=0.01)
+
+# Statements timed in a fresh interpreter by the ``imports`` benchmark.
+IMPORT_STATEMENTS = {
+    "interpreter": "pass",
+    "package": "import fireflyiii_enricher_core",
+    "models": "from fireflyiii_enricher_core import SimplifiedTx, iter_simplified",
+    "matcher": "from fireflyiii_enricher_core.matcher import FuzzyTransactionMatcher",
+    "client": "from fireflyiii_enricher_core import FireflyClient",
+}
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class BenchConfig:
+    """Parameters of a benchmark run."""
+
+    sizes: List[int] = field(default_factory=lambda: [1000, 10000, 100000])
+    page_size: int = 1000
+    latency: float = 0.0
+    throttle_every: int = 10
+    updates: int = 200
+    max_workers: int = 8
+    naive_sample: int = 20
+    processes: int = os.cpu_count() or 1
+    rules: int = 200
+    repeat: int = 3
+
+
+@dataclass
+class BenchResult:
+    """Timing of one benchmark at one dataset size."""
+
+    name: str
+    size: int
+    items: int
+    seconds: float
+    mean_seconds: float
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        """Identifier used to compare results between runs."""
+        return f"{self.name}@{self.size}"
+
+    @property
+    def items_per_second(self) -> float:
+        """Throughput of the best run."""
+        return self.items / self.seconds if self.seconds else 0.0
+
+
+def measure(
+    name: str,
+    size: int,
+    items: int,
+    func: Callable[[], Any],
+    repeat: int,
+    **params: Any,
+) -> BenchResult:
+    """Run ``func`` ``repeat`` times and keep the best and mean duration."""
+    durations = []
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started)
+    return BenchResult(
+        name, size, items, min(durations), sum(durations) / len(durations), params
+    )
+
+
+def bench_fetch(config: BenchConfig, size: int) -> List[BenchResult]:
+    """Paginated fetching: sequential, parallel, sharded, compact, lean, throttled."""
+    results = []
+    params = {"page_size": config.page_size, "latency": config.latency}
+    with FakeFirefly(
+        transactions=size, page_size=config.page_size, latency=config.latency
+    ) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            results.append(
+                measure(
+                    "fetch_sequential",
+                    size,
+                    size,
+                    lambda: client.fetch_transactions(limit=config.page_size),
+                    config.repeat,
+                    **params,
+                )
+            )
+            results.append(
+                measure(
+                    "fetch_parallel",
+                    size,
+                    size,
+                    lambda: client.fetch_transactions(
+                        limit=config.page_size,
+                        parallel=True,
+                        max_workers=config.max_workers,
+                    ),
+                    config.repeat,
+                    max_workers=config.max_workers,
+                    **params,
+                )
+            )
+            results.append(
+                measure(
+                    "fetch_sharded",
+                    size,
+                    size,
+                    lambda: list(
+                        client.iter_transactions_sharded(
+                            limit=config.page_size,
+                            start_date=date(2024, 1, 1),
+                            end_date=date(2024, 12, 31),
+                            max_workers=config.max_workers,
+                        )
+                    ),
+                    config.repeat,
+                    max_workers=config.max_workers,
+                    **params,
+                )
+            )
+            results.append(
+                measure(
+                    "fetch_compact",
+                    size,
+                    size,
+                    lambda: list(
+                        iter_compact(client.iter_transactions(limit=config.page_size))
+                    ),
+                    config.repeat,
+                    **params,
+                )
+            )
+            results.append(
+                measure(
+                    "fetch_compact_lean",
+                    size,
+                    size,
+                    lambda: list(
+                        iter_compact_transactions(client, limit=config.page_size)
+                    ),
+                    config.repeat,
+                    **params,
+                )
+            )
+    if config.throttle_every:
+        with FakeFirefly(
+            transactions=size,
+            page_size=config.page_size,
+            latency=config.latency,
+            throttle_every=config.throttle_every,
+        ) as server:
+            with FireflyClient(server.url, TOKEN, retry_policy=FAST_RETRY) as client:
+                results.append(
+                    measure(
+                        "fetch_throttled",
+                        size,
+                        size,
+                        lambda: client.fetch_transactions(
+                            limit=config.page_size, parallel=True
+                        ),
+                        config.repeat,
+                        throttle_every=config.throttle_every,
+                        **params,
+                    )
+                )
+    return results
+
+
+def bench_updates(config: BenchConfig, size: int) -> List[BenchResult]:
+    """Single-transaction update methods and the concurrent batch updater."""
+    count = min(config.updates, size)
+    ids = list(range(1, count + 1))
+    with FakeFirefly(transactions=size, latency=config.latency) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            counter = iter(range(sys.maxsize))
+
+            def sequential() -> None:
+                run = next(counter)
+                for tx_id in ids:
+                    client.update_transaction_notes(tx_id, f"run {run}")
+
+            def batched() -> None:
+                run = next(counter)
+                apply_updates(
+                    client,
+                    [(tx_id, TransactionUpdate(notes=f"run {run}")) for tx_id in ids],
+                    max_workers=config.max_workers,
+                )
+
+            return [
+                measure(
+                    "update_notes_sequential",
+                    size,
+                    count,
+                    sequential,
+                    config.repeat,
+                    latency=config.latency,
+                ),
+                measure(
+                    "update_notes_batch",
+                    size,
+                    count,
+                    batched,
+                    config.repeat,
+                    latency=config.latency,
+                    max_workers=config.max_workers,
+                ),
+            ]
+
+
+def bench_pipeline(config: BenchConfig, size: int) -> List[BenchResult]:
+    """The filter/simplify pipeline and description rules on raw items."""
+    transactions = [make_transaction(i) for i in range(size)]
+    rules = [
+        DescriptionRule(f"shop {i}", category=f"Category {i}")
+        for i in range(config.rules)
+    ]
+    return [
+        measure(
+            "filter_simplify",
+            size,
+            size,
+            lambda: simplify_transactions(
+                filter_single_part(filter_without_category(transactions))
+            ),
+            config.repeat,
+        ),
+        measure(
+            "rules_per_pattern",
+            size,
+            size,
+            lambda: [
+                filter_by_description(transactions, rule.pattern, exact_match=False)
+                for rule in rules
+            ],
+            config.repeat,
+            rules=config.rules,
+        ),
+        measure(
+            "rules_compiled",
+            size,
+            size,
+            lambda: list(RuleSet(rules).classify(transactions)),
+            config.repeat,
+            rules=config.rules,
+        ),
+        measure(
+            "rules_compiled_uncached",
+            size,
+            size,
+            lambda: list(RuleSet(rules, cache_size=0).classify(transactions)),
+            config.repeat,
+            rules=config.rules,
+        ),
+    ]
+
+
+def bench_matchers(config: BenchConfig, size: int) -> List[BenchResult]:
+    """Naive, indexed, fuzzy and multi-process matching of ``size`` records."""
+    raw = [make_transaction(i) for i in range(size)]
+    transactions = simplify_transactions(raw)
+    records = [SimplifiedItem(tx.date, -tx.amount) for tx in transactions]
+    sample = transactions[: config.naive_sample]
+    return [
+        # The naive matcher scans every record per transaction, so only a
+        # sample is timed; ``items`` is the number of matched transactions.
+        measure(
+            "match_naive",
+            size,
+            len(sample),
+            lambda: [TransactionMatcher.match(tx, records) for tx in sample],
+            config.repeat,
+            sample=len(sample),
+        ),
+        measure(
+            "match_indexed",
+            size,
+            size,
+            lambda: IndexedTransactionMatcher(records).match_all(transactions),
+            config.repeat,
+        ),
+        measure(
+            "match_fuzzy",
+            size,
+            size,
+            lambda: FuzzyTransactionMatcher(records, date_window=3).match_all(
+                transactions
+            ),
+            config.repeat,
+            date_window=3,
+        ),
+        measure(
+            "reconcile_single_process",
+            size,
+            size,
+            lambda: reconcile(raw, records, date_window=3, processes=1),
+            config.repeat,
+            date_window=3,
+        ),
+        measure(
+            "reconcile_process_pool",
+            size,
+            size,
+            lambda: reconcile(raw, records, date_window=3, processes=config.processes),
+            config.repeat,
+            date_window=3,
+            processes=config.processes,
+        ),
+    ]
+
+
+def bench_imports(config: BenchConfig) -> List[BenchResult]:
+    """
+    Startup latency of each :data:`IMPORT_STATEMENTS` entry in a new interpreter.
+
+    The ``interpreter`` entry times a bare start-up, so the cost of an import
+    is its difference from that one. Results do not depend on the dataset
+    size and are reported with size 0.
+    """
+    results = []
+    for name, statement in IMPORT_STATEMENTS.items():
+        command = [sys.executable, "-c", statement]
+        results.append(
+            measure(
+                f"import_{name}",
+                0,
+                1,
+                functools.partial(subprocess.run, command, check=True, cwd=ROOT),
+                config.repeat,
+                statement=statement,
+            )
+        )
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[BenchConfig, int], List[BenchResult]]] = {
+    "fetch": bench_fetch,
+    "updates": bench_updates,
+    "pipeline": bench_pipeline,
+    "matchers": bench_matchers,
+}
+
+# Benchmarks independent of the dataset size, run once per report.
+STARTUP_BENCHMARKS: Dict[str, Callable[[BenchConfig], List[BenchResult]]] = {
+    "imports": bench_imports,
+}
+
+
+def run_benchmarks(
+    config: BenchConfig, only: Sequence[str] | None = None
+) -> Dict[str, Any]:
+    """Run the selected benchmark groups and return the JSON report."""
+    results: List[BenchResult] = []
+    for group, startup_bench in STARTUP_BENCHMARKS.items():
+        if not only or group in only:
+            results.extend(startup_bench(config))
+    for size in config.sizes:
+        for group, bench in BENCHMARKS.items():
+            if only and group not in only:
+                continue
+            results.extend(bench(config, size))
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": asdict(config),
+        },
+        "results": [
+            {
+                **asdict(result),
+                "key": result.key,
+                "items_per_second": result.items_per_second,
+            }
+            for result in results
+        ],
+    }
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.25
+) -> List[str]:
+    """
+    Return a message for every benchmark slower than in ``baseline``.
+
+    A benchmark regresses when its best time exceeds the baseline's by more
+    than ``tolerance`` (a fraction). Benchmarks missing from either report
+    are ignored.
+    """
+    previous = {result["key"]: result for result in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        old = previous.get(result["key"])
+        if old is None or not old["seconds"]:
+            continue
+        ratio = result["seconds"] / old["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{result['key']}: {old['seconds']:.4f}s -> "
+                f"{result['seconds']:.4f}s ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Command line entry point."""
+    defaults = BenchConfig()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=defaults.sizes)
+    parser.add_argument(
+        "--only", nargs="+", choices=sorted({**BENCHMARKS, **STARTUP_BENCHMARKS})
+    )
+    parser.add_argument("--page-size", type=int, default=defaults.page_size)
+    parser.add_argument("--latency", type=float, default=defaults.latency)
+    parser.add_argument("--throttle-every", type=int, default=defaults.throttle_every)
+    parser.add_argument("--updates", type=int, default=defaults.updates)
+    parser.add_argument("--max-workers", type=int, default=defaults.max_workers)
+    parser.add_argument("--naive-sample", type=int, default=defaults.naive_sample)
+    parser.add_argument("--processes", type=int, default=defaults.processes)
+    parser.add_argument("--rules", type=int, default=defaults.rules)
+    parser.add_argument("--repeat", type=int, default=defaults.repeat)
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    parser.add_argument("--baseline", help="JSON report to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    config = BenchConfig(
+        sizes=args.sizes,
+        page_size=args.page_size,
+        latency=args.latency,
+        throttle_every=args.throttle_every,
+        updates=args.updates,
+        max_workers=args.max_workers,
+        naive_sample=args.naive_sample,
+        processes=args.processes,
+        rules=args.rules,
+        repeat=args.repeat,
+    )
+    report = run_benchmarks(config, args.only)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            regressions = compare(report, json.load(handle), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
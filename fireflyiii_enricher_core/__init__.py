@@ -1,3 +1,185 @@
-"""Version information for Firefly III Enricher Core."""
+"""Version information and lazily loaded public API of Firefly III Enricher Core.
+
+Every public name is importable from the package root, but its module is only
+imported on first access: ``from fireflyiii_enricher_core import
+SimplifiedTx`` does not load ``requests``, while ``FireflyClient`` does.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
 
 __version__ = "0.1.0"
+
+_EXPORTS: Dict[str, str] = {
+    # Standard library only, by module in dependency order.
+    "CompactSplit": "models",
+    "CompactTx": "models",
+    "MatchKey": "models",
+    "Matchable": "models",
+    "SimplifiedCategory": "models",
+    "SimplifiedItem": "models",
+    "SimplifiedTx": "models",
+    "SplitKey": "models",
+    "to_minor_units": "models",
+    "filter_by_description": "filters",
+    "filter_single_part": "filters",
+    "filter_without_category": "filters",
+    "filter_without_tag": "filters",
+    "iter_by_description": "filters",
+    "iter_compact": "filters",
+    "iter_simplified": "filters",
+    "iter_single_part": "filters",
+    "iter_splits": "filters",
+    "iter_without_category": "filters",
+    "iter_without_tag": "filters",
+    "simplify_splits": "filters",
+    "simplify_transactions": "filters",
+    "IdenticalDataError": "updates",
+    "category_change": "updates",
+    "description_change": "updates",
+    "notes_change": "updates",
+    "split_update": "updates",
+    "tag_change": "updates",
+    "update_payload": "updates",
+    "FuzzyTransactionMatcher": "matcher",
+    "IndexedTransactionMatcher": "matcher",
+    "TransactionMatcher": "matcher",
+    "TransactionQuery": "search",
+    "TransactionUpdate": "batch",
+    "apply_updates": "batch",
+    "CheckpointLog": "jobs",
+    "run_job": "jobs",
+    "execute_plan": "planner",
+    "plan_updates": "planner",
+    "DescriptionRule": "rules",
+    "RuleSet": "rules",
+    "ReconcileMatch": "parallel",
+    "reconcile": "parallel",
+    "LatencyAggregator": "instrumentation",
+    "ResponseCache": "http_cache",
+    "get_decoder": "codec",
+    "parse_transaction_page": "codec",
+    # Modules importing requests.
+    "RetryPolicy": "retry",
+    "FireflyClient": "firefly_client",
+}
+
+__all__ = [
+    "__version__",
+    "CheckpointLog",
+    "CompactSplit",
+    "CompactTx",
+    "DescriptionRule",
+    "FireflyClient",
+    "FuzzyTransactionMatcher",
+    "IdenticalDataError",
+    "IndexedTransactionMatcher",
+    "LatencyAggregator",
+    "MatchKey",
+    "Matchable",
+    "ReconcileMatch",
+    "ResponseCache",
+    "RetryPolicy",
+    "RuleSet",
+    "SimplifiedCategory",
+    "SimplifiedItem",
+    "SimplifiedTx",
+    "SplitKey",
+    "TransactionMatcher",
+    "TransactionQuery",
+    "TransactionUpdate",
+    "apply_updates",
+    "category_change",
+    "description_change",
+    "execute_plan",
+    "filter_by_description",
+    "filter_single_part",
+    "filter_without_category",
+    "filter_without_tag",
+    "get_decoder",
+    "iter_by_description",
+    "iter_compact",
+    "iter_simplified",
+    "iter_single_part",
+    "iter_splits",
+    "iter_without_category",
+    "iter_without_tag",
+    "notes_change",
+    "parse_transaction_page",
+    "plan_updates",
+    "reconcile",
+    "run_job",
+    "simplify_splits",
+    "simplify_transactions",
+    "split_update",
+    "tag_change",
+    "to_minor_units",
+    "update_payload",
+]
+
+if TYPE_CHECKING:
+    from fireflyiii_enricher_core.batch import TransactionUpdate, apply_updates
+    from fireflyiii_enricher_core.codec import get_decoder, parse_transaction_page
+    from fireflyiii_enricher_core.filters import (
+        filter_by_description,
+        filter_single_part,
+        filter_without_category,
+        filter_without_tag,
+        iter_by_description,
+        iter_compact,
+        iter_simplified,
+        iter_single_part,
+        iter_splits,
+        iter_without_category,
+        iter_without_tag,
+        simplify_splits,
+        simplify_transactions,
+    )
+    from fireflyiii_enricher_core.firefly_client import FireflyClient
+    from fireflyiii_enricher_core.http_cache import ResponseCache
+    from fireflyiii_enricher_core.instrumentation import LatencyAggregator
+    from fireflyiii_enricher_core.jobs import CheckpointLog, run_job
+    from fireflyiii_enricher_core.matcher import (
+        FuzzyTransactionMatcher,
+        IndexedTransactionMatcher,
+        TransactionMatcher,
+    )
+    from fireflyiii_enricher_core.models import (
+        CompactSplit,
+        CompactTx,
+        Matchable,
+        MatchKey,
+        SimplifiedCategory,
+        SimplifiedItem,
+        SimplifiedTx,
+        SplitKey,
+        to_minor_units,
+    )
+    from fireflyiii_enricher_core.parallel import ReconcileMatch, reconcile
+    from fireflyiii_enricher_core.planner import execute_plan, plan_updates
+    from fireflyiii_enricher_core.retry import RetryPolicy
+    from fireflyiii_enricher_core.rules import DescriptionRule, RuleSet
+    from fireflyiii_enricher_core.search import TransactionQuery
+    from fireflyiii_enricher_core.updates import (
+        IdenticalDataError,
+        category_change,
+        description_change,
+        notes_change,
+        split_update,
+        tag_change,
+        update_payload,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    """Import the module defining ``name`` on first access and cache the value."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,232 @@
+# pylint: disable=duplicate-code
+"""Asyncio variant of :class:`FireflyClient` built on ``httpx``.
+
+Requires the optional ``async`` extra (``pip install fireflyiii-enricher-core[async]``).
+"""
+
+import asyncio
+from collections import deque
+from datetime import date
+from typing import Any, AsyncGenerator, Deque, Dict, List
+
+import httpx
+
+from fireflyiii_enricher_core.models import SimplifiedCategory
+from fireflyiii_enricher_core.updates import (
+    IdenticalDataError,
+    category_change,
+    description_change,
+    notes_change,
+    split_update,
+    tag_change,
+    update_payload,
+)
+
+
+class AsyncFireflyClient:
+    """Asynchronous wrapper around the Firefly III REST API.
+
+    All requests share one :class:`httpx.AsyncClient` connection pool and at most
+    ``concurrency`` requests are in flight at any time, so hundreds of updates
+    can be scheduled with :func:`asyncio.gather` without flooding the server.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        *,
+        timeout: float = 10,
+        concurrency: int = 10,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 20,
+    ) -> None:
+        """
+        Create an asynchronous client bound to a Firefly III instance.
+
+        Args:
+            base_url (str): Root URL of the Firefly III instance.
+            token (str): Personal access token.
+            timeout (float, optional): Request timeout in seconds. Defaults to 10.
+            concurrency (int, optional): Maximum number of requests in flight.
+                Defaults to 10.
+            max_connections (int, optional): Size of the connection pool.
+                Defaults to 20.
+            max_keepalive_connections (int, optional): Idle connections kept
+                open for reuse. Defaults to 20.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.headers = {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/vnd.api+json",
+            "Content-Type": "application/vnd.api+json",
+        }
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.session = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
+
+    async def __aenter__(self) -> "AsyncFireflyClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the shared connection pool."""
+        await self.session.aclose()
+
+    async def _safe_request(self, method: str, url: str, **kwargs: Any) -> Any:
+        try:
+            async with self._semaphore:
+                response = await self.session.request(method, url, **kwargs)
+            response.raise_for_status()
+            try:
+                return response.json()
+            except ValueError as exc:
+                raise RuntimeError("Failed to parse JSON response") from exc
+
+        except httpx.TimeoutException as exc:
+            raise RuntimeError("Request timed out") from exc
+        except httpx.ConnectError as exc:
+            raise RuntimeError("Connection failed") from exc
+        except httpx.HTTPStatusError as exc:
+            raise RuntimeError(f"HTTP error: {exc}") from exc
+        except httpx.HTTPError as exc:
+            raise RuntimeError(f"Request failed: {exc}") from exc
+
+    async def _iter_pages(
+        self, url: str, params: Dict[str, Any]
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Yield the ``data`` list of every page of a paginated endpoint, in order.
+
+        Once ``meta.pagination.total_pages`` is known from the first page the
+        remaining pages are requested concurrently, at most ``concurrency``
+        pages ahead of the consumer; otherwise ``links.next`` is followed page
+        by page.
+        """
+        params = {**params, "page": 1}
+        data = await self._safe_request("get", url, params=params)
+        yield data["data"]
+
+        total_pages = data.get("meta", {}).get("pagination", {}).get("total_pages")
+        if isinstance(total_pages, int):
+            # A sliding window of tasks, like the sync client's futures, keeps
+            # the pages in flight (and their documents) bounded.
+            pending: Deque["asyncio.Task[Any]"] = deque()
+            next_page = 2
+            try:
+                while pending or next_page <= total_pages:
+                    while next_page <= total_pages and len(pending) < self.concurrency:
+                        pending.append(
+                            asyncio.ensure_future(
+                                self._safe_request(
+                                    "get", url, params={**params, "page": next_page}
+                                )
+                            )
+                        )
+                        next_page += 1
+                    page_data = await pending.popleft()
+                    yield page_data["data"]
+            finally:
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+            return
+
+        page = 1
+        while data["links"].get("next"):
+            page += 1
+            data = await self._safe_request("get", url, params={**params, "page": page})
+            yield data["data"]
+
+    async def fetch_transactions(
+        self,
+        tx_type: str = "withdrawal",
+        limit: int = 1000,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Retrieve transactions of the given type."""
+        url = f"{self.base_url}/api/v1/transactions"
+        params: Dict[str, Any] = {"limit": limit, "type": tx_type}
+        if start_date:
+            params["start"] = start_date.isoformat()
+        if end_date:
+            params["end"] = end_date.isoformat()
+        transactions: List[Dict[str, Any]] = []
+        async for page_data in self._iter_pages(url, params):
+            transactions.extend(page_data)
+        return transactions
+
+    async def fetch_categories(
+        self, limit: int = 1000, simplified: bool = False
+    ) -> List[Dict[str, Any]] | List[SimplifiedCategory]:
+        """Retrieve categories, optionally as :class:`SimplifiedCategory`."""
+        url = f"{self.base_url}/api/v1/categories"
+        categories: List[Dict[str, Any]] = []
+        async for page_data in self._iter_pages(url, {"limit": limit}):
+            categories.extend(page_data)
+        if not simplified:
+            return categories
+        return [SimplifiedCategory.from_api_dict(category) for category in categories]
+
+    async def _put(
+        self, url: str, existing: Dict[str, Any], changes: Dict[str, Any]
+    ) -> Any:
+        """Write split changes to the first split of ``existing``."""
+        payload = update_payload(split_update(existing, changes, None))
+        return await self._safe_request("put", url, json=payload)
+
+    async def update_transaction_description(
+        self, transaction_id: int, new_description: str
+    ) -> Any:
+        """Change the description field for a given transaction."""
+        url = f"{self.base_url}/api/v1/transactions/{transaction_id}"
+        response = await self._safe_request("get", url)
+        changes = description_change(response, new_description)
+        return await self._put(url, response, changes)
+
+    async def update_transaction_notes(
+        self, transaction_id: int, new_notes: str
+    ) -> Any:
+        """Replace the notes for a given transaction."""
+        url = f"{self.base_url}/api/v1/transactions/{transaction_id}"
+        response = await self._safe_request("get", url)
+        changes = notes_change(response, new_notes)
+        return await self._put(url, response, changes)
+
+    async def assign_transaction_category(
+        self, transaction_id: int, new_category_id: int
+    ) -> Any:
+        """Assign a category to a given transaction."""
+        url = f"{self.base_url}/api/v1/transactions/{transaction_id}"
+        response = await self._safe_request("get", url)
+        changes = category_change(response, new_category_id)
+        return await self._put(url, response, changes)
+
+    async def add_tag_to_transaction(self, transaction_id: int, new_tag: str) -> Any:
+        """
+        Attach a tag to the specified transaction.
+
+        If the transaction already has the tag, nothing is written and the
+        current transaction is returned.
+        """
+        url = f"{self.base_url}/api/v1/transactions/{transaction_id}"
+        response = await self._safe_request("get", url)
+        try:
+            changes = tag_change(response, new_tag)
+        except IdenticalDataError:
+            return response
+        await self._put(url, response, changes)
+        response["data"]["attributes"]["transactions"][0].update(changes)
+        return response
@@ -0,0 +1,226 @@
+"""Apply many transaction updates concurrently."""
+
+import copy
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Mapping, Tuple
+
+from fireflyiii_enricher_core.updates import (
+    IdenticalDataError,
+    category_change,
+    description_change,
+    notes_change,
+    split_update,
+    tag_change,
+)
+
+if TYPE_CHECKING:
+    from fireflyiii_enricher_core.firefly_client import FireflyClient
+
+
+class UpdateStatus(str, Enum):
+    """Outcome of a single update in a batch."""
+
+    APPLIED = "applied"
+    SKIPPED_IDENTICAL = "skipped-identical"
+    FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class TransactionUpdate:
+    """
+    Changes to apply to one transaction; unset fields are left untouched.
+
+    ``category_name`` is resolved to ``category_id`` through the client's
+    category registry before the update is applied. ``split_index`` targets
+    one split of a multi-split transaction (for example
+    ``CompactSplit.split_index``); by default the first split is changed and
+    tags require a single-part transaction.
+    """
+
+    description: str | None = None
+    notes: str | None = None
+    category_id: int | None = None
+    tag: str | None = None
+    category_name: str | None = None
+    split_index: int | None = None
+
+    def split_changes(self, existing: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compute the split changes against the ``existing`` transaction document.
+
+        Fields whose value is already current are left out.
+
+        Raises:
+            IdenticalDataError: If no field would change.
+            RuntimeError: If a change cannot be applied to the transaction.
+        """
+        description, notes = self.description, self.notes
+        category_id, tag = self.category_id, self.tag
+        split_index = self.split_index
+        index = split_index or 0
+        steps: List[Callable[[Dict[str, Any]], Dict[str, Any]]] = []
+        if description is not None:
+            steps.append(lambda doc: description_change(doc, description, index))
+        if notes is not None:
+            steps.append(lambda doc: notes_change(doc, notes, index))
+        if category_id is not None:
+            steps.append(lambda doc: category_change(doc, category_id, index))
+        if tag is not None:
+            steps.append(lambda doc: tag_change(doc, tag, split_index))
+        if not steps:
+            raise ValueError("TransactionUpdate does not change anything")
+
+        changes: Dict[str, Any] = {}
+        for step in steps:
+            try:
+                changes.update(step(existing))
+            except IdenticalDataError:
+                continue
+        if not changes:
+            raise IdenticalDataError("New data is identical to the current one.")
+        return changes
+
+
+@dataclass
+class UpdateResult:
+    """Per-item report of a batch update."""
+
+    transaction_id: str
+    update: TransactionUpdate
+    status: UpdateStatus
+    error: str | None = None
+    response: Any = None
+
+
+def _index_known(known: Iterable[Dict[str, Any]] | None) -> Dict[str, Dict[str, Any]]:
+    if known is None:
+        return {}
+    return {str(tx["id"]): tx for tx in known}
+
+
+def _resolve_category(
+    client: "FireflyClient", update: TransactionUpdate
+) -> TransactionUpdate:
+    if update.category_name is None:
+        return update
+    category_id = client.categories.resolve(update.category_name)
+    return replace(update, category_id=int(category_id))
+
+
+def _apply_group(
+    client: "FireflyClient",
+    transaction_id: str,
+    items: List[Tuple[int, TransactionUpdate]],
+    known: Mapping[str, Dict[str, Any]],
+) -> List[Tuple[int, UpdateResult]]:
+    """Apply all updates of one transaction sequentially."""
+    results: List[Tuple[int, UpdateResult]] = []
+    document: Dict[str, Any] | None = None
+    if transaction_id in known:
+        document = {"data": known[transaction_id]}
+    for position, update in items:
+        try:
+            resolved = _resolve_category(client, update)
+            if document is None:
+                document = client.get_transaction(transaction_id)
+            # Work on a copy so a failed PUT leaves the known state untouched.
+            candidate = copy.deepcopy(document)
+            changes = resolved.split_changes(candidate)
+            response = client.put_transaction(
+                transaction_id, split_update(candidate, changes, resolved.split_index)
+            )
+        except IdenticalDataError as exc:
+            result = UpdateResult(
+                transaction_id, update, UpdateStatus.SKIPPED_IDENTICAL, str(exc)
+            )
+        except (RuntimeError, ValueError, KeyError) as exc:
+            result = UpdateResult(transaction_id, update, UpdateStatus.FAILED, str(exc))
+        else:
+            splits = candidate.get("data", {}).get("attributes", {}).get("transactions")
+            if splits:
+                splits[update.split_index or 0].update(changes)
+            document = candidate
+            if transaction_id in known:
+                known[transaction_id]["attributes"] = document["data"]["attributes"]
+            result = UpdateResult(
+                transaction_id, update, UpdateStatus.APPLIED, response=response
+            )
+        results.append((position, result))
+    return results
+
+
+# pylint: disable=too-many-locals
+def apply_updates(
+    client: "FireflyClient",
+    updates: Iterable[Tuple[int | str, TransactionUpdate]],
+    known: Iterable[Dict[str, Any]] | None = None,
+    max_workers: int = 8,
+    on_result: Callable[[UpdateResult], None] | None = None,
+) -> List[UpdateResult]:
+    """
+    Apply many transaction updates concurrently.
+
+    Updates are grouped per transaction: each group runs sequentially so that
+    several changes to the same transaction never race, while different
+    transactions are updated in parallel on ``max_workers`` threads.
+
+    Transactions listed in ``known`` (raw items as returned by
+    :meth:`FireflyClient.fetch_transactions`) are checked against that
+    in-memory state instead of being fetched again, so each of them costs a
+    single PUT. After a successful update the known item is refreshed.
+
+    Args:
+        client (FireflyClient): Client used to send the requests.
+        updates (Iterable[Tuple[int | str, TransactionUpdate]]): Transaction id
+            and the change to apply to it.
+        known (Iterable[Dict[str, Any]] | None, optional): Already fetched raw
+            transactions. Defaults to `None`.
+        max_workers (int, optional): Number of worker threads. Defaults to 8.
+        on_result (Callable[[UpdateResult], None] | None, optional): Called on
+            the calling thread with each result as soon as its transaction's
+            group has finished. Defaults to `None`.
+
+    Returns:
+        List[UpdateResult]: One result per update, in input order.
+
+    Examples:
+        transactions = client.fetch_transactions()
+        apply_updates(
+            client,
+            [(tx["id"], TransactionUpdate(tag="processed")) for tx in transactions],
+            known=transactions,
+        )
+
+        # Tag every uncategorized split, including those of split transactions.
+        apply_updates(
+            client,
+            [
+                (split.transaction_id,
+                 TransactionUpdate(tag="todo", split_index=split.split_index))
+                for split in simplify_splits(transactions)
+                if split.category_id is None
+            ],
+            known=transactions,
+        )
+    """
+    known_by_id = _index_known(known)
+    groups: Dict[str, List[Tuple[int, TransactionUpdate]]] = {}
+    total = 0
+    for position, (transaction_id, update) in enumerate(updates):
+        groups.setdefault(str(transaction_id), []).append((position, update))
+        total = position + 1
+
+    ordered: List[UpdateResult | None] = [None] * total
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_apply_group, client, tx_id, items, known_by_id)
+            for tx_id, items in groups.items()
+        ]
+        for future in as_completed(futures):
+            for position, result in future.result():
+                ordered[position] = result
+                if on_result is not None:
+                    on_result(result)
+    return [result for result in ordered if result is not None]
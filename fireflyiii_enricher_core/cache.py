@@ -0,0 +1,352 @@
+"""Local SQLite cache of Firefly III transactions with incremental sync."""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from fireflyiii_enricher_core.filters import simplify_transactions
+from fireflyiii_enricher_core.firefly_client import FireflyClient
+from fireflyiii_enricher_core.instrumentation import instrumented
+from fireflyiii_enricher_core.models import SimplifiedTx
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT PRIMARY KEY,
+    tx_type TEXT NOT NULL,
+    date TEXT NOT NULL,
+    updated_at TEXT,
+    cached_at REAL NOT NULL,
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_type_date ON transactions (tx_type, date);
+CREATE TABLE IF NOT EXISTS sync_state (
+    tx_type TEXT PRIMARY KEY,
+    synced_until TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters of a :class:`TransactionCache`.
+
+    ``hits``/``misses`` count single-transaction lookups, ``writes`` the rows
+    (re)written and ``unchanged`` the downloaded rows skipped because their
+    ``updated_at`` had not changed.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    unchanged: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class SyncReport:
+    """Outcome of a :meth:`CachingFireflyClient.sync` call."""
+
+    tx_type: str
+    start_date: date | None
+    fetched: int
+    written: int
+
+
+def _split(raw: Dict[str, Any]) -> Dict[str, Any]:
+    splits: List[Dict[str, Any]] = raw.get("attributes", {}).get("transactions", [])
+    return splits[0] if splits else {}
+
+
+class TransactionCache:
+    """
+    On-disk store of raw Firefly transactions keyed by transaction id.
+
+    Rows are only rewritten when the ``updated_at`` attribute of the incoming
+    transaction differs from the cached one. The cache is safe to share
+    between threads.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path (str | Path): SQLite file, or a directory in which
+                ``transactions.sqlite`` is created.
+        """
+        path = Path(path)
+        if path.is_dir():
+            path = path / "transactions.sqlite"
+        self.path = path
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "TransactionCache":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(
+                self._db.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+            )
+
+    def store(self, transactions: Iterable[Dict[str, Any]], tx_type: str = "") -> int:
+        """
+        Insert or refresh raw transactions.
+
+        Args:
+            transactions (Iterable[Dict[str, Any]]): Raw JSON:API transactions.
+            tx_type (str, optional): Type used when a transaction does not carry
+                one itself. Defaults to ``""``.
+
+        Returns:
+            int: Number of rows that were written.
+        """
+        written = 0
+        now = time.time()
+        with self._lock, self._db:
+            for raw in transactions:
+                tx_id = str(raw["id"])
+                updated_at = raw.get("attributes", {}).get("updated_at")
+                row = self._db.execute(
+                    "SELECT updated_at FROM transactions WHERE id = ?", (tx_id,)
+                ).fetchone()
+                if row is not None and updated_at is not None and row[0] == updated_at:
+                    self.stats.unchanged += 1
+                    continue
+                sub = _split(raw)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO transactions "
+                    "(id, tx_type, date, updated_at, cached_at, raw) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        tx_id,
+                        sub.get("type") or tx_type,
+                        str(sub.get("date", ""))[:10],
+                        updated_at,
+                        now,
+                        json.dumps(raw),
+                    ),
+                )
+                written += 1
+            self.stats.writes += written
+        return written
+
+    def get(self, transaction_id: int | str) -> Dict[str, Any] | None:
+        """Return the cached raw transaction, or `None` on a miss."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT raw FROM transactions WHERE id = ?", (str(transaction_id),)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+        result: Dict[str, Any] = json.loads(row[0])
+        return result
+
+    def transactions(
+        self,
+        tx_type: str = "withdrawal",
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Return cached raw transactions of a type, newest first."""
+        query = "SELECT raw FROM transactions WHERE tx_type = ?"
+        params: List[Any] = [tx_type]
+        if start_date:
+            query += " AND date >= ?"
+            params.append(start_date.isoformat())
+        if end_date:
+            query += " AND date <= ?"
+            params.append(end_date.isoformat())
+        query += " ORDER BY date DESC, CAST(id AS INTEGER) DESC"
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def simplified(
+        self,
+        tx_type: str = "withdrawal",
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> List[SimplifiedTx]:
+        """Return cached transactions of a type as :class:`SimplifiedTx`."""
+        return simplify_transactions(self.transactions(tx_type, start_date, end_date))
+
+    def synced_until(self, tx_type: str) -> date | None:
+        """Return the date up to which ``tx_type`` has been synced."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT synced_until FROM sync_state WHERE tx_type = ?", (tx_type,)
+            ).fetchone()
+        return date.fromisoformat(row[0]) if row else None
+
+    def mark_synced(self, tx_type: str, until: date) -> None:
+        """Remember that ``tx_type`` is complete up to ``until``."""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                (tx_type, until.isoformat(), time.time()),
+            )
+
+    def invalidate(self, transaction_id: int | str) -> None:
+        """Drop a single transaction from the cache."""
+        with self._lock, self._db:
+            self._db.execute(
+                "DELETE FROM transactions WHERE id = ?", (str(transaction_id),)
+            )
+
+    def clear(self, tx_type: str | None = None) -> None:
+        """Drop all (or all of one type) cached transactions and sync state."""
+        with self._lock, self._db:
+            if tx_type is None:
+                self._db.execute("DELETE FROM transactions")
+                self._db.execute("DELETE FROM sync_state")
+            else:
+                self._db.execute(
+                    "DELETE FROM transactions WHERE tx_type = ?", (tx_type,)
+                )
+                self._db.execute("DELETE FROM sync_state WHERE tx_type = ?", (tx_type,))
+
+    def evict_before(self, before: date) -> int:
+        """Drop transactions dated before ``before``; return the number removed."""
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "DELETE FROM transactions WHERE date < ?", (before.isoformat(),)
+            )
+        return cursor.rowcount
+
+    def evict_stale(self, max_age: float) -> int:
+        """Drop rows cached more than ``max_age`` seconds ago."""
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "DELETE FROM transactions WHERE cached_at < ?", (time.time() - max_age,)
+            )
+        return cursor.rowcount
+
+
+class CachingFireflyClient(FireflyClient):
+    """
+    :class:`FireflyClient` that keeps a local copy of the transaction history.
+
+    The first :meth:`fetch_transactions` downloads the whole history; later
+    calls only fetch the window starting ``overlap_days`` before the last sync
+    and rewrite rows whose ``updated_at`` changed. Updates sent through the
+    client's own update methods are written through to the cache.
+
+    Edits to transactions older than the overlap window, and deletions, are
+    not seen by an incremental sync; call :meth:`sync` with ``full=True``
+    periodically (or :meth:`TransactionCache.invalidate`) to pick them up.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        cache: TransactionCache,
+        *,
+        overlap_days: int = 7,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(base_url, token, **kwargs)
+        self.cache = cache
+        self.overlap_days = overlap_days
+
+    def sync(
+        self,
+        tx_type: str = "withdrawal",
+        limit: int = 1000,
+        full: bool = False,
+        **fetch_kwargs: Any,
+    ) -> SyncReport:
+        """
+        Bring the cache up to date with the server.
+
+        Args:
+            tx_type (str, optional): Transaction type. Defaults to "withdrawal".
+            limit (int, optional): Page size. Defaults to 1000.
+            full (bool, optional): Re-download the whole history.
+                Defaults to `False`.
+            **fetch_kwargs: Passed to :meth:`FireflyClient.iter_transactions`
+                (``parallel``, ``max_workers``).
+
+        Returns:
+            SyncReport: Number of transactions fetched and rows written.
+        """
+        today = date.today()
+        synced_until = None if full else self.cache.synced_until(tx_type)
+        start = (
+            synced_until - timedelta(days=self.overlap_days) if synced_until else None
+        )
+        fetched = written = 0
+        stream = self.iter_transactions(
+            tx_type, limit, start_date=start, **fetch_kwargs
+        )
+        # Store page-sized chunks so the database lock is never held while
+        # waiting on the network.
+        while chunk := list(islice(stream, limit)):
+            fetched += len(chunk)
+            written += self.cache.store(chunk, tx_type)
+        self.cache.mark_synced(tx_type, today)
+        return SyncReport(tx_type, start, fetched, written)
+
+    @instrumented
+    # pylint: disable=too-many-arguments
+    def fetch_transactions(
+        self,
+        tx_type: str = "withdrawal",
+        limit: int = 1000,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        *,
+        parallel: bool = False,
+        max_workers: int = 4,
+    ) -> List[Dict[str, Any]]:
+        """Sync incrementally, then return transactions from the cache."""
+        self.sync(tx_type, limit, parallel=parallel, max_workers=max_workers)
+        return self.cache.transactions(tx_type, start_date, end_date)
+
+    def put_transaction(
+        self,
+        transaction_id: int | str,
+        changes: Dict[str, Any] | List[Dict[str, Any]],
+        *,
+        apply_rules: bool = True,
+        fire_webhooks: bool = True,
+    ) -> Any:
+        """Send the update and write the returned transaction to the cache."""
+        response = super().put_transaction(
+            transaction_id,
+            changes,
+            apply_rules=apply_rules,
+            fire_webhooks=fire_webhooks,
+        )
+        if isinstance(response, dict) and isinstance(response.get("data"), dict):
+            self.cache.store([response["data"]])
+        else:
+            self.cache.invalidate(transaction_id)
+        return response
@@ -0,0 +1,215 @@
+"""Pluggable JSON decoders and a lean parser for transaction pages.
+
+``orjson`` and ``msgspec`` are optional (``pip install
+fireflyiii-enricher-core[fast]``); without them everything falls back to the
+standard library.
+"""
+
+import functools
+import json
+import sys
+from datetime import date
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List
+
+from fireflyiii_enricher_core.models import CompactTx, to_minor_units
+
+if TYPE_CHECKING:
+    from fireflyiii_enricher_core.firefly_client import FireflyClient
+
+JsonDecoder = Callable[[bytes], Any]
+
+DECODERS = ("orjson", "msgspec", "json")
+
+
+def _load_decoder(name: str) -> JsonDecoder:
+    """Import the decoder ``name``, one of :data:`DECODERS`."""
+    if name == "json":
+        return json.loads
+    # pylint: disable=import-outside-toplevel
+    if name == "orjson":
+        import orjson
+
+        return orjson.loads  # pylint: disable=no-member
+    import msgspec
+
+    decode = msgspec.json.Decoder().decode
+
+    def loads(data: bytes) -> Any:
+        try:
+            return decode(data)
+        except msgspec.DecodeError as exc:
+            # Match json/orjson, whose decode errors are ValueErrors.
+            raise ValueError(str(exc)) from exc
+
+    return loads
+
+
+@functools.lru_cache(maxsize=None)
+def get_decoder(name: str = "auto") -> JsonDecoder:
+    """
+    Return a ``bytes -> object`` JSON decoder.
+
+    Args:
+        name (str, optional): ``"orjson"``, ``"msgspec"``, ``"json"`` or
+            ``"auto"`` for the fastest installed one. Defaults to "auto".
+
+    Raises:
+        ValueError: If ``name`` is not a known decoder.
+        ImportError: If the requested decoder is not installed.
+    """
+    if name not in ("auto", *DECODERS):
+        raise ValueError(f"Unknown JSON decoder: {name!r} (expected one of {DECODERS})")
+    # The standard library decoder comes last and always imports.
+    candidates = DECODERS if name == "auto" else (name,)
+    for candidate in candidates[:-1]:
+        try:
+            return _load_decoder(candidate)
+        except ImportError:
+            continue
+    return _load_decoder(candidates[-1])
+
+
+def _compact(tx_id: str, sub: Any) -> CompactTx:
+    """Build a :class:`CompactTx` from a decoded split struct."""
+    return CompactTx(
+        id=tx_id,
+        date_ordinal=date.fromisoformat(sub.date[:10]).toordinal(),
+        amount_minor=to_minor_units(sub.amount),
+        description=sub.description,
+        tags=tuple(sub.tags or ()),
+        notes=sub.notes or "",
+        category=sys.intern(sub.category_name or ""),
+    )
+
+
+def _page(
+    data: List[CompactTx], total_pages: int | None, next_link: str | None
+) -> Dict[str, Any]:
+    return {
+        "data": data,
+        "meta": {"pagination": {"total_pages": total_pages}},
+        "links": {"next": next_link},
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _msgspec_page_decoder() -> Callable[[bytes], Any]:
+    """Build a typed msgspec decoder that skips every field we do not read."""
+    import msgspec  # pylint: disable=import-outside-toplevel
+
+    # pylint: disable=too-few-public-methods,missing-class-docstring
+
+    class Split(msgspec.Struct, frozen=True):
+        date: str
+        amount: str
+        description: str
+        tags: List[str] | None = None
+        notes: str | None = None
+        category_name: str | None = None
+
+    class Attributes(msgspec.Struct, frozen=True):
+        transactions: List[Split]
+
+    class Item(msgspec.Struct, frozen=True):
+        id: str
+        attributes: Attributes
+
+    class Pagination(msgspec.Struct, frozen=True):
+        total_pages: int | None = None
+
+    class Meta(msgspec.Struct, frozen=True):
+        pagination: Pagination = Pagination()
+
+    class Links(msgspec.Struct, frozen=True):
+        next: str | None = None
+
+    class Page(msgspec.Struct, frozen=True):
+        data: List[Item]
+        meta: Meta = Meta()
+        links: Links = Links()
+
+    decode = msgspec.json.Decoder(Page).decode
+    error = msgspec.MsgspecError
+
+    def parse(payload: bytes) -> Dict[str, Any]:
+        try:
+            page = decode(payload)
+        except error as exc:
+            raise ValueError(str(exc)) from exc
+        data = [
+            _compact(item.id, item.attributes.transactions[0]) for item in page.data
+        ]
+        return _page(data, page.meta.pagination.total_pages, page.links.next)
+
+    return parse
+
+
+def parse_transaction_page(payload: bytes) -> Dict[str, Any]:
+    """
+    Decode a transaction list response straight into :class:`CompactTx` records.
+
+    Only the first split's date, amount, description, tags, notes and
+    category, the id and the pagination fields are read. With ``msgspec``
+    installed everything else is skipped while decoding, so the nested
+    JSON:API dicts are never built; otherwise the fastest available decoder is
+    used and each item is converted right away.
+
+    Returns:
+        Dict[str, Any]: A page shaped like the API response, with ``data``
+        holding :class:`CompactTx` records and ``meta.pagination.total_pages``
+        and ``links.next`` preserved.
+
+    Raises:
+        ValueError: If ``payload`` is not a valid transaction page.
+    """
+    return _lean_parser()(payload)
+
+
+@functools.lru_cache(maxsize=None)
+def _lean_parser() -> Callable[[bytes], Dict[str, Any]]:
+    try:
+        return _msgspec_page_decoder()
+    except ImportError:
+        pass
+    loads = get_decoder()
+
+    def parse(payload: bytes) -> Dict[str, Any]:
+        document = loads(payload)
+        try:
+            data = [CompactTx.from_api_dict(item) for item in document["data"]]
+            total_pages = (
+                document.get("meta", {}).get("pagination", {}).get("total_pages")
+            )
+            next_link = document.get("links", {}).get("next")
+        except (KeyError, IndexError, TypeError, AttributeError) as exc:
+            raise ValueError(f"Unexpected transaction page: {exc}") from exc
+        return _page(data, total_pages, next_link)
+
+    return parse
+
+
+# pylint: disable=too-many-arguments
+def iter_compact_transactions(
+    client: "FireflyClient",
+    tx_type: str = "withdrawal",
+    limit: int = 1000,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    **fetch_kwargs: Any,
+) -> Iterator[CompactTx]:
+    """
+    Lazily fetch transactions as :class:`CompactTx` via the lean page parser.
+
+    Equivalent to ``iter_compact(client.iter_transactions(...))`` without
+    building the raw JSON:API documents. ``fetch_kwargs`` (``parallel``,
+    ``max_workers``) are passed to :meth:`FireflyClient.iter_transaction_pages`.
+    """
+    for page in client.iter_transaction_pages(
+        tx_type,
+        limit,
+        start_date,
+        end_date,
+        decoder=parse_transaction_page,
+        **fetch_kwargs,
+    ):
+        yield from page
@@ -0,0 +1,158 @@
+"""Lazy and list-based filters over raw Firefly III transactions."""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Literal, overload
+
+from fireflyiii_enricher_core.models import CompactSplit, CompactTx, SimplifiedTx
+
+
+def iter_without_category(
+    transactions: Iterable[Dict[str, Any]],
+) -> Iterator[Dict[str, Any]]:
+    """Lazily skip transactions that already have a category set."""
+    return (
+        t
+        for t in transactions
+        if t["attributes"]["transactions"][0].get("category_id") is None
+    )
+
+
+def iter_single_part(
+    transactions: Iterable[Dict[str, Any]],
+) -> Iterator[Dict[str, Any]]:
+    """Lazily yield only transactions that have a single sub-transaction."""
+    return (t for t in transactions if len(t["attributes"]["transactions"]) == 1)
+
+
+def iter_by_description(
+    transactions: Iterable[Dict[str, Any]],
+    description_filter: str,
+    exact_match: bool = True,
+) -> Iterator[Dict[str, Any]]:
+    """Lazily yield transactions whose description matches the filter."""
+    needle = description_filter.lower()
+    for t in transactions:
+        desc = t["attributes"]["transactions"][0]["description"].lower()
+        if (exact_match and desc == needle) or (not exact_match and needle in desc):
+            yield t
+
+
+def iter_without_tag(
+    transactions: Iterable[Dict[str, Any]], tag: str
+) -> Iterator[Dict[str, Any]]:
+    """Lazily skip transactions that contain the given tag."""
+    return (
+        t for t in transactions if tag not in t["attributes"]["transactions"][0]["tags"]
+    )
+
+
+def iter_simplified(
+    transactions: Iterable[Dict[str, Any]],
+) -> Iterator["SimplifiedTx"]:
+    """Lazily convert raw API transactions into :class:`SimplifiedTx` objects."""
+    for t in transactions:
+        sub = t["attributes"]["transactions"][0]
+        tx_date = datetime.fromisoformat(sub["date"]).date()
+        yield SimplifiedTx(
+            id=t["id"],
+            description=sub["description"],
+            amount=float(sub["amount"]),
+            date=tx_date,
+            tags=sub.get("tags", ""),
+            notes=sub.get("notes", ""),
+            category=sub.get("category", ""),
+        )
+
+
+def iter_compact(
+    transactions: Iterable[Dict[str, Any]],
+) -> Iterator["CompactTx"]:
+    """Lazily convert raw API transactions into :class:`CompactTx` objects."""
+    return (CompactTx.from_api_dict(t) for t in transactions)
+
+
+def filter_without_category(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Filter out transactions that already have a category set."""
+    return list(iter_without_category(transactions))
+
+
+def filter_single_part(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return only transactions that have a single sub-transaction."""
+    return list(iter_single_part(transactions))
+
+
+def filter_by_description(
+    transactions: List[Dict[str, Any]],
+    description_filter: str,
+    exact_match: bool = True,
+) -> List[Dict[str, Any]]:
+    """Match transactions whose description matches the filter."""
+    return list(iter_by_description(transactions, description_filter, exact_match))
+
+
+def filter_without_tag(
+    transactions: List[Dict[str, Any]], tag: str
+) -> List[Dict[str, Any]]:
+    """
+    Filters out transactions that contain a specific tag.
+
+    Iterates over a list of transaction dictionaries and returns only those
+    that do not include the given tag in their 'tags' field.
+
+    Args:
+        transactions (List[Dict[str, Any]]): List of transaction objects (dicts)
+        from Firefly.
+        tag (str): The tag to exclude from the results.
+
+    Returns:
+        List[Dict[str, Any]]: Filtered list of transactions without the specified tag.
+    """
+    return list(iter_without_tag(transactions, tag))
+
+
+@overload
+def simplify_transactions(
+    transactions: List[Dict[str, Any]], compact: Literal[False] = False
+) -> List['SimplifiedTx']: ...
+
+
+@overload
+def simplify_transactions(
+    transactions: List[Dict[str, Any]], compact: Literal[True]
+) -> List['CompactTx']: ...
+
+
+def simplify_transactions(
+    transactions: List[Dict[str, Any]], compact: bool = False
+) -> List['SimplifiedTx'] | List['CompactTx']:
+    """
+    Convert the raw API response into a flat structure.
+
+    With ``compact=True`` the result is a list of slotted :class:`CompactTx`
+    records with integer minor-unit amounts.
+    """
+    if compact:
+        return list(iter_compact(transactions))
+    return list(iter_simplified(transactions))
+
+
+def iter_splits(transactions: Iterable[Dict[str, Any]]) -> Iterator[CompactSplit]:
+    """Lazily flatten raw API transactions into one record per split."""
+    for t in transactions:
+        splits = t["attributes"]["transactions"]
+        for index in range(len(splits)):
+            yield CompactSplit.from_api_split(t["id"], index, splits)
+
+
+def simplify_splits(transactions: Iterable[Dict[str, Any]]) -> List[CompactSplit]:
+    """
+    Flatten raw API transactions into :class:`CompactSplit` records.
+
+    Unlike :func:`simplify_transactions`, which describes each transaction by
+    its first split, every split of a multi-split transaction gets a record.
+
+    Examples:
+        by_key = {split.key: split for split in simplify_splits(transactions)}
+        uncategorized = [s for s in by_key.values() if s.category_id is None]
+    """
+    return list(iter_splits(transactions))
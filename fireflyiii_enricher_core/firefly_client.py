@@ -1,155 +1,528 @@
 """Utility client for interacting with the Firefly III API."""
 
+# pylint: disable=too-many-lines
+
+import json
 import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import date, datetime
-from typing import Any, Dict, List
+from datetime import date, timedelta
+from typing import Any, Deque, Dict, Iterator, List, Tuple
 
 import requests
 from requests import HTTPError, RequestException, Timeout
+from requests.adapters import HTTPAdapter
+
+from fireflyiii_enricher_core.codec import JsonDecoder
+from fireflyiii_enricher_core.filters import (
+    filter_by_description,
+    filter_single_part,
+    filter_without_category,
+    filter_without_tag,
+    iter_by_description,
+    iter_compact,
+    iter_simplified,
+    iter_single_part,
+    iter_splits,
+    iter_without_category,
+    iter_without_tag,
+    simplify_splits,
+    simplify_transactions,
+)
+from fireflyiii_enricher_core.http_cache import ResponseCache
+from fireflyiii_enricher_core.instrumentation import (
+    Event,
+    Hook,
+    RequestEvent,
+    RequestTrace,
+    endpoint_of,
+    instrumented,
+)
+from fireflyiii_enricher_core.models import (
+    CompactSplit,
+    CompactTx,
+    Matchable,
+    MatchKey,
+    SimplifiedCategory,
+    SimplifiedItem,
+    SimplifiedTx,
+    SplitKey,
+    to_minor_units,
+)
+from fireflyiii_enricher_core.retry import (
+    NO_RETRY,
+    RateLimiter,
+    RequestStats,
+    RetryPolicy,
+    parse_retry_after,
+)
+from fireflyiii_enricher_core.updates import (
+    IdenticalDataError,
+    category_change,
+    description_change,
+    notes_change,
+    split_update,
+    tag_change,
+    update_payload,
+)
+
+# pylint: disable=duplicate-code
+# The models, filters and update helpers live in their own modules so they can
+# be imported without the HTTP stack; they are re-exported here unchanged.
+__all__ = [
+    "CategoryRegistry",
+    "CompactSplit",
+    "CompactTx",
+    "ConnectionStats",
+    "DateWindow",
+    "FireflyClient",
+    "IdenticalDataError",
+    "JsonDecoder",
+    "MatchKey",
+    "Matchable",
+    "SimplifiedCategory",
+    "SimplifiedItem",
+    "SimplifiedTx",
+    "SplitKey",
+    "category_change",
+    "date_windows",
+    "description_change",
+    "filter_by_description",
+    "filter_single_part",
+    "filter_without_category",
+    "filter_without_tag",
+    "iter_by_description",
+    "iter_compact",
+    "iter_simplified",
+    "iter_single_part",
+    "iter_splits",
+    "iter_without_category",
+    "iter_without_tag",
+    "notes_change",
+    "simplify_splits",
+    "simplify_transactions",
+    "split_update",
+    "tag_change",
+    "to_minor_units",
+    "update_payload",
+]
 
 logger = logging.getLogger(__name__)
 
+DateWindow = Tuple[date, date]
 
-def filter_without_category(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Filter out transactions that already have a category set."""
-    return [
-        t
-        for t in transactions
-        if t["attributes"]["transactions"][0].get("category_id") is None
-    ]
 
+def date_windows(
+    start: date, end: date, shard: str | int = "month"
+) -> List[DateWindow]:
+    """
+    Cut the inclusive range ``start``..``end`` into consecutive windows.
+
+    Args:
+        start (date): First day.
+        end (date): Last day.
+        shard (str | int, optional): ``"month"`` for calendar months (clipped
+            to the range) or a number of days per window. Defaults to "month".
 
-def filter_single_part(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Return only transactions that have a single sub-transaction."""
-    return [t for t in transactions if len(t["attributes"]["transactions"]) == 1]
+    Returns:
+        List[DateWindow]: Inclusive ``(first, last)`` days in date order.
+    """
+    if shard != "month" and (not isinstance(shard, int) or shard < 1):
+        raise ValueError(f"shard must be 'month' or a positive day count: {shard!r}")
+    windows = []
+    first = start
+    while first <= end:
+        if shard == "month":
+            following = (first.replace(day=1) + timedelta(days=32)).replace(day=1)
+        else:
+            following = first + timedelta(days=int(shard))
+        last = min(following - timedelta(days=1), end)
+        windows.append((first, last))
+        first = last + timedelta(days=1)
+    return windows
 
 
-def filter_by_description(
-    transactions: List[Dict[str, Any]],
-    description_filter: str,
-    exact_match: bool = True,
-) -> List[Dict[str, Any]]:
-    """Match transactions whose description matches the filter."""
-    filtered = []
-    for t in transactions:
-        desc = t["attributes"]["transactions"][0]["description"]
-        if exact_match and desc.lower() == description_filter.lower():
-            filtered.append(t)
-        elif not exact_match and description_filter.lower() in desc.lower():
-            filtered.append(t)
-    return filtered
+def _date_order(transaction: Dict[str, Any]) -> Tuple[str, int, str]:
+    tx_id = str(transaction["id"])
+    return transaction["attributes"]["transactions"][0]["date"], len(tx_id), tx_id
 
 
-def filter_without_tag(
-    transactions: List[Dict[str, Any]], tag: str
-) -> List[Dict[str, Any]]:
+class CategoryRegistry:
     """
-    Filters out transactions that contain a specific tag.
+    TTL-bounded, memoized view of the Firefly III categories.
 
-    Iterates over a list of transaction dictionaries and returns only those
-    that do not include the given tag in their 'tags' field.
+    Categories are fetched once and indexed by id and by normalized name
+    (case-folded, whitespace collapsed). Lookups are served from memory until
+    ``ttl`` seconds have passed or :meth:`refresh` is called.
+    """
 
-    Args:
-        transactions (List[Dict[str, Any]]): List of transaction objects (dicts)
-        from Firefly.
-        tag (str): The tag to exclude from the results.
+    def __init__(self, client: "FireflyClient", ttl: float = 300.0) -> None:
+        self.client = client
+        self.ttl = ttl
+        self._by_id: Dict[str, SimplifiedCategory] = {}
+        self._by_name: Dict[str, str] = {}
+        self._loaded_at: float | None = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
 
-    Returns:
-        List[Dict[str, Any]]: Filtered list of transactions without the specified tag.
-    """
-    filtered: List[Dict[str, Any]] = []
-    for tx in transactions:
-        if tag not in tx["attributes"]["transactions"][0]["tags"]:
-            filtered.append(tx)
-    return filtered
-
-
-def simplify_transactions(transactions: List[Dict[str, Any]]) -> List['SimplifiedTx']:
-    """Convert the raw API response into a flat structure."""
-    simplified = []
-    for t in transactions:
-        sub = t["attributes"]["transactions"][0]
-        tx_date = datetime.fromisoformat(sub["date"]).date()
-        simplified.append(
-            SimplifiedTx(
-                id=t["id"],
-                description=sub["description"],
-                amount=float(sub["amount"]),
-                date=tx_date,
-                tags=sub.get("tags", ""),
-                notes=sub.get("notes", ""),
-                category=sub.get("category", ""),
-            )
-        )
-    return simplified
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Return the lookup form of a category name."""
+        return " ".join(name.casefold().split())
 
+    def refresh(self) -> None:
+        """Fetch all categories and rebuild both indexes."""
+        categories = self.client.fetch_categories(simplified=True)
+        by_id: Dict[str, SimplifiedCategory] = {}
+        by_name: Dict[str, str] = {}
+        for category in categories:
+            if isinstance(category, SimplifiedCategory):
+                by_id[category.id] = category
+                by_name.setdefault(self.normalize(category.name), category.id)
+        with self._lock:
+            self._by_id, self._by_name = by_id, by_name
+            self._loaded_at = time.monotonic()
 
-@dataclass(eq=False)
-class SimplifiedItem:
-    """Representation of a simplified transaction item."""
+    def invalidate(self) -> None:
+        """Force the next lookup to fetch the categories again."""
+        with self._lock:
+            self._loaded_at = None
 
-    date: date
-    amount: float
+    def _ensure_fresh(self) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.ttl:
+            # Lookups waiting here share the refresh of the first one.
+            with self._refresh_lock:
+                if self._loaded_at == loaded_at:
+                    self.refresh()
 
-    def compare_amount(self, amount: float) -> bool:
-        """Return ``True`` if the amounts are equal ignoring their sign."""
-        return abs(float(self.amount)) == abs(float(amount))
+    def all(self) -> List[SimplifiedCategory]:
+        """Return every known category."""
+        self._ensure_fresh()
+        return list(self._by_id.values())
 
-    def compare(self, other: Any) -> bool:
-        """Return ``True`` if ``other`` has the same date and amount."""
-        if not isinstance(other, SimplifiedItem):
-            return False
-        return self.date == other.date and self.compare_amount(other.amount)
+    def get(self, category_id: int | str) -> SimplifiedCategory | None:
+        """Return the category with the given id, if it exists."""
+        self._ensure_fresh()
+        return self._by_id.get(str(category_id))
 
+    def find(self, name: str) -> SimplifiedCategory | None:
+        """Return the category with the given (normalized) name, if it exists."""
+        self._ensure_fresh()
+        category_id = self._by_name.get(self.normalize(name))
+        return self._by_id.get(category_id) if category_id is not None else None
 
-@dataclass
-class SimplifiedTx(SimplifiedItem):
-    """Simplified representation of a Firefly III transaction."""
+    def resolve(self, name: str) -> str:
+        """
+        Return the id of the category called ``name``.
 
-    id: str
-    description: str
-    tags: List[str]
-    notes: str
-    category: str
+        Raises:
+            KeyError: If no category has that name.
+        """
+        category = self.find(name)
+        if category is None:
+            raise KeyError(f"Unknown category: {name}")
+        return category.id
 
 
 @dataclass
-class SimplifiedCategory:
-    """Simplified representation of a Firefly III Category."""
+class ConnectionStats:
+    """Connection pool usage counters of a :class:`FireflyClient`."""
+
+    opened: int
+    requests: int
+
+    @property
+    def reused(self) -> int:
+        """Number of requests served over an already open connection."""
+        return max(self.requests - self.opened, 0)
+
+
+class _PoolAdapter(HTTPAdapter):
+    """
+    :class:`HTTPAdapter` that counts the connections it opens.
 
-    id: str
-    name: str
+    Without ``keep_alive`` every connection is closed when it is returned to
+    the pool, so the next request connects again instead of reusing a socket
+    the server may already have dropped.
+    """
+
+    def __init__(self, *, keep_alive: bool = True, **kwargs: Any) -> None:
+        self.keep_alive = keep_alive
+        self.connections_opened = 0
+        self.requests_sent = 0
+        self._count_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: self._counting_pool(pool_cls)
+            for scheme, pool_cls in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+    def send(self, *args: Any, **kwargs: Any) -> requests.Response:
+        with self._count_lock:
+            self.requests_sent += 1
+        return super().send(*args, **kwargs)
+
+    def _counting_pool(self, pool_cls: Any) -> Any:
+        adapter = self
 
-    @classmethod
-    def from_api_dict(cls, category_raw: dict[str, Any]) -> 'SimplifiedCategory':
-        """Create instance of SimplifiedCategory from raw api dict"""
-        category_id = category_raw.get("id", "")
-        attributes = category_raw.get("attributes", {})
-        name = attributes.get("name", "")
-        return cls(id=category_id, name=name)
+        # pylint: disable=too-few-public-methods
+        class CountingConnection(pool_cls.ConnectionCls):  # type: ignore[misc]
+            """Connection that reports every (re)connect to the adapter."""
 
+            def connect(self) -> None:
+                """Open the socket and count it as a new connection."""
+                with adapter._count_lock:  # pylint: disable=protected-access
+                    adapter.connections_opened += 1
+                super().connect()
 
+        class CountingPool(pool_cls):  # type: ignore[misc]
+            """Pool of counting connections, closed on release without keep-alive."""
+
+            ConnectionCls = CountingConnection
+
+            def _put_conn(self, conn: Any) -> None:
+                if conn is not None and not adapter.keep_alive:
+                    conn.close()
+                super()._put_conn(conn)
+
+        CountingPool.__name__ = pool_cls.__name__
+        return CountingPool
+
+
+# pylint: disable=too-many-instance-attributes
 class FireflyClient:
-    """Minimal wrapper around the Firefly III REST API."""
+    """Minimal wrapper around the Firefly III REST API.
+
+    All requests go through a single :class:`requests.Session`, so TCP and TLS
+    connections are kept alive and reused between calls. Use the client as a
+    context manager (or call :meth:`close`) to release the pooled connections.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        *,
+        timeout: float | Tuple[float, float] = 10,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        category_ttl: float = 300.0,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        json_decoder: JsonDecoder | None = None,
+        response_cache: ResponseCache | None = None,
+    ) -> None:
+        """
+        Create a client bound to a Firefly III instance.
 
-    def __init__(self, base_url: str, token: str) -> None:
+        Args:
+            base_url (str): Root URL of the Firefly III instance.
+            token (str): Personal access token.
+            timeout (float | Tuple[float, float], optional): Request timeout in
+                seconds, or a ``(connect, read)`` tuple. Defaults to 10.
+            pool_connections (int, optional): Number of host pools to cache.
+                Defaults to 10.
+            pool_maxsize (int, optional): Maximum number of connections kept
+                open per host. Defaults to 10.
+            keep_alive (bool, optional): Reuse connections between requests.
+                Defaults to `True`.
+            category_ttl (float, optional): Seconds the :attr:`categories`
+                registry is trusted before it is fetched again. Defaults to 300.
+            retry_policy (RetryPolicy | None, optional): Retry 429/5xx
+                responses, timeouts and connection errors with backoff.
+                Defaults to no retries.
+            rate_limiter (RateLimiter | None, optional): Token bucket paced by
+                observed 429s, shared by all threads using this client (and
+                by other clients given the same limiter). Defaults to `None`.
+            json_decoder (JsonDecoder | None, optional): ``bytes -> object``
+                function decoding response bodies, e.g.
+                ``codec.get_decoder("orjson")``. Defaults to ``Response.json``.
+            response_cache (ResponseCache | None, optional): Cache answering
+                repeated GETs of opted-in endpoints with conditional
+                requests. Defaults to `None`.
+        """
         self.base_url = base_url.rstrip("/")
         self.token = token
+        self.timeout = timeout
         self.headers = {
             "Authorization": f"Bearer {token}",
             "Accept": "application/vnd.api+json",
             "Content-Type": "application/vnd.api+json",
         }
+        if not keep_alive:
+            self.headers["Connection"] = "close"
+        self._adapter = _PoolAdapter(
+            keep_alive=keep_alive,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        self.categories = CategoryRegistry(self, ttl=category_ttl)
+        self.retry_policy = retry_policy or NO_RETRY
+        self.rate_limiter = rate_limiter
+        self.request_stats = RequestStats()
+        self.json_decoder = json_decoder
+        self.response_cache = response_cache
+        self.hooks: List[Hook] = []
+        self._pages = threading.local()
+
+    def __enter__(self) -> "FireflyClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying session and all pooled connections."""
+        self.session.close()
+
+    def connection_stats(self) -> ConnectionStats:
+        """Report how many connections were opened and requests sent through them."""
+        return ConnectionStats(
+            opened=self._adapter.connections_opened,
+            requests=self._adapter.requests_sent,
+        )
 
-    def _safe_request(self, method: str, url: str, **kwargs: Any) -> Any:
+    def _send(
+        self,
+        method: str,
+        url: str,
+        trace: RequestTrace | None = None,
+        extra_headers: Dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Send a request, retrying and pacing it according to the policies."""
+        headers = {**self.headers, **extra_headers} if extra_headers else self.headers
+        policy, limiter, stats = (
+            self.retry_policy,
+            self.rate_limiter,
+            self.request_stats,
+        )
+        attempt = 1
+        while True:
+            if limiter is not None:
+                limiter.acquire()
+            stats.add(requests=1)
+            if trace is not None:
+                trace.attempts = attempt
+            try:
+                response = self.session.request(
+                    method, url, headers=headers, timeout=self.timeout, **kwargs
+                )
+                if trace is not None:
+                    trace.status = response.status_code
+                    trace.payload_bytes = len(response.content)
+                response.raise_for_status()
+            except RequestException as exc:
+                retry_after = None
+                if exc.response is not None:
+                    retry_after = parse_retry_after(
+                        exc.response.headers.get("Retry-After")
+                    )
+                    if exc.response.status_code == 429:
+                        stats.add(throttled=1)
+                        if limiter is not None:
+                            limiter.on_throttle(retry_after)
+                if not policy.should_retry(exc, attempt):
+                    stats.add(failures=1)
+                    raise
+                delay = policy.delay(attempt, retry_after)
+                stats.add(retries=1, backoff_seconds=delay)
+                if trace is not None:
+                    trace.backoff_seconds += delay
+                logger.debug("Retrying %s %s in %.2fs: %s", method, url, delay, exc)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            if limiter is not None:
+                limiter.on_success()
+            return response
+
+    def add_hook(self, hook: Hook) -> None:
+        """
+        Register a callable receiving a :class:`RequestEvent` per request and an
+        :class:`OperationEvent` per fetch/update call.
+
+        Without hooks no timing is taken at all.
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: Hook) -> None:
+        """Unregister a hook added with :meth:`add_hook`."""
+        self.hooks.remove(hook)
+
+    def _emit(self, event: Event) -> None:
+        for hook in self.hooks:
+            hook(event)
+
+    def _count_page(self) -> None:
+        """Count a page towards the running :func:`instrumented` operation."""
+        count = getattr(self._pages, "count", None)
+        if count is not None:
+            self._pages.count = count + 1
+
+    def _safe_request(
+        self,
+        method: str,
+        url: str,
+        decoder: JsonDecoder | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        decoder = decoder or self.json_decoder
+        if not self.hooks:
+            return self._request_json(method, url, None, decoder, **kwargs)
+        trace = RequestTrace()
+        started = time.perf_counter()
+        error: BaseException | None = None
         try:
-            response = requests.request(
-                method, url, headers=self.headers, timeout=10, **kwargs
+            return self._request_json(method, url, trace, decoder, **kwargs)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            self._emit(
+                RequestEvent(
+                    method=method.upper(),
+                    url=url,
+                    endpoint=endpoint_of(method, url),
+                    status=trace.status,
+                    duration=time.perf_counter() - started,
+                    decode_seconds=trace.decode_seconds,
+                    payload_bytes=trace.payload_bytes,
+                    attempts=trace.attempts,
+                    backoff_seconds=trace.backoff_seconds,
+                    error=str(error) if error is not None else None,
+                )
             )
-            response.raise_for_status()
+
+    def _request_json(
+        self,
+        method: str,
+        url: str,
+        trace: RequestTrace | None,
+        decoder: JsonDecoder | None,
+        **kwargs: Any,
+    ) -> Any:
+        try:
+            response, cached = self._send_cached(method, url, trace, **kwargs)
             try:
-                return response.json()
+                if trace is None:
+                    return self._decode(response, cached, decoder)
+                decode_started = time.perf_counter()
+                data = self._decode(response, cached, decoder)
+                trace.decode_seconds = time.perf_counter() - decode_started
+                return data
             except ValueError as exc:
                 raise RuntimeError("Failed to parse JSON response") from exc
 
@@ -162,35 +535,348 @@ class FireflyClient:
         except RequestException as exc:
             raise RuntimeError(f"Request failed: {exc}") from exc
 
-    def fetch_transactions(
+    def _send_cached(
+        self, method: str, url: str, trace: RequestTrace | None, **kwargs: Any
+    ) -> Tuple[requests.Response, bytes | None]:
+        """
+        Send a request through the :attr:`response_cache`, if any.
+
+        Returns the response and, when the server answered ``304 Not
+        Modified``, the cached body to use instead of the empty one.
+        """
+        cache = self.response_cache
+        if cache is None:
+            return self._send(method, url, trace, **kwargs), None
+        key = cache.key(method, url, kwargs.get("params"))
+        entry = cache.get(key) if key is not None else None
+        validators = entry.validators() if entry is not None else None
+        response = self._send(method, url, trace, validators, **kwargs)
+        if entry is not None and response.status_code == 304:
+            cache.hit()
+            return response, entry.content
+        if key is not None:
+            cache.store(key, response.content, response.headers)
+        elif method.lower() != "get":
+            cache.invalidate(url)
+        return response, None
+
+    @staticmethod
+    def _decode(
+        response: requests.Response, cached: bytes | None, decoder: JsonDecoder | None
+    ) -> Any:
+        if cached is not None:
+            return (decoder or json.loads)(cached)
+        return decoder(response.content) if decoder else response.json()
+
+    def _iter_pages(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        parallel: bool = False,
+        max_workers: int = 4,
+        decoder: JsonDecoder | None = None,
+        *,
+        first_page: int = 1,
+    ) -> Iterator[List[Any]]:
+        """
+        Yield the ``data`` list of every page of a paginated endpoint, in order.
+
+        In parallel mode the page count is read from ``meta.pagination`` of the
+        first response and the remaining pages are fetched on a thread pool of
+        ``max_workers`` threads. Without pagination metadata (or with
+        ``parallel=False``) pages are followed one by one via ``links.next``.
+        A ``decoder`` must return documents of the same shape. Pages before
+        ``first_page`` are skipped.
+        """
+        params = {**params, "page": first_page}
+        data = self._safe_request("get", url, decoder, params=params)
+        self._count_page()
+        yield data["data"]
+
+        total_pages = data.get("meta", {}).get("pagination", {}).get("total_pages")
+        if parallel and isinstance(total_pages, int):
+            if total_pages <= first_page:
+                return
+            # Keep at most ``max_workers`` pages in flight so that lazily
+            # consumed iterators stay bounded in memory.
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            pending: Deque[Future[Any]] = deque()
+            next_page = first_page + 1
+            try:
+                while pending or next_page <= total_pages:
+                    while next_page <= total_pages and len(pending) < max_workers:
+                        pending.append(
+                            executor.submit(
+                                self._safe_request,
+                                "get",
+                                url,
+                                decoder,
+                                params={**params, "page": next_page},
+                            )
+                        )
+                        next_page += 1
+                    page_data = pending.popleft().result()["data"]
+                    self._count_page()
+                    yield page_data
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+            return
+
+        page = first_page
+        while data["links"].get("next"):
+            page += 1
+            data = self._safe_request(
+                "get", url, decoder, params={**params, "page": page}
+            )
+            self._count_page()
+            yield data["data"]
+
+    # pylint: disable=too-many-arguments
+    def iter_transaction_pages(
         self,
         tx_type: str = "withdrawal",
         limit: int = 1000,
         start_date: date | None = None,
         end_date: date | None = None,
-    ) -> List[Dict[str, Any]]:
-        """Retrieve transactions of the given type."""
+        *,
+        parallel: bool = False,
+        max_workers: int = 4,
+        decoder: JsonDecoder | None = None,
+        first_page: int = 1,
+    ) -> Iterator[List[Any]]:
+        """
+        Lazily yield the ``data`` list of every transaction page, in order.
+
+        ``decoder`` overrides the client's JSON decoder for these pages; with
+        :func:`fireflyiii_enricher_core.codec.parse_transaction_page` the
+        pages hold :class:`CompactTx` records instead of raw dicts. Iteration
+        starts at ``first_page`` (1-based), e.g. to resume an interrupted run.
+        """
         url = f"{self.base_url}/api/v1/transactions"
-        params = {"limit": limit, "type": tx_type}
+        params: Dict[str, Any] = {"limit": limit, "type": tx_type}
         if start_date:
             params["start"] = start_date.isoformat()
         if end_date:
             params["end"] = end_date.isoformat()
-        page = 1
-        transactions: List[Dict[str, Any]] = []
+        return self._iter_pages(
+            url, params, parallel, max_workers, decoder, first_page=first_page
+        )
 
-        while True:
-            params["page"] = page
-            response = self._safe_request("get", url, params=params)
-            data = response
-            transactions.extend(data["data"])
-            if not data["links"].get("next"):
-                break
-            page += 1
-        return transactions
+    # pylint: disable=too-many-arguments
+    def iter_transactions(
+        self,
+        tx_type: str = "withdrawal",
+        limit: int = 1000,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        *,
+        parallel: bool = False,
+        max_workers: int = 4,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield transactions of the given type, one page at a time.
+
+        Only the current page (plus up to ``max_workers`` prefetched pages in
+        parallel mode) is held in memory, so the result can be piped through
+        the ``iter_*`` helpers in constant memory::
+
+            simplified = iter_simplified(
+                iter_without_category(client.iter_transactions())
+            )
+        """
+        for page_data in self.iter_transaction_pages(
+            tx_type,
+            limit,
+            start_date,
+            end_date,
+            parallel=parallel,
+            max_workers=max_workers,
+        ):
+            yield from page_data
+
+    def _fetch_window(
+        self, params: Dict[str, Any], window: DateWindow, max_pages: int
+    ) -> List[Dict[str, Any]] | None:
+        """
+        Fetch every transaction of one window in date order.
+
+        Returns `None` without fetching further pages if the window spans
+        more than ``max_pages`` pages and can still be split.
+        """
+        url = f"{self.base_url}/api/v1/transactions"
+        params = {
+            **params,
+            "start": window[0].isoformat(),
+            "end": window[1].isoformat(),
+        }
+        data = self._safe_request("get", url, params={**params, "page": 1})
+        self._count_page()
+        total_pages = data.get("meta", {}).get("pagination", {}).get("total_pages")
+        if (
+            max_pages
+            and isinstance(total_pages, int)
+            and total_pages > max_pages
+            and window[0] < window[1]
+        ):
+            return None
+        items: List[Dict[str, Any]] = list(data["data"])
+        if data["links"].get("next"):
+            for page_data in self._iter_pages(url, params, first_page=2):
+                items.extend(page_data)
+        items.sort(key=_date_order)
+        return items
+
+    # pylint: disable=too-many-arguments,too-many-locals
+    def iter_transactions_sharded(
+        self,
+        tx_type: str = "withdrawal",
+        limit: int = 1000,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        *,
+        shard: str | int = "month",
+        max_workers: int = 4,
+        max_pages: int = 10,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield transactions in date order, fetched as date windows.
+
+        The range is cut into windows (see :func:`date_windows`) that are
+        fetched concurrently on ``max_workers`` threads, each through its own
+        shallow pagination. A window deeper than ``max_pages`` pages is halved
+        until it fits or spans a single day. Transactions are yielded oldest
+        first (by the first split's date, then id), without duplicates, while
+        at most ``max_workers`` windows are in flight.
+
+        Args:
+            tx_type (str, optional): Transaction type. Defaults to "withdrawal".
+            limit (int, optional): Page size. Defaults to 1000.
+            start_date (date | None, optional): First day; required.
+            end_date (date | None, optional): Last day. Defaults to today.
+            shard (str | int, optional): ``"month"`` or days per window.
+                Defaults to "month".
+            max_workers (int, optional): Concurrent windows. Defaults to 4.
+            max_pages (int, optional): Page depth above which a window is
+                split; ``0`` disables splitting. Defaults to 10.
+
+        Raises:
+            ValueError: If ``start_date`` is missing or ``shard`` is invalid.
+
+        Examples:
+            for tx in client.iter_transactions_sharded(
+                start_date=date(2015, 1, 1), max_workers=8
+            ):
+                ...
+        """
+        if start_date is None:
+            raise ValueError("Sharded fetching needs a start_date")
+        windows = iter(date_windows(start_date, end_date or date.today(), shard))
+        params = {"limit": limit, "type": tx_type}
+        seen: set[str] = set()
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending: Deque[Tuple[DateWindow, Future[List[Dict[str, Any]] | None]]] = deque()
+
+        def submit(window: DateWindow) -> Tuple[DateWindow, Future[Any]]:
+            future = executor.submit(self._fetch_window, params, window, max_pages)
+            return window, future
+
+        try:
+            while True:
+                while len(pending) < max_workers:
+                    window = next(windows, None)
+                    if window is None:
+                        break
+                    pending.append(submit(window))
+                if not pending:
+                    return
+                (first, last), future = pending.popleft()
+                items = future.result()
+                if items is None:
+                    middle = first + (last - first) // 2
+                    pending.appendleft(submit((middle + timedelta(days=1), last)))
+                    pending.appendleft(submit((first, middle)))
+                    continue
+                for item in items:
+                    tx_id = str(item["id"])
+                    if tx_id not in seen:
+                        seen.add(tx_id)
+                        yield item
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @instrumented
+    # pylint: disable=too-many-arguments
+    def fetch_transactions(
+        self,
+        tx_type: str = "withdrawal",
+        limit: int = 1000,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        *,
+        parallel: bool = False,
+        max_workers: int = 4,
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve transactions of the given type.
+
+        With ``parallel=True`` all pages after the first are fetched
+        concurrently on up to ``max_workers`` threads; results keep page order.
+        For long ranges see :meth:`iter_transactions_sharded`.
+        """
+        return list(
+            self.iter_transactions(
+                tx_type,
+                limit,
+                start_date,
+                end_date,
+                parallel=parallel,
+                max_workers=max_workers,
+            )
+        )
+
+    def iter_search_transactions(
+        self,
+        query: str,
+        limit: int = 1000,
+        *,
+        parallel: bool = False,
+        max_workers: int = 4,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield transactions matching a Firefly III search query.
+
+        See :class:`fireflyiii_enricher_core.search.TransactionQuery` for
+        building ``query`` from filter predicates.
+        """
+        url = f"{self.base_url}/api/v1/search/transactions"
+        params: Dict[str, Any] = {"query": query, "limit": limit}
+        for page_data in self._iter_pages(url, params, parallel, max_workers):
+            yield from page_data
+
+    @instrumented
+    def search_transactions(
+        self,
+        query: str,
+        limit: int = 1000,
+        *,
+        parallel: bool = False,
+        max_workers: int = 4,
+    ) -> List[Dict[str, Any]]:
+        """Retrieve transactions matching a Firefly III search query."""
+        return list(
+            self.iter_search_transactions(
+                query, limit, parallel=parallel, max_workers=max_workers
+            )
+        )
 
+    @instrumented
     def fetch_categories(
-        self, limit: int = 1000, simplified: bool = False
+        self,
+        limit: int = 1000,
+        simplified: bool = False,
+        *,
+        parallel: bool = False,
+        max_workers: int = 4,
     ) -> List[Dict[str, Any]] | List[SimplifiedCategory]:
         """
         Retrieve categories from Firefly III with optional simplification.
@@ -208,6 +894,11 @@ class FireflyClient:
                                         returns a list of `SimplifiedCategory` instances
                                         if `False`,
                                         returns raw API data. Defaults to `False`.
+            parallel (bool, optional): Fetch the remaining pages concurrently
+                                        once the page count is known.
+                                        Defaults to `False`.
+            max_workers (int, optional): Number of threads used in parallel
+                                        mode. Defaults to 4.
 
         Returns:
             List[Dict[str, Any]] | List[SimplifiedCategory]: A list of category
@@ -226,17 +917,9 @@ class FireflyClient:
         """
         url = f"{self.base_url}/api/v1/categories"
         params = {"limit": limit}
-        page = 1
         categories: List[Dict[str, Any]] = []
-
-        while True:
-            params["page"] = page
-            response = self._safe_request("get", url, params=params)
-            data = response
-            categories.extend(data["data"])
-            if not data["links"].get("next"):
-                break
-            page += 1
+        for page_data in self._iter_pages(url, params, parallel, max_workers):
+            categories.extend(page_data)
         if not simplified:
             return categories
         result: List[SimplifiedCategory] = []
@@ -244,78 +927,99 @@ class FireflyClient:
             result.append(SimplifiedCategory.from_api_dict(category))
         return result
 
-    def update_transaction_description(
-        self, transaction_id: int, new_description: str
-    ) -> Any:
-        """Change the description field for a given transaction."""
+    def get_transaction(self, transaction_id: int | str) -> Any:
+        """Return the transaction document for ``transaction_id``."""
         url = f"{self.base_url}/api/v1/transactions/{transaction_id}"
-        response = self._safe_request("get", url)
-        old_desc = response.get("data", {}).get("attributes", {})
-        old_desc = old_desc.get("transactions", [{}])[0].get("description", {})
-        if new_description in old_desc:
-            raise RuntimeError("New data is identical to the current one.")
-        payload = {
-            "apply_rules": True,
-            "fire_webhooks": True,
-            "transactions": [{"description": new_description}],
-        }
-        response_put = self._safe_request("put", url, json=payload)
-        return response_put
+        return self._safe_request("get", url)
+
+    @instrumented
+    def put_transaction(
+        self,
+        transaction_id: int | str,
+        changes: Dict[str, Any] | List[Dict[str, Any]],
+        *,
+        apply_rules: bool = True,
+        fire_webhooks: bool = True,
+    ) -> Any:
+        """
+        Send split-level ``changes`` as a transaction update.
 
-    def update_transaction_notes(self, transaction_id: int, new_notes: str) -> Any:
-        """Replace the notes for a given transaction."""
+        ``changes`` is a dict for the first split or a full ``transactions``
+        list as built by :func:`split_update`. ``apply_rules`` and
+        ``fire_webhooks`` are passed on in the payload.
+        """
         url = f"{self.base_url}/api/v1/transactions/{transaction_id}"
-        response = self._safe_request("get", url)
-        old_notes = response.get("data", {}).get("attributes", {})
-        old_notes = old_notes.get("transactions", [{}])[0].get("notes", "")
-        old_notes = old_notes or ""
-        if new_notes in old_notes:
-            raise RuntimeError("New data is identical to the current one.")
-        payload = {
-            "apply_rules": True,
-            "fire_webhooks": True,
-            "transactions": [{"notes": new_notes}],
-        }
-        response = self._safe_request("put", url, json=payload)
-        return response
+        payload = update_payload(
+            changes, apply_rules=apply_rules, fire_webhooks=fire_webhooks
+        )
+        return self._safe_request("put", url, json=payload)
+
+    @instrumented
+    def update_transaction_description(
+        self, transaction_id: int, new_description: str, split_index: int | None = None
+    ) -> Any:
+        """Change the description field for a given transaction or split."""
+        response = self.get_transaction(transaction_id)
+        changes = description_change(response, new_description, split_index or 0)
+        return self.put_transaction(
+            transaction_id, split_update(response, changes, split_index)
+        )
+
+    @instrumented
+    def update_transaction_notes(
+        self, transaction_id: int, new_notes: str, split_index: int | None = None
+    ) -> Any:
+        """Replace the notes for a given transaction or split."""
+        response = self.get_transaction(transaction_id)
+        changes = notes_change(response, new_notes, split_index or 0)
+        return self.put_transaction(
+            transaction_id, split_update(response, changes, split_index)
+        )
 
+    @instrumented
     def assign_transaction_category(
-        self, transaction_id: int, new_category_id: int
+        self, transaction_id: int, new_category_id: int, split_index: int | None = None
     ) -> Any:
-        """Replace the notes for a given transaction."""
-        url = f"{self.base_url}/api/v1/transactions/{transaction_id}"
-        response = self._safe_request("get", url)
-        attributes = response.get("data", {}).get("attributes", {})
-        old_category = attributes.get("transactions", [{}])[0].get("category_id", "")
-        if old_category is not None:
-            if old_category == str(new_category_id):
-                raise RuntimeError("New data is identical to the current one.")
-        payload = {
-            "apply_rules": True,
-            "fire_webhooks": True,
-            "transactions": [{"category_id": str(new_category_id)}],
-        }
-        response = self._safe_request("put", url, json=payload)
-        return response
+        """Assign a category to a given transaction or split."""
+        response = self.get_transaction(transaction_id)
+        changes = category_change(response, new_category_id, split_index or 0)
+        return self.put_transaction(
+            transaction_id, split_update(response, changes, split_index)
+        )
 
-    def add_tag_to_transaction(self, transaction_id: int, new_tag: str) -> Any:
-        """Attach a tag to the specified transaction."""
-        url = f"{self.base_url}/api/v1/transactions/{transaction_id}"
-        response = self._safe_request("get", url)
-        existing_data = response
-        old_sub_transactions = (
-            existing_data.get("data", {}).get("attributes", {}).get("transactions", [])
+    @instrumented
+    def assign_transaction_category_by_name(
+        self, transaction_id: int, category_name: str, split_index: int | None = None
+    ) -> Any:
+        """
+        Assign a category given by name, resolved through :attr:`categories`.
+
+        Raises:
+            KeyError: If no category has that name.
+        """
+        category_id = self.categories.resolve(category_name)
+        return self.assign_transaction_category(
+            transaction_id, int(category_id), split_index
         )
-        if len(old_sub_transactions) != 1:
-            raise RuntimeError("Transaction is not single part")
-        old_sub_tx = old_sub_transactions[0]
-        tags = old_sub_tx.get("tags", [])
-        if new_tag not in tags:
-            tags.append(new_tag)
-        payload = {
-            "apply_rules": True,
-            "fire_webhooks": True,
-            "transactions": [{"tags": tags}],
-        }
-        self._safe_request("put", url, json=payload)
+
+    @instrumented
+    def add_tag_to_transaction(
+        self, transaction_id: int, new_tag: str, split_index: int | None = None
+    ) -> Any:
+        """
+        Attach a tag to the specified transaction.
+
+        Split transactions need the ``split_index`` of the split to tag. If the
+        split already has the tag, nothing is written and the current
+        transaction is returned.
+        """
+        response = self.get_transaction(transaction_id)
+        try:
+            changes = tag_change(response, new_tag, split_index)
+        except IdenticalDataError:
+            return response
+        self.put_transaction(
+            transaction_id, split_update(response, changes, split_index)
+        )
+        response["data"]["attributes"]["transactions"][split_index or 0].update(changes)
         return response
@@ -0,0 +1,216 @@
+"""Columnar, NumPy-backed view of fetched transactions.
+
+Requires the optional ``frame`` extra (``pip install fireflyiii-enricher-core[frame]``).
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from fireflyiii_enricher_core.filters import iter_simplified
+from fireflyiii_enricher_core.models import Matchable, SimplifiedTx, to_minor_units
+
+IntArray = npt.NDArray[np.int64]
+BoolArray = npt.NDArray[np.bool_]
+
+# Date and amount are packed into one sortable int64 key: within a day every
+# amount range is then a contiguous key range. Amounts up to 2**40 minor units
+# fit next to any date ordinal.
+_AMOUNT_SPAN = 1 << 40
+
+
+def _keys(ordinals: IntArray, amounts: IntArray) -> IntArray:
+    return ordinals * _AMOUNT_SPAN + amounts
+
+
+def _range_join(
+    sorted_keys: IntArray, low_keys: IntArray, high_keys: IntArray
+) -> Tuple[IntArray, IntArray]:
+    """Pair each query row with every sorted key in its inclusive key range."""
+    low = np.searchsorted(sorted_keys, low_keys)
+    high = np.searchsorted(sorted_keys, high_keys, side="right")
+    counts = high - low
+    total = int(counts.sum())
+    # Position of the k-th pair: its row's ``low`` plus its offset in the row.
+    starts = np.repeat(low - np.cumsum(counts) + counts, counts)
+    rows = np.repeat(np.arange(len(low_keys), dtype=np.int64), counts)
+    return rows, starts + np.arange(total, dtype=np.int64)
+
+
+def match_key_arrays(records: Iterable[Matchable]) -> Tuple[IntArray, IntArray]:
+    """Return ``(date ordinals, absolute minor-unit amounts)`` of ``records``."""
+    keys = [record.match_key() for record in records]
+    if not keys:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    ordinals, amounts = zip(*keys)
+    return np.asarray(ordinals, dtype=np.int64), np.asarray(amounts, dtype=np.int64)
+
+
+# pylint: disable=too-many-instance-attributes
+class TransactionFrame:
+    """
+    Column arrays built once from raw Firefly transactions.
+
+    Each column describes the first split of a transaction, like the
+    ``filter_*`` helpers do. Filters return boolean masks that can be
+    combined with ``&``/``|`` and passed to :meth:`select`, :meth:`raw` or
+    :meth:`simplified`; matching is a vectorized sort/search join.
+
+    Examples:
+        frame = TransactionFrame.from_transactions(client.iter_transactions())
+        mask = frame.without_category() & frame.without_tag("done")
+        todo = frame.simplified(mask)
+    """
+
+    def __init__(self, transactions: List[Dict[str, Any]]) -> None:
+        """Build the columns from a list of raw API transactions."""
+        self.transactions = transactions
+        count = len(transactions)
+        ids = np.empty(count, dtype=np.int64)
+        dates = np.empty(count, dtype=np.int64)
+        amounts = np.empty(count, dtype=np.int64)
+        has_category = np.empty(count, dtype=np.bool_)
+        split_count = np.empty(count, dtype=np.int64)
+        descriptions: List[str] = []
+        tag_rows: Dict[str, List[int]] = {}
+        for row, raw in enumerate(transactions):
+            splits = raw["attributes"]["transactions"]
+            sub = splits[0]
+            ids[row] = int(raw["id"])
+            dates[row] = datetime.fromisoformat(sub["date"]).toordinal()
+            amounts[row] = to_minor_units(sub["amount"])
+            has_category[row] = sub.get("category_id") is not None
+            split_count[row] = len(splits)
+            descriptions.append(sub["description"].lower())
+            for tag in sub.get("tags") or ():
+                tag_rows.setdefault(tag, []).append(row)
+        self.ids = ids
+        self.dates = dates
+        self.amounts = amounts
+        self.has_category = has_category
+        self.split_count = split_count
+        self.descriptions = np.array(descriptions, dtype=np.str_)
+        self.tag_rows = {
+            tag: np.asarray(rows, dtype=np.int64) for tag, rows in tag_rows.items()
+        }
+
+    @classmethod
+    def from_transactions(
+        cls, transactions: Iterable[Dict[str, Any]]
+    ) -> "TransactionFrame":
+        """Build a frame from fetched (or streamed) raw transactions."""
+        return cls(list(transactions))
+
+    def __len__(self) -> int:
+        return len(self.transactions)
+
+    def without_category(self) -> BoolArray:
+        """Mask of transactions without a category."""
+        return ~self.has_category
+
+    def single_part(self) -> BoolArray:
+        """Mask of transactions with a single split."""
+        return np.asarray(self.split_count == 1, dtype=np.bool_)
+
+    def with_tag(self, tag: str) -> BoolArray:
+        """Mask of transactions carrying ``tag``."""
+        mask = np.zeros(len(self), dtype=np.bool_)
+        rows = self.tag_rows.get(tag)
+        if rows is not None:
+            mask[rows] = True
+        return mask
+
+    def without_tag(self, tag: str) -> BoolArray:
+        """Mask of transactions not carrying ``tag``."""
+        return ~self.with_tag(tag)
+
+    def by_description(
+        self, description_filter: str, exact_match: bool = True
+    ) -> BoolArray:
+        """Mask of transactions whose description matches (case-insensitive)."""
+        needle = description_filter.lower()
+        if exact_match:
+            return np.asarray(self.descriptions == needle, dtype=np.bool_)
+        return np.asarray(np.char.find(self.descriptions, needle) >= 0, dtype=np.bool_)
+
+    def between(self, start_ordinal: int, end_ordinal: int) -> BoolArray:
+        """Mask of transactions dated within the inclusive ordinal range."""
+        return (self.dates >= start_ordinal) & (self.dates <= end_ordinal)
+
+    def raw(self, mask: BoolArray | None = None) -> List[Dict[str, Any]]:
+        """Return the raw transactions selected by ``mask``."""
+        if mask is None:
+            return list(self.transactions)
+        return [self.transactions[row] for row in np.flatnonzero(mask)]
+
+    def select(self, mask: BoolArray) -> "TransactionFrame":
+        """Return a new frame holding only the rows selected by ``mask``."""
+        return TransactionFrame(self.raw(mask))
+
+    def simplified(self, mask: BoolArray | None = None) -> List[SimplifiedTx]:
+        """Return the selected transactions as :class:`SimplifiedTx`."""
+        return list(iter_simplified(self.raw(mask)))
+
+    # pylint: disable=too-many-locals
+    def match(
+        self,
+        records: Sequence[Matchable] | Tuple[IntArray, IntArray],
+        date_window: int = 0,
+        amount_tolerance: float = 0.0,
+    ) -> Tuple[IntArray, IntArray]:
+        """
+        Join the frame with ``records`` on date and absolute amount.
+
+        Records are sorted by (date, amount) once; each day of the date
+        window then takes one sorted search for the whole amount range, so
+        the cost does not depend on ``amount_tolerance``.
+
+        Args:
+            records: Matchable records, or ``(date ordinals, absolute
+                minor-unit amounts)`` arrays as built by
+                :func:`match_key_arrays`.
+            date_window (int, optional): Allowed difference in days.
+                Defaults to 0.
+            amount_tolerance (float, optional): Allowed difference of the
+                amounts, in currency units like
+                :class:`~fireflyiii_enricher_core.matcher.FuzzyTransactionMatcher`.
+                Defaults to 0.0.
+
+        Returns:
+            Tuple[IntArray, IntArray]: Row indexes into the frame and the
+            matching positions in ``records``, ordered by frame row.
+
+        Raises:
+            ValueError: If a window is negative or an amount is too large to
+                be packed into a sort key.
+        """
+        if date_window < 0 or amount_tolerance < 0:
+            raise ValueError("date_window and amount_tolerance must not be negative")
+        tolerance = to_minor_units(amount_tolerance)
+        if isinstance(records, tuple):
+            rec_ordinals, rec_amounts = records
+        else:
+            rec_ordinals, rec_amounts = match_key_arrays(records)
+        rec_amounts = np.abs(rec_amounts)
+        amounts = np.abs(self.amounts)
+        if np.any(rec_amounts >= _AMOUNT_SPAN) or np.any(amounts >= _AMOUNT_SPAN):
+            raise ValueError("Amounts must be below 2**40 minor units")
+        rec_keys = _keys(rec_ordinals, rec_amounts)
+        order = np.argsort(rec_keys, kind="stable")
+        sorted_keys = rec_keys[order]
+
+        low_amounts = np.maximum(amounts - tolerance, 0)
+        high_amounts = np.minimum(amounts + tolerance, _AMOUNT_SPAN - 1)
+        pairs = []
+        for offset in range(-date_window, date_window + 1):
+            days = self.dates + offset
+            rows, positions = _range_join(
+                sorted_keys, _keys(days, low_amounts), _keys(days, high_amounts)
+            )
+            pairs.append((rows, order[positions]))
+        tx_all = np.concatenate([rows for rows, _ in pairs])
+        rec_all = np.concatenate([positions for _, positions in pairs])
+        by_row = np.lexsort((rec_all, tx_all))
+        return tx_all[by_row], rec_all[by_row]
@@ -0,0 +1,175 @@
+"""Conditional-request (ETag/Last-Modified) response cache for the client."""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Mapping
+from urllib.parse import urlencode
+
+from fireflyiii_enricher_core.instrumentation import endpoint_of
+
+DEFAULT_ENDPOINTS = (
+    "GET /api/v1/categories",
+    "GET /api/v1/transactions/{id}",
+)
+
+
+@dataclass
+class HttpCacheStats:
+    """
+    Counters of a :class:`ResponseCache`.
+
+    ``hits`` count responses served from the cache after a ``304 Not
+    Modified``, ``misses`` the cacheable requests that downloaded a body, and
+    ``evictions`` the entries dropped to stay within the size limits.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of cacheable requests answered with ``304 Not Modified``."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Body of a cached response and the validators to revalidate it with."""
+
+    content: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def validators(self) -> Dict[str, str]:
+        """Return the conditional request headers for this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Bounded LRU store of response bodies keyed by URL and query parameters.
+
+    Only GET requests to the opted-in endpoints (``"METHOD /path"`` with
+    numeric ids written as ``{id}``, see
+    :func:`~fireflyiii_enricher_core.instrumentation.endpoint_of`) are cached,
+    and only responses carrying an ``ETag`` or ``Last-Modified`` header. The
+    cache is safe to share between threads.
+
+    Examples:
+        cache = ResponseCache(max_entries=512)
+        client = FireflyClient(url, token, response_cache=cache)
+        client.categories.refresh()  # later refreshes are answered with 304s
+        cache.stats.hit_ratio
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 16 * 1024 * 1024,
+        endpoints: Iterable[str] = DEFAULT_ENDPOINTS,
+    ) -> None:
+        """
+        Create an empty cache.
+
+        Args:
+            max_entries (int, optional): Maximum number of cached responses.
+                Defaults to 256.
+            max_bytes (int, optional): Maximum total size of the cached
+                bodies. Defaults to 16 MiB.
+            endpoints (Iterable[str], optional): Endpoints to cache. Defaults
+                to the category listing and single-transaction GETs.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.endpoints = set(endpoints)
+        self.stats = HttpCacheStats()
+        self.size = 0
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def enable(self, endpoint: str) -> None:
+        """Opt an endpoint such as ``"GET /api/v1/tags"`` in to caching."""
+        self.endpoints.add(endpoint)
+
+    def disable(self, endpoint: str) -> None:
+        """Stop caching an endpoint; its entries expire through the LRU."""
+        self.endpoints.discard(endpoint)
+
+    def key(
+        self, method: str, url: str, params: Mapping[str, Any] | None = None
+    ) -> str | None:
+        """Return the cache key of a request, or `None` if it is not cacheable."""
+        if endpoint_of(method, url) not in self.endpoints:
+            return None
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted(params.items()))}"
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Return the entry for ``key`` and mark it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def hit(self) -> None:
+        """Count a response served from the cache."""
+        with self._lock:
+            self.stats.hits += 1
+
+    def store(
+        self, key: str, content: bytes, headers: Mapping[str, str]
+    ) -> CachedResponse | None:
+        """
+        Cache a downloaded body if the response carries a validator.
+
+        Returns:
+            CachedResponse | None: The new entry, or `None` if the response
+            could not be cached.
+        """
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        with self._lock:
+            self.stats.misses += 1
+            self._drop(key)
+            if not (etag or last_modified) or len(content) > self.max_bytes:
+                return None
+            entry = CachedResponse(content, etag, last_modified)
+            self._entries[key] = entry
+            self.size += len(content)
+            self.stats.stores += 1
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted.content)
+                self.stats.evictions += 1
+            return entry
+
+    def invalidate(self, url: str) -> None:
+        """Drop the entries of ``url`` (with any query parameters)."""
+        with self._lock:
+            for key in [k for k in self._entries if k.split("?", 1)[0] == url]:
+                self._drop(key)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry.content)
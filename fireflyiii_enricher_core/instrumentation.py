@@ -0,0 +1,189 @@
+"""Request-level instrumentation hooks and a latency aggregator."""
+
+import functools
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, TypeVar, Union, cast
+from urllib.parse import urlsplit
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_of(method: str, url: str) -> str:
+    """Return ``"METHOD /path"`` with numeric ids replaced by ``{id}``."""
+    return f"{method.upper()} {_ID_SEGMENT.sub('/{id}', urlsplit(url).path)}"
+
+
+@dataclass
+class RequestTrace:
+    """Mutable measurements filled in while a traced request is running."""
+
+    attempts: int = 0
+    backoff_seconds: float = 0.0
+    status: int | None = None
+    payload_bytes: int = 0
+    decode_seconds: float = 0.0
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass(frozen=True)
+class RequestEvent:
+    """
+    One call of the request layer, including its retries.
+
+    ``duration`` covers the whole call: every attempt, the backoff sleeps
+    (also reported alone as ``backoff_seconds``) and the JSON decoding of the
+    final response (``decode_seconds``).
+    """
+
+    method: str
+    url: str
+    endpoint: str
+    status: int | None
+    duration: float
+    decode_seconds: float
+    payload_bytes: int
+    attempts: int
+    backoff_seconds: float
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class OperationEvent:
+    """A completed client operation such as ``fetch_transactions``."""
+
+    name: str
+    duration: float
+    pages: int = 0
+    items: int = 0
+    error: str | None = None
+
+
+Event = Union[RequestEvent, OperationEvent]
+Hook = Callable[[Event], None]
+ClientMethod = TypeVar("ClientMethod", bound=Callable[..., Any])
+
+
+def instrumented(method: ClientMethod) -> ClientMethod:
+    """
+    Emit an :class:`OperationEvent` for each call of a client method.
+
+    The event holds the call duration, the number of pages counted by the
+    client while the call ran and, for list results, the number of items.
+    Nested operations add their pages to the enclosing one. Does nothing
+    while the client has no hooks.
+    """
+
+    # pylint: disable=protected-access
+    @functools.wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        if not self.hooks:
+            return method(self, *args, **kwargs)
+        outer_pages = getattr(self._pages, "count", None)
+        self._pages.count = 0
+        started = time.perf_counter()
+        result = None
+        error: BaseException | None = None
+        try:
+            result = method(self, *args, **kwargs)
+            return result
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            pages = self._pages.count
+            if outer_pages is None:
+                del self._pages.count
+            else:
+                self._pages.count = outer_pages + pages
+            self._emit(
+                OperationEvent(
+                    name=method.__name__,
+                    duration=time.perf_counter() - started,
+                    pages=pages,
+                    items=len(result) if isinstance(result, list) else 0,
+                    error=str(error) if error is not None else None,
+                )
+            )
+
+    return cast(ClientMethod, wrapper)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of ``values`` (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(fraction * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+@dataclass
+class EndpointReport:
+    """Aggregated statistics of one endpoint."""
+
+    calls: int
+    errors: int
+    p50: float
+    p95: float
+    total_seconds: float
+    decode_seconds: float
+    backoff_seconds: float
+    payload_bytes: int
+
+
+@dataclass
+class LatencyAggregator:
+    """
+    Hook that collects request events and reports p50/p95 per endpoint.
+
+    Examples:
+        metrics = LatencyAggregator()
+        client.add_hook(metrics)
+        client.fetch_transactions()
+        metrics.report()["GET /api/v1/transactions"].p95
+    """
+
+    requests: List[RequestEvent] = field(default_factory=list)
+    operations: List[OperationEvent] = field(default_factory=list)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def __call__(self, event: Event) -> None:
+        with self._lock:
+            if isinstance(event, RequestEvent):
+                self.requests.append(event)
+            else:
+                self.operations.append(event)
+
+    def report(self) -> Dict[str, EndpointReport]:
+        """Return the aggregated statistics keyed by endpoint."""
+        with self._lock:
+            events = list(self.requests)
+        grouped: Dict[str, List[RequestEvent]] = {}
+        for event in events:
+            grouped.setdefault(event.endpoint, []).append(event)
+        result: Dict[str, EndpointReport] = {}
+        for endpoint, group in sorted(grouped.items()):
+            durations = [event.duration for event in group]
+            result[endpoint] = EndpointReport(
+                calls=len(group),
+                errors=sum(1 for event in group if event.error is not None),
+                p50=percentile(durations, 0.50),
+                p95=percentile(durations, 0.95),
+                total_seconds=sum(durations),
+                decode_seconds=sum(event.decode_seconds for event in group),
+                backoff_seconds=sum(event.backoff_seconds for event in group),
+                payload_bytes=sum(event.payload_bytes for event in group),
+            )
+        return result
+
+    def reset(self) -> None:
+        """Forget all collected events."""
+        with self._lock:
+            self.requests.clear()
+            self.operations.clear()
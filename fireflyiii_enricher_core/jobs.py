@@ -0,0 +1,296 @@
+"""Resumable bulk enrichment jobs with a durable local checkpoint log."""
+
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Set
+
+from fireflyiii_enricher_core.batch import (
+    TransactionUpdate,
+    UpdateResult,
+    UpdateStatus,
+    apply_updates,
+)
+
+if TYPE_CHECKING:
+    from fireflyiii_enricher_core.firefly_client import FireflyClient
+
+Planner = Callable[[Dict[str, Any]], TransactionUpdate | None]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    name TEXT PRIMARY KEY,
+    params TEXT NOT NULL,
+    last_page INTEGER NOT NULL,
+    last_id TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS applied (
+    job TEXT NOT NULL,
+    transaction_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (job, transaction_id)
+);
+"""
+
+
+class CheckpointLog:
+    """
+    On-disk progress of one named job: the last fully processed page, the id
+    of its last transaction and the ids of the transactions whose update is
+    done.
+
+    Every change is committed immediately, so the log survives the process
+    being killed at any point. Several jobs can share one file.
+    """
+
+    def __init__(self, path: str | Path, job: str) -> None:
+        """
+        Open (or create) the checkpoint database.
+
+        Args:
+            path (str | Path): SQLite file, or a directory in which
+                ``checkpoints.sqlite`` is created.
+            job (str): Name of the job whose progress is tracked.
+        """
+        path = Path(path)
+        if path.is_dir():
+            path = path / "checkpoints.sqlite"
+        self.path = path
+        self.job = job
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "CheckpointLog":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def start(self, params: Dict[str, Any]) -> int:
+        """
+        Register the job's parameters and return the last completed page.
+
+        Raises:
+            ValueError: If the job was checkpointed with other parameters, so
+                its page numbers would not line up.
+        """
+        encoded = json.dumps(params, sort_keys=True, default=str)
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT params, last_page FROM jobs WHERE name = ?", (self.job,)
+            ).fetchone()
+            if row is None:
+                self._db.execute(
+                    "INSERT INTO jobs VALUES (?, ?, 0, NULL, ?)",
+                    (self.job, encoded, time.time()),
+                )
+                return 0
+        if row[0] != encoded:
+            raise ValueError(
+                f"Checkpoint of job {self.job!r} was written for {row[0]}, "
+                f"not {encoded}; reset it to start over"
+            )
+        return int(row[1])
+
+    @property
+    def last_page(self) -> int:
+        """Last page whose transactions are all done (0 before the first)."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT last_page FROM jobs WHERE name = ?", (self.job,)
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    @property
+    def last_id(self) -> str | None:
+        """Id of the last transaction on :attr:`last_page`, if any."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT last_id FROM jobs WHERE name = ?", (self.job,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def complete_page(self, page: int, last_id: int | str | None = None) -> None:
+        """
+        Remember that every transaction up to ``page`` is done.
+
+        ``last_id`` is the id of the page's last transaction, used to detect
+        that the listing shifted before the job is resumed.
+        """
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE jobs SET last_page = ?, last_id = ?, updated_at = ? "
+                "WHERE name = ?",
+                (
+                    page,
+                    None if last_id is None else str(last_id),
+                    time.time(),
+                    self.job,
+                ),
+            )
+
+    def applied_ids(self) -> Set[str]:
+        """Return the ids of the transactions whose update is done."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT transaction_id FROM applied WHERE job = ?", (self.job,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def mark_done(self, transaction_id: int | str, status: UpdateStatus) -> None:
+        """Record a transaction as applied or already up to date."""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO applied VALUES (?, ?, ?)",
+                (self.job, str(transaction_id), status.value),
+            )
+
+    def reset(self) -> None:
+        """Forget the job's progress."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM jobs WHERE name = ?", (self.job,))
+            self._db.execute("DELETE FROM applied WHERE job = ?", (self.job,))
+
+
+@dataclass
+class JobReport:
+    """Outcome of a :func:`run_job` call."""
+
+    resumed_after_page: int
+    pages: int = 0
+    last_page: int = 0
+    applied: int = 0
+    identical: int = 0
+    already_done: int = 0
+    failed: List[UpdateResult] = field(default_factory=list)
+
+
+# pylint: disable=too-many-arguments,too-many-locals
+def run_job(
+    client: "FireflyClient",
+    checkpoint: CheckpointLog,
+    plan: Planner,
+    *,
+    tx_type: str = "withdrawal",
+    limit: int = 1000,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    max_workers: int = 8,
+    parallel: bool = False,
+) -> JobReport:
+    """
+    Apply ``plan`` to every transaction, resuming where a previous run stopped.
+
+    Pages are fetched starting at the checkpoint's last completed page, which
+    is read again because deletions since the previous run shift later
+    transactions onto it. If its last transaction is no longer on it (more
+    deletions than a page, or that transaction was deleted) the page numbers
+    cannot be trusted and the job starts over from the first page.
+    Transactions already recorded as done, including those that insertions
+    shifted onto later pages, are skipped without any request;
+    the others are updated with :func:`~fireflyiii_enricher_core.batch.apply_updates`
+    against the page data (one PUT each, no GET) on ``max_workers`` threads,
+    and each one is recorded as soon as its update finishes. A page counts as
+    completed once it and all earlier pages have no failed update, so failed
+    updates are retried by the next run.
+
+    The job's parameters are stored with the checkpoint; resuming with other
+    ones raises :class:`ValueError` (call :meth:`CheckpointLog.reset` first).
+
+    Args:
+        client (FireflyClient): Client used to send the requests.
+        checkpoint (CheckpointLog): Progress log of the job.
+        plan (Planner): Returns the update for a raw transaction, or `None` to
+            leave it alone. It must be deterministic across runs.
+        tx_type (str, optional): Transaction type. Defaults to "withdrawal".
+        limit (int, optional): Page size. Defaults to 1000.
+        start_date (date | None, optional): Start of the range. Defaults to `None`.
+        end_date (date | None, optional): End of the range. Defaults to `None`.
+        max_workers (int, optional): Concurrent updates. Defaults to 8.
+        parallel (bool, optional): Prefetch pages concurrently while updates
+            run. Defaults to `False`.
+
+    Returns:
+        JobReport: Counts of this run; ``failed`` lists the failed updates.
+
+    Examples:
+        with CheckpointLog("enrich.sqlite", "tag-2024") as checkpoint:
+            report = run_job(
+                client, checkpoint, lambda tx: TransactionUpdate(tag="2024"),
+                start_date=date(2024, 1, 1), end_date=date(2024, 12, 31),
+            )
+    """
+    params = {
+        "tx_type": tx_type,
+        "limit": limit,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+    resumed = checkpoint.start(params)
+    done = checkpoint.applied_ids()
+    report = JobReport(resumed_after_page=resumed, last_page=resumed)
+
+    def fetch(first_page: int) -> Iterator[List[Any]]:
+        return client.iter_transaction_pages(
+            tx_type,
+            limit,
+            start_date,
+            end_date,
+            parallel=parallel,
+            max_workers=max_workers,
+            first_page=first_page,
+        )
+
+    first_page = max(resumed, 1)
+    pages = fetch(first_page)
+    if resumed:
+        overlap = next(pages, [])
+        if checkpoint.last_id not in {str(tx["id"]) for tx in overlap}:
+            first_page = 1
+            pages = fetch(first_page)
+        else:
+            pages = itertools.chain([overlap], pages)
+
+    def record(result: UpdateResult) -> None:
+        if result.status is UpdateStatus.FAILED:
+            report.failed.append(result)
+            return
+        checkpoint.mark_done(result.transaction_id, result.status)
+        if result.status is UpdateStatus.APPLIED:
+            report.applied += 1
+        else:
+            report.identical += 1
+
+    clean = True
+    for page, transactions in enumerate(pages, start=first_page):
+        updates = []
+        for transaction in transactions:
+            transaction_id = str(transaction["id"])
+            if transaction_id in done:
+                report.already_done += 1
+                continue
+            update = plan(transaction)
+            if update is not None:
+                updates.append((transaction_id, update))
+        failures = len(report.failed)
+        apply_updates(
+            client, updates, transactions, max_workers=max_workers, on_result=record
+        )
+        report.pages += 1
+        clean = clean and len(report.failed) == failures
+        if clean and transactions:
+            checkpoint.complete_page(page, transactions[-1]["id"])
+            report.last_page = page
+    return report
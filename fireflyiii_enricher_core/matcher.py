@@ -1,8 +1,19 @@
 """Match bank transactions with records retrieved from Firefly."""
 
-from typing import List
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, Generic, Iterable, List, Tuple, TypeVar
 
-from fireflyiii_enricher_core.firefly_client import SimplifiedItem, SimplifiedTx
+from fireflyiii_enricher_core.models import (
+    Matchable,
+    MatchKey,
+    SimplifiedItem,
+    SimplifiedTx,
+    to_minor_units,
+)
+
+RecordT = TypeVar("RecordT", bound=Matchable)
+TxT = TypeVar("TxT", bound=Matchable)
 
 
 # pylint: disable=too-few-public-methods
@@ -17,3 +28,141 @@ class TransactionMatcher:
             if record.compare(tx):
                 matches.append(record)
         return matches
+
+    @staticmethod
+    def match_all(
+        transactions: Iterable[TxT], records: Iterable[RecordT]
+    ) -> List[Tuple[TxT, List[RecordT]]]:
+        """Match every transaction against ``records`` using a hash index."""
+        return IndexedTransactionMatcher(records).match_all(transactions)
+
+
+class IndexedTransactionMatcher(Generic[RecordT]):
+    """
+    Exact matcher backed by a hash index over the records.
+
+    Records are indexed once by ``(date, absolute amount in minor units)``, so
+    each lookup is O(1) instead of a scan over all records. Amounts are
+    compared after rounding to two decimal places. Records and transactions
+    may be :class:`SimplifiedItem`/:class:`SimplifiedTx` or
+    :class:`CompactTx` objects, or anything else with a ``match_key()``.
+    """
+
+    def __init__(self, records: Iterable[RecordT]) -> None:
+        self._index: Dict[MatchKey, List[RecordT]] = {}
+        for record in records:
+            self._index.setdefault(record.match_key(), []).append(record)
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._index.values())
+
+    def match(self, tx: Matchable) -> List[RecordT]:
+        """Return all records that match the given transaction."""
+        return list(self._index.get(tx.match_key(), ()))
+
+    def match_all(self, transactions: Iterable[TxT]) -> List[Tuple[TxT, List[RecordT]]]:
+        """
+        Match every transaction in a single pass.
+
+        Returns:
+            List[Tuple[TxT, List[RecordT]]]: Each transaction paired with its
+            matching records, in input order.
+        """
+        index = self._index
+        return [(tx, list(index.get(tx.match_key(), ()))) for tx in transactions]
+
+
+@dataclass(frozen=True)
+class MatchCandidate(Generic[RecordT]):
+    """A record that falls within the tolerance window of a transaction."""
+
+    record: RecordT
+    score: float
+    day_delta: int
+    amount_delta: int
+
+
+class FuzzyTransactionMatcher(Generic[RecordT]):
+    """
+    Tolerance-window matcher backed by sorted indexes.
+
+    Records are grouped by absolute amount in minor units; the distinct
+    amounts are kept sorted and every group is sorted by date ordinal. A
+    lookup bisects the amount range ``amount ± amount_tolerance`` and, inside
+    each amount group, the date range ``date ± date_window``, so matching
+    stays near O(n log n) for a whole import.
+
+    Candidates are scored between 0 and 1: an exact date and amount scores
+    1.0, and the date and amount distances each take away up to half of it,
+    proportionally to how much of their window they use.
+    """
+
+    def __init__(
+        self,
+        records: Iterable[RecordT],
+        date_window: int = 3,
+        amount_tolerance: float = 0.0,
+    ) -> None:
+        """
+        Build the indexes over ``records``.
+
+        Args:
+            records (Iterable[RecordT]): Records to match against.
+            date_window (int, optional): Maximum difference in days.
+                Defaults to 3.
+            amount_tolerance (float, optional): Maximum absolute difference of
+                the amounts, in currency units. Defaults to 0.0.
+        """
+        if date_window < 0 or amount_tolerance < 0:
+            raise ValueError("date_window and amount_tolerance must not be negative")
+        self.date_window = date_window
+        self.amount_tolerance = to_minor_units(amount_tolerance)
+        groups: Dict[int, List[Tuple[int, int, RecordT]]] = {}
+        for seq, record in enumerate(records):
+            ordinal, amount = record.match_key()
+            groups.setdefault(amount, []).append((ordinal, seq, record))
+        self._amounts = sorted(groups)
+        self._ordinals: Dict[int, List[int]] = {}
+        self._records: Dict[int, List[RecordT]] = {}
+        for amount, group in groups.items():
+            group.sort(key=lambda item: (item[0], item[1]))
+            self._ordinals[amount] = [item[0] for item in group]
+            self._records[amount] = [item[2] for item in group]
+
+    def score(self, day_delta: int, amount_delta: int) -> float:
+        """Score a candidate by its date and amount (minor units) distance."""
+        return (
+            1.0
+            - 0.5 * day_delta / (self.date_window + 1)
+            - 0.5 * amount_delta / (self.amount_tolerance + 1)
+        )
+
+    def candidates(self, tx: Matchable) -> List[MatchCandidate[RecordT]]:
+        """Return records within the tolerance window, best match first."""
+        ordinal, tx_amount = tx.match_key()
+        result: List[MatchCandidate[RecordT]] = []
+        low = bisect_left(self._amounts, tx_amount - self.amount_tolerance)
+        high = bisect_right(self._amounts, tx_amount + self.amount_tolerance)
+        for amount in self._amounts[low:high]:
+            ordinals = self._ordinals[amount]
+            start = bisect_left(ordinals, ordinal - self.date_window)
+            stop = bisect_right(ordinals, ordinal + self.date_window)
+            for position in range(start, stop):
+                day_delta = abs(ordinals[position] - ordinal)
+                amount_delta = abs(amount - tx_amount)
+                result.append(
+                    MatchCandidate(
+                        self._records[amount][position],
+                        self.score(day_delta, amount_delta),
+                        day_delta,
+                        amount_delta,
+                    )
+                )
+        result.sort(key=lambda candidate: -candidate.score)
+        return result
+
+    def match_all(
+        self, transactions: Iterable[TxT]
+    ) -> List[Tuple[TxT, List[MatchCandidate[RecordT]]]]:
+        """Return the ranked candidates for every transaction, in input order."""
+        return [(tx, self.candidates(tx)) for tx in transactions]
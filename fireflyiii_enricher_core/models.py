@@ -0,0 +1,198 @@
+"""Lightweight transaction models shared by the client, filters and matchers."""
+
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, List, Protocol, Tuple
+
+MatchKey = Tuple[int, int]
+"""``(date ordinal, absolute amount in minor units)`` used by the matchers."""
+
+
+class Matchable(Protocol):  # pylint: disable=too-few-public-methods
+    """Anything the matchers can index: it only needs a :data:`MatchKey`."""
+
+    def match_key(self) -> MatchKey:
+        """Return the ``(date ordinal, absolute minor-unit amount)`` key."""
+
+
+def to_minor_units(amount: float | str | Decimal) -> int:
+    """Convert an amount to integer minor units (cents), rounding half up."""
+    if isinstance(amount, str):
+        # Fast path for plain API amounts such as "-12.340000000000".
+        whole, _, fraction = amount.partition(".")
+        digits = whole[1:] if whole[:1] == "-" else whole
+        if (
+            digits.isdecimal()
+            and (not fraction or fraction.isdecimal())
+            and not fraction[2:].strip("0")
+        ):
+            minor = int(digits) * 100 + int(fraction[:2].ljust(2, "0"))
+            return -minor if whole[:1] == "-" else minor
+    value = Decimal(str(amount)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return int(value * 100)
+
+
+@dataclass(eq=False)
+class SimplifiedItem:
+    """Representation of a simplified transaction item."""
+
+    date: date
+    amount: float
+
+    def compare_amount(self, amount: float) -> bool:
+        """Return ``True`` if the amounts are equal ignoring their sign."""
+        return abs(float(self.amount)) == abs(float(amount))
+
+    def compare(self, other: Any) -> bool:
+        """Return ``True`` if ``other`` has the same date and amount."""
+        if not isinstance(other, SimplifiedItem):
+            return False
+        return self.date == other.date and self.compare_amount(other.amount)
+
+    def match_key(self) -> MatchKey:
+        """Return the ``(date ordinal, absolute minor-unit amount)`` key."""
+        return self.date.toordinal(), abs(to_minor_units(self.amount))
+
+
+@dataclass
+class SimplifiedTx(SimplifiedItem):
+    """Simplified representation of a Firefly III transaction."""
+
+    id: str
+    description: str
+    tags: List[str]
+    notes: str
+    category: str
+
+
+@dataclass(slots=True)
+class CompactTx:
+    """
+    Memory-lean representation of a Firefly III transaction.
+
+    Uses ``__slots__`` instead of a per-instance ``__dict__``, stores the
+    amount as signed integer minor units and the date as an ordinal, and can
+    be passed to the matchers directly.
+    """
+
+    id: str
+    date_ordinal: int
+    amount_minor: int
+    description: str
+    tags: Tuple[str, ...]
+    notes: str
+    category: str
+
+    @classmethod
+    def from_api_dict(cls, transaction_raw: Dict[str, Any]) -> "CompactTx":
+        """Create instance of CompactTx from a raw api transaction."""
+        sub = transaction_raw["attributes"]["transactions"][0]
+        return cls(
+            id=transaction_raw["id"],
+            date_ordinal=datetime.fromisoformat(sub["date"]).toordinal(),
+            amount_minor=to_minor_units(sub["amount"]),
+            description=sub["description"],
+            tags=tuple(sub.get("tags") or ()),
+            notes=sub.get("notes") or "",
+            category=sys.intern(sub.get("category_name") or ""),
+        )
+
+    @property
+    def date(self) -> date:
+        """Transaction date."""
+        return date.fromordinal(self.date_ordinal)
+
+    @property
+    def amount(self) -> Decimal:
+        """Transaction amount in major units."""
+        return Decimal(self.amount_minor).scaleb(-2)
+
+    def match_key(self) -> MatchKey:
+        """Return the ``(date ordinal, absolute minor-unit amount)`` key."""
+        return self.date_ordinal, abs(self.amount_minor)
+
+
+SplitKey = Tuple[str, int]
+"""``(transaction id, split index)`` identifying one split of a transaction."""
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass(slots=True)
+class CompactSplit:
+    """
+    One split of a Firefly III transaction, laid out like :class:`CompactTx`.
+
+    Multi-split transactions flatten into one record per split, addressed by
+    :attr:`key`; ``journal_id`` is the split's ``transaction_journal_id``.
+    Records can be passed to the matchers, and their ``transaction_id`` and
+    ``split_index`` target the split in updates.
+    """
+
+    transaction_id: str
+    split_index: int
+    split_count: int
+    journal_id: str
+    date_ordinal: int
+    amount_minor: int
+    description: str
+    tags: Tuple[str, ...]
+    notes: str
+    category_id: str | None
+    category: str
+
+    @classmethod
+    def from_api_split(
+        cls, transaction_id: str, split_index: int, splits: List[Dict[str, Any]]
+    ) -> "CompactSplit":
+        """Create the record of ``splits[split_index]`` of a raw transaction."""
+        sub = splits[split_index]
+        return cls(
+            transaction_id=transaction_id,
+            split_index=split_index,
+            split_count=len(splits),
+            journal_id=str(sub.get("transaction_journal_id", "")),
+            date_ordinal=datetime.fromisoformat(sub["date"]).toordinal(),
+            amount_minor=to_minor_units(sub["amount"]),
+            description=sub["description"],
+            tags=tuple(sub.get("tags") or ()),
+            notes=sub.get("notes") or "",
+            category_id=sub.get("category_id"),
+            category=sys.intern(sub.get("category_name") or ""),
+        )
+
+    @property
+    def key(self) -> SplitKey:
+        """``(transaction id, split index)`` of this split."""
+        return self.transaction_id, self.split_index
+
+    @property
+    def date(self) -> date:
+        """Split date."""
+        return date.fromordinal(self.date_ordinal)
+
+    @property
+    def amount(self) -> Decimal:
+        """Split amount in major units."""
+        return Decimal(self.amount_minor).scaleb(-2)
+
+    def match_key(self) -> MatchKey:
+        """Return the ``(date ordinal, absolute minor-unit amount)`` key."""
+        return self.date_ordinal, abs(self.amount_minor)
+
+
+@dataclass
+class SimplifiedCategory:
+    """Simplified representation of a Firefly III Category."""
+
+    id: str
+    name: str
+
+    @classmethod
+    def from_api_dict(cls, category_raw: dict[str, Any]) -> 'SimplifiedCategory':
+        """Create instance of SimplifiedCategory from raw api dict"""
+        category_id = category_raw.get("id", "")
+        attributes = category_raw.get("attributes", {})
+        name = attributes.get("name", "")
+        return cls(id=category_id, name=name)
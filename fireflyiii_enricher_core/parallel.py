@@ -0,0 +1,239 @@
+"""Reconcile large transaction sets with bank records on a process pool."""
+
+import os
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from fireflyiii_enricher_core.matcher import FuzzyTransactionMatcher
+from fireflyiii_enricher_core.models import Matchable, MatchKey, to_minor_units
+from fireflyiii_enricher_core.search import TransactionQuery
+
+
+@dataclass(frozen=True)
+class ReconcileMatch:
+    """A transaction/record pair within the tolerance window."""
+
+    tx_index: int
+    transaction_id: str
+    record_index: int
+    score: float
+    day_delta: int
+    amount_delta: int
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class _Shard:
+    """
+    Columns of one date range, the only data pickled to a worker.
+
+    Transactions keep the first split's fields as plain strings (parsing them
+    is the work being distributed); records are reduced to their match keys.
+    """
+
+    tx_index: "array[int]"
+    ids: List[str]
+    dates: List[str]
+    amounts: List[str]
+    descriptions: List[str]
+    category_ids: List[str | None]
+    tags: List[List[str]]
+    split_counts: "array[int]"
+    rec_index: "array[int]"
+    rec_ordinals: "array[int]"
+    rec_amounts: "array[int]"
+
+
+class _Key:  # pylint: disable=too-few-public-methods
+    """Matchable stand-in carrying an index into the caller's sequence."""
+
+    __slots__ = ("key", "index")
+
+    def __init__(self, key: MatchKey, index: int) -> None:
+        self.key = key
+        self.index = index
+
+    def match_key(self) -> MatchKey:
+        """Return the stored key."""
+        return self.key
+
+
+def _slim_documents(shard: _Shard) -> Iterator[Dict[str, Any]]:
+    """Rebuild just enough of each raw transaction for the query filters."""
+    for position, tx_id in enumerate(shard.ids):
+        sub = {
+            "date": shard.dates[position],
+            "amount": shard.amounts[position],
+            "description": shard.descriptions[position],
+            "category_id": shard.category_ids[position],
+            "tags": shard.tags[position],
+            "_position": position,
+        }
+        splits = [sub] * shard.split_counts[position]
+        yield {"id": tx_id, "attributes": {"transactions": splits}}
+
+
+# pylint: disable=too-many-locals
+def _reconcile_shard(
+    shard: _Shard,
+    query: TransactionQuery | None,
+    date_window: int,
+    amount_tolerance: float,
+) -> Tuple["array[int]", "array[int]", "array[float]", "array[int]", "array[int]"]:
+    """Filter and match one shard; return the matches as flat arrays."""
+    documents: Iterator[Dict[str, Any]] = _slim_documents(shard)
+    if query is not None:
+        documents = query.apply_all_locally(documents)
+    matcher = FuzzyTransactionMatcher(
+        [
+            _Key((ordinal, amount), index)
+            for index, ordinal, amount in zip(
+                shard.rec_index, shard.rec_ordinals, shard.rec_amounts
+            )
+        ],
+        date_window=date_window,
+        amount_tolerance=amount_tolerance,
+    )
+    tx_out, rec_out = array("q"), array("q")
+    scores, days, amounts = array("d"), array("q"), array("q")
+    for document in documents:
+        sub = document["attributes"]["transactions"][0]
+        key = (
+            date.fromisoformat(sub["date"][:10]).toordinal(),
+            abs(to_minor_units(sub["amount"])),
+        )
+        tx_index = shard.tx_index[sub["_position"]]
+        for candidate in matcher.candidates(_Key(key, tx_index)):
+            tx_out.append(tx_index)
+            rec_out.append(candidate.record.index)
+            scores.append(candidate.score)
+            days.append(candidate.day_delta)
+            amounts.append(candidate.amount_delta)
+    return tx_out, rec_out, scores, days, amounts
+
+
+# pylint: disable=too-many-locals
+def _build_shards(
+    transactions: Sequence[Dict[str, Any]],
+    records: Sequence[Matchable],
+    shards: int,
+    date_window: int,
+) -> List[_Shard]:
+    """Split transactions into ``shards`` equal date ranges with their records."""
+    firsts = [tx["attributes"]["transactions"][0] for tx in transactions]
+    # ISO dates sort chronologically as strings, so no parsing is needed here.
+    order = sorted(range(len(firsts)), key=lambda i: firsts[i]["date"][:10])
+    rec_keys = [record.match_key() for record in records]
+    rec_order = sorted(range(len(rec_keys)), key=lambda i: rec_keys[i][0])
+    rec_ordinals = [rec_keys[i][0] for i in rec_order]
+
+    result = []
+    size = -(-len(order) // shards)
+    for start in range(0, len(order), size):
+        chunk = order[start : start + size]
+        low = date.fromisoformat(firsts[chunk[0]]["date"][:10]).toordinal()
+        high = date.fromisoformat(firsts[chunk[-1]]["date"][:10]).toordinal()
+        # Records within the date window of the range edges go to every
+        # shard that can match them.
+        lo = bisect_left(rec_ordinals, low - date_window)
+        hi = bisect_left(rec_ordinals, high + date_window + 1)
+        rec_chunk = rec_order[lo:hi]
+        subs = [firsts[i] for i in chunk]
+        result.append(
+            _Shard(
+                tx_index=array("q", chunk),
+                ids=[str(transactions[i]["id"]) for i in chunk],
+                dates=[sub["date"] for sub in subs],
+                amounts=[str(sub["amount"]) for sub in subs],
+                descriptions=[sub.get("description", "") for sub in subs],
+                category_ids=[sub.get("category_id") for sub in subs],
+                tags=[list(sub.get("tags") or ()) for sub in subs],
+                split_counts=array(
+                    "q",
+                    (len(transactions[i]["attributes"]["transactions"]) for i in chunk),
+                ),
+                rec_index=array("q", rec_chunk),
+                rec_ordinals=array("q", (rec_keys[i][0] for i in rec_chunk)),
+                rec_amounts=array("q", (rec_keys[i][1] for i in rec_chunk)),
+            )
+        )
+    return result
+
+
+# pylint: disable=too-many-arguments,too-many-locals
+def reconcile(
+    transactions: Sequence[Dict[str, Any]],
+    records: Sequence[Matchable],
+    *,
+    query: TransactionQuery | None = None,
+    date_window: int = 3,
+    amount_tolerance: float = 0.0,
+    processes: int | None = None,
+    shards: int | None = None,
+) -> List[ReconcileMatch]:
+    """
+    Filter and match raw transactions against records on several processes.
+
+    Transactions are sorted by the date of their first split and cut into
+    ``shards`` equal date ranges; each shard receives only the records that
+    can fall into its window. Workers receive flat columns and return flat
+    arrays, so little is pickled. Date parsing, filtering and matching with
+    :class:`FuzzyTransactionMatcher` run in the workers.
+
+    Args:
+        transactions (Sequence[Dict[str, Any]]): Raw API transactions.
+        records (Sequence[Matchable]): Bank records to match against.
+        query (TransactionQuery | None, optional): Filters applied in the
+            workers as by :meth:`TransactionQuery.apply_all_locally`. Client
+            predicates must be picklable and see only the first split's
+            date, amount, description, category_id and tags. Defaults to
+            `None`.
+        date_window (int, optional): Maximum difference in days. Defaults to 3.
+        amount_tolerance (float, optional): Maximum amount difference in
+            currency units. Defaults to 0.0.
+        processes (int | None, optional): Worker processes; ``1`` runs
+            in-process. Defaults to the number of CPUs.
+        shards (int | None, optional): Number of date ranges. Defaults to
+            four per process.
+
+    Returns:
+        List[ReconcileMatch]: Matches ordered by transaction position, then by
+        descending score and record position, independent of the sharding.
+
+    Examples:
+        matches = reconcile(client.fetch_transactions(), bank_records,
+                            query=TransactionQuery(without_category=True))
+    """
+    if not transactions or not records:
+        return []
+    processes = processes or os.cpu_count() or 1
+    shard_count = max(1, min(shards or processes * 4, len(transactions)))
+    parts = _build_shards(transactions, records, shard_count, date_window)
+    args = (query, date_window, amount_tolerance)
+    if processes == 1:
+        outputs = [_reconcile_shard(part, *args) for part in parts]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(_reconcile_shard, part, *args) for part in parts]
+            outputs = [future.result() for future in futures]
+
+    matches = [
+        ReconcileMatch(
+            tx_index,
+            str(transactions[tx_index]["id"]),
+            rec_index,
+            score,
+            day_delta,
+            amount_delta,
+        )
+        for tx_out, rec_out, scores, days, amounts in outputs
+        for tx_index, rec_index, score, day_delta, amount_delta in zip(
+            tx_out, rec_out, scores, days, amounts
+        )
+    ]
+    matches.sort(key=lambda m: (m.tx_index, -m.score, m.record_index))
+    return matches
@@ -0,0 +1,271 @@
+"""Plan transaction updates as exact field diffs and send the fewest writes."""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Tuple
+
+from fireflyiii_enricher_core.batch import TransactionUpdate, UpdateStatus
+
+if TYPE_CHECKING:
+    from fireflyiii_enricher_core.firefly_client import FireflyClient
+
+FIELDS = ("description", "notes", "category_id", "tags")
+
+
+@dataclass(frozen=True)
+class FieldChange:
+    """One split field whose value differs from the fetched transaction."""
+
+    split_index: int
+    field: str
+    old: Any
+    new: Any
+
+
+@dataclass
+class PlannedWrite:
+    """
+    The single PUT that brings one transaction to its desired state.
+
+    ``changes`` lists every differing field; ``payload`` is the
+    ``transactions`` value sent (see
+    :func:`~fireflyiii_enricher_core.updates.split_update`) and ``merged`` the
+    number of requested updates it combines.
+    """
+
+    transaction_id: str
+    changes: List[FieldChange]
+    payload: Dict[str, Any] | List[Dict[str, Any]]
+    merged: int
+    document: Dict[str, Any] = field(repr=False)
+
+
+@dataclass
+class UpdatePlan:
+    """
+    Writes computed by :func:`plan_updates`, to review before :func:`execute_plan`.
+
+    ``unchanged`` holds the ids whose requested updates are all current
+    already and ``errors`` the ``(transaction id, message)`` of updates that
+    cannot be applied; neither causes a write.
+    """
+
+    writes: List[PlannedWrite]
+    unchanged: List[str]
+    errors: List[Tuple[str, str]]
+    requested: int
+    apply_rules: bool = True
+    fire_webhooks: bool = True
+
+    def __len__(self) -> int:
+        return len(self.writes)
+
+    @property
+    def field_changes(self) -> int:
+        """Number of changed fields over all writes."""
+        return sum(len(write.changes) for write in self.writes)
+
+    def report(self) -> str:
+        """Return a human readable summary with one line per changed field."""
+        lines = [
+            f"{len(self.writes)} writes ({self.field_changes} fields) for "
+            f"{self.requested} requested updates; {len(self.unchanged)} "
+            f"transactions already current, {len(self.errors)} errors; "
+            f"apply_rules={self.apply_rules}, fire_webhooks={self.fire_webhooks}"
+        ]
+        for write in self.writes:
+            for change in write.changes:
+                lines.append(
+                    f"PUT {write.transaction_id} split {change.split_index} "
+                    f"{change.field}: {change.old!r} -> {change.new!r}"
+                )
+        lines.extend(f"ERROR {tx_id}: {message}" for tx_id, message in self.errors)
+        return "\n".join(lines)
+
+
+@dataclass
+class WriteResult:
+    """Outcome of one planned write."""
+
+    transaction_id: str
+    status: UpdateStatus
+    error: str | None = None
+    response: Any = None
+
+
+def _field_values(split: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the planned fields of a split, normalized for comparison."""
+    category_id = split.get("category_id")
+    return {
+        "description": split.get("description") or "",
+        "notes": split.get("notes") or "",
+        "category_id": None if category_id is None else str(category_id),
+        "tags": list(split.get("tags") or ()),
+    }
+
+
+def _apply(
+    state: List[Dict[str, Any]],
+    update: TransactionUpdate,
+    resolve_category: Callable[[str], str] | None,
+) -> None:
+    """Apply ``update`` to the working ``state`` of a transaction's splits."""
+    index = update.split_index or 0
+    if not 0 <= index < len(state):
+        raise RuntimeError(f"Transaction has no split {index}")
+    if update.tag is not None and update.split_index is None and len(state) != 1:
+        raise RuntimeError("Transaction is not single part")
+    category_id: Any = update.category_id
+    if update.category_name is not None:
+        if resolve_category is None:
+            raise ValueError("category_name needs a category resolver")
+        category_id = resolve_category(update.category_name)
+    target = state[index]
+    if update.description is not None:
+        target["description"] = update.description
+    if update.notes is not None:
+        target["notes"] = update.notes
+    if category_id is not None:
+        target["category_id"] = str(category_id)
+    if update.tag is not None and update.tag not in target["tags"]:
+        target["tags"] = [*target["tags"], update.tag]
+
+
+def _payload(
+    splits: List[Dict[str, Any]], changes: List[FieldChange]
+) -> Dict[str, Any] | List[Dict[str, Any]]:
+    """Build the ``transactions`` value carrying only the changed fields."""
+    per_split: List[Dict[str, Any]] = [{} for _ in splits]
+    for change in changes:
+        per_split[change.split_index][change.field] = change.new
+    if len(splits) == 1:
+        return per_split[0]
+    # Firefly III deletes the splits missing from an update, so list them all.
+    return [
+        {"transaction_journal_id": sub["transaction_journal_id"], **fields}
+        for sub, fields in zip(splits, per_split)
+    ]
+
+
+# pylint: disable=too-many-locals
+def plan_updates(
+    transactions: Iterable[Dict[str, Any]],
+    updates: Iterable[Tuple[int | str, TransactionUpdate]],
+    *,
+    resolve_category: Callable[[str], str] | None = None,
+    apply_rules: bool = True,
+    fire_webhooks: bool = True,
+) -> UpdatePlan:
+    """
+    Compute the writes that bring fetched transactions to a desired state.
+
+    All updates of a transaction are applied in order to a working copy of
+    its splits and the result is compared field by field (exact equality,
+    with missing notes/description equal to ``""``) with the fetched data.
+    Each transaction with differences becomes one PUT carrying only the
+    changed fields; updates that cancel out or are already current send
+    nothing. No request is made while planning, except that resolving a
+    ``category_name`` may load the categories once.
+
+    Args:
+        transactions (Iterable[Dict[str, Any]]): Raw transactions as returned
+            by :meth:`FireflyClient.fetch_transactions`.
+        updates (Iterable[Tuple[int | str, TransactionUpdate]]): Transaction id
+            and the change wanted for it; ids may repeat.
+        resolve_category (Callable[[str], str] | None, optional): Maps a
+            category name to its id, e.g. ``client.categories.resolve``.
+            Required for updates using ``category_name``. Defaults to `None`.
+        apply_rules (bool, optional): Let Firefly III run its rules on the
+            written transactions. Defaults to `True`.
+        fire_webhooks (bool, optional): Let Firefly III fire webhooks for the
+            writes. Defaults to `True`.
+
+    Returns:
+        UpdatePlan: The writes, unchanged ids and errors.
+
+    Examples:
+        plan = plan_updates(
+            transactions,
+            [(tx["id"], TransactionUpdate(tag="2024")) for tx in transactions],
+            apply_rules=False,
+            fire_webhooks=False,
+        )
+        print(plan.report())
+        execute_plan(client, plan)
+    """
+    known = {str(tx["id"]): tx for tx in transactions}
+    grouped: Dict[str, List[TransactionUpdate]] = {}
+    requested = 0
+    for transaction_id, update in updates:
+        grouped.setdefault(str(transaction_id), []).append(update)
+        requested += 1
+
+    plan = UpdatePlan([], [], [], requested, apply_rules, fire_webhooks)
+    for transaction_id, group in grouped.items():
+        document = known.get(transaction_id)
+        if document is None:
+            plan.errors.append((transaction_id, "Transaction was not fetched"))
+            continue
+        splits = document["attributes"]["transactions"]
+        original = [_field_values(sub) for sub in splits]
+        state = [dict(values) for values in original]
+        for update in group:
+            try:
+                _apply(state, update, resolve_category)
+            except (RuntimeError, KeyError) as exc:
+                plan.errors.append((transaction_id, str(exc)))
+        changes = [
+            FieldChange(index, name, before[name], after[name])
+            for index, (before, after) in enumerate(zip(original, state))
+            for name in FIELDS
+            if before[name] != after[name]
+        ]
+        if changes:
+            plan.writes.append(
+                PlannedWrite(
+                    transaction_id,
+                    changes,
+                    _payload(splits, changes),
+                    len(group),
+                    document,
+                )
+            )
+        else:
+            plan.unchanged.append(transaction_id)
+    return plan
+
+
+def _write(
+    client: "FireflyClient", plan: UpdatePlan, write: PlannedWrite
+) -> WriteResult:
+    try:
+        response = client.put_transaction(
+            write.transaction_id,
+            write.payload,
+            apply_rules=plan.apply_rules,
+            fire_webhooks=plan.fire_webhooks,
+        )
+    except (RuntimeError, ValueError) as exc:
+        return WriteResult(write.transaction_id, UpdateStatus.FAILED, str(exc))
+    splits = write.document["attributes"]["transactions"]
+    for change in write.changes:
+        splits[change.split_index][change.field] = change.new
+    return WriteResult(write.transaction_id, UpdateStatus.APPLIED, response=response)
+
+
+def execute_plan(
+    client: "FireflyClient", plan: UpdatePlan, max_workers: int = 8
+) -> List[WriteResult]:
+    """
+    Send the writes of ``plan`` concurrently, one PUT per transaction.
+
+    The fetched transactions the plan was built from are refreshed with the
+    new values after each successful write.
+
+    Returns:
+        List[WriteResult]: One result per planned write, in plan order.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(lambda write: _write(client, plan, write), plan.writes)
+        )
@@ -0,0 +1,179 @@
+"""Retry policy and adaptive client-side rate limiting for the request layer."""
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet
+
+from requests import ConnectionError as RequestsConnectionError
+from requests import RequestException, Timeout
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the delay in seconds requested by a ``Retry-After`` header."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request.
+
+    The delay before retry ``n`` is ``backoff_base * 2 ** (n - 1)`` capped at
+    ``backoff_max``, with up to ``jitter`` of it randomized away. A
+    ``Retry-After`` header, when present, takes precedence (capped at
+    ``max_retry_after``).
+    """
+
+    max_attempts: int = 4
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    jitter: float = 0.5
+    retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    retry_timeouts: bool = True
+    retry_connection_errors: bool = True
+    max_retry_after: float = 120.0
+
+    def should_retry(self, exc: RequestException, attempt: int) -> bool:
+        """Return ``True`` if the failed ``attempt`` should be retried."""
+        if attempt >= self.max_attempts:
+            return False
+        if isinstance(exc, Timeout):
+            return self.retry_timeouts
+        if isinstance(exc, RequestsConnectionError):
+            return self.retry_connection_errors
+        response = exc.response
+        return response is not None and response.status_code in self.retry_statuses
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Return the number of seconds to wait after the failed ``attempt``."""
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        backoff = min(self.backoff_base * 2.0 ** (attempt - 1), self.backoff_max)
+        return backoff * (1 - self.jitter * random.random())
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+@dataclass
+class RequestStats:
+    """Counters of the request layer of a client."""
+
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    failures: int = 0
+    backoff_seconds: float = 0.0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def add(self, **counters: float) -> None:
+        """Atomically increment the given counters."""
+        with self._lock:
+            for name, value in counters.items():
+                setattr(self, name, getattr(self, name) + value)
+
+
+# pylint: disable=too-many-instance-attributes
+class RateLimiter:
+    """
+    Thread-safe token bucket whose rate adapts to server throttling.
+
+    Every request takes one token. On a 429 the rate is multiplied by
+    ``decrease_factor`` (never below ``min_rate``) and, if the server sent a
+    ``Retry-After``, the bucket is paused for that long; every successful
+    request raises the rate by ``increase_step`` up to ``max_rate``. One
+    limiter can be shared by several clients and threads.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        *,
+        min_rate: float = 0.5,
+        max_rate: float | None = None,
+        decrease_factor: float = 0.5,
+        increase_step: float = 0.1,
+    ) -> None:
+        """
+        Create a token bucket.
+
+        Args:
+            rate (float): Initial requests per second.
+            burst (int, optional): Bucket capacity. Defaults to 1.
+            min_rate (float, optional): Lower bound of the adapted rate.
+                Defaults to 0.5.
+            max_rate (float | None, optional): Upper bound of the adapted rate.
+                Defaults to the initial ``rate``.
+            decrease_factor (float, optional): Rate multiplier on a 429.
+                Defaults to 0.5.
+            increase_step (float, optional): Rate increase per success.
+                Defaults to 0.1.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.acquired = 0
+        self.throttles = 0
+        self.waited_seconds = 0.0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller has to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            self.acquired += 1
+            wait = max(-self._tokens / self.rate, self._paused_until - now, 0.0)
+            self.waited_seconds += wait
+            return wait
+
+    def acquire(self) -> None:
+        """Block until the caller may send a request."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def on_throttle(self, retry_after: float | None = None) -> None:
+        """Slow down after the server answered 429."""
+        with self._lock:
+            self.throttles += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            if retry_after:
+                self._paused_until = max(
+                    self._paused_until, time.monotonic() + retry_after
+                )
+
+    def on_success(self) -> None:
+        """Speed up again after a successful request."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
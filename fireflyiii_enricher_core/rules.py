@@ -0,0 +1,193 @@
+"""Classify transactions against many description rules in a single pass."""
+
+import functools
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Set, Tuple
+
+from fireflyiii_enricher_core.batch import TransactionUpdate
+
+RuleKind = Literal["exact", "contains", "regex"]
+
+
+@dataclass(frozen=True)
+class DescriptionRule:
+    """
+    A description pattern and what to do with the transactions it matches.
+
+    ``exact`` and ``contains`` patterns are compared case-insensitively
+    (case-folded); ``regex`` patterns are searched with :data:`re.IGNORECASE`.
+    ``category`` is a category name, resolved when the update is applied.
+    """
+
+    pattern: str
+    kind: RuleKind = "contains"
+    category: str | None = None
+    tag: str | None = None
+
+
+class _AhoCorasick:  # pylint: disable=too-few-public-methods
+    """Automaton reporting every pattern occurring in a text in one scan."""
+
+    __slots__ = ("_goto", "_fail", "_out")
+
+    def __init__(self, patterns: Dict[str, List[int]]) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        out: List[Tuple[int, ...]] = [()]
+        for word, ids in patterns.items():
+            node = 0
+            for char in word:
+                child = goto[node].get(char)
+                if child is None:
+                    child = len(goto)
+                    goto[node][char] = child
+                    goto.append({})
+                    out.append(())
+                node = child
+            out[node] += tuple(ids)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(char, 0)
+                fail[child] = target if node else 0
+                out[child] += out[fail[child]]
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def search(self, text: str) -> Set[int]:
+        """Return the ids of all patterns found in ``text``."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[int] = set()
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+class RuleSet:
+    """
+    Compiled set of :class:`DescriptionRule` evaluated together.
+
+    Exact patterns are looked up in a dict, substring patterns share one
+    Aho-Corasick automaton and regular expressions are precompiled, so a
+    description is case-folded and scanned once for all rules. Results are
+    cached per distinct description (merchants repeat a lot), up to
+    ``cache_size`` entries.
+
+    Rules keep their order: matches are reported in rule order, so earlier
+    rules take precedence.
+
+    Examples:
+        rules = RuleSet([
+            DescriptionRule("amazon", category="Shopping"),
+            DescriptionRule("netflix", kind="exact", tag="subscription"),
+            DescriptionRule(r"^rent \\d{4}", kind="regex", category="Housing"),
+        ])
+        plan = plan_updates(
+            transactions,
+            rules.updates(transactions),
+            resolve_category=client.categories.resolve,
+        )
+    """
+
+    def __init__(
+        self, rules: Iterable[DescriptionRule], cache_size: int = 65536
+    ) -> None:
+        """
+        Compile the rules.
+
+        Raises:
+            ValueError: If a pattern is empty or its kind is unknown.
+            re.error: If a regular expression is invalid.
+        """
+        self.rules: Tuple[DescriptionRule, ...] = tuple(rules)
+        exact: Dict[str, List[int]] = {}
+        contains: Dict[str, List[int]] = {}
+        self._regexes: List[Tuple[int, re.Pattern[str]]] = []
+        for index, rule in enumerate(self.rules):
+            if not rule.pattern:
+                raise ValueError(f"Rule {index} has an empty pattern")
+            if rule.kind == "exact":
+                exact.setdefault(rule.pattern.casefold(), []).append(index)
+            elif rule.kind == "contains":
+                contains.setdefault(rule.pattern.casefold(), []).append(index)
+            elif rule.kind == "regex":
+                self._regexes.append((index, re.compile(rule.pattern, re.IGNORECASE)))
+            else:
+                raise ValueError(f"Unknown rule kind: {rule.kind!r}")
+        self._exact = {key: tuple(ids) for key, ids in exact.items()}
+        self._contains = _AhoCorasick(contains) if contains else None
+        self._match_ids = functools.lru_cache(maxsize=cache_size)(self._compute)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def _compute(self, description: str) -> Tuple[int, ...]:
+        folded = description.casefold()
+        ids: Set[int] = set(self._exact.get(folded, ()))
+        if self._contains is not None:
+            ids.update(self._contains.search(folded))
+        ids.update(index for index, regex in self._regexes if regex.search(description))
+        return tuple(sorted(ids))
+
+    def matches(self, description: str) -> Tuple[DescriptionRule, ...]:
+        """Return every rule matching ``description``, in rule order."""
+        return tuple(self.rules[index] for index in self._match_ids(description))
+
+    def first(self, description: str) -> DescriptionRule | None:
+        """Return the first rule matching ``description``, if any."""
+        ids = self._match_ids(description)
+        return self.rules[ids[0]] if ids else None
+
+    def classify(
+        self, transactions: Iterable[Dict[str, Any]]
+    ) -> Iterator[Tuple[Dict[str, Any], Tuple[DescriptionRule, ...]]]:
+        """
+        Lazily yield each raw transaction that matches with its rules.
+
+        Like :func:`~fireflyiii_enricher_core.filters.iter_by_description`,
+        the description of the first split is matched.
+        """
+        for transaction in transactions:
+            description = transaction["attributes"]["transactions"][0]["description"]
+            ids = self._match_ids(description)
+            if ids:
+                yield transaction, tuple(self.rules[index] for index in ids)
+
+    def updates(
+        self, transactions: Iterable[Dict[str, Any]]
+    ) -> List[Tuple[str, TransactionUpdate]]:
+        """
+        Return the updates the rules ask for, ready for the planner.
+
+        A transaction gets the category of its first matching rule that sets
+        one and the tags of all matching rules.
+        """
+        result: List[Tuple[str, TransactionUpdate]] = []
+        for transaction, rules in self.classify(transactions):
+            transaction_id = str(transaction["id"])
+            category = next((rule.category for rule in rules if rule.category), None)
+            if category is not None:
+                result.append(
+                    (transaction_id, TransactionUpdate(category_name=category))
+                )
+            for tag in dict.fromkeys(rule.tag for rule in rules if rule.tag):
+                result.append((transaction_id, TransactionUpdate(tag=tag)))
+        return result
+
+    def cache_info(self) -> Any:
+        """Return the hit/miss statistics of the per-description cache."""
+        return self._match_ids.cache_info()
@@ -0,0 +1,145 @@
+"""Translate transaction filters into Firefly III search queries."""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from fireflyiii_enricher_core.filters import (
+    iter_by_description,
+    iter_single_part,
+    iter_without_category,
+    iter_without_tag,
+)
+
+if TYPE_CHECKING:
+    from fireflyiii_enricher_core.firefly_client import FireflyClient
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+def quote(value: str) -> str:
+    """Quote a search operator value if it contains spaces or quotes."""
+    if not value or any(char in value for char in ' "\\:'):
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+        return f'"{escaped}"'
+    return value
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass(frozen=True)
+class TransactionQuery:
+    """
+    Declarative transaction filter that runs on the Firefly III server.
+
+    Predicates that the search language can express are sent to
+    ``/api/v1/search/transactions``, so only matching transactions are
+    downloaded. ``single_part`` and any ``client_predicates`` cannot be
+    expressed and are applied locally to the returned transactions.
+
+    Note that server-side operators match any split of a transaction, while
+    the ``filter_*`` helpers look at the first split only; combine with
+    ``single_part=True`` when that difference matters.
+
+    Examples:
+        query = TransactionQuery(without_category=True, without_tags=("done",))
+        query.to_search_string()
+        'type:withdrawal has_no_category:true -tag_is:done'
+        transactions = query.fetch(client)
+    """
+
+    tx_type: str | None = "withdrawal"
+    without_category: bool = False
+    without_tags: Tuple[str, ...] = ()
+    description: str | None = None
+    exact_description: bool = True
+    start_date: date | None = None
+    end_date: date | None = None
+    single_part: bool = False
+    client_predicates: Tuple[Predicate, ...] = ()
+
+    def server_terms(self) -> List[str]:
+        """Return the search operators for the server-expressible predicates."""
+        terms: List[str] = []
+        if self.tx_type:
+            terms.append(f"type:{quote(self.tx_type)}")
+        if self.without_category:
+            terms.append("has_no_category:true")
+        for tag in self.without_tags:
+            terms.append(f"-tag_is:{quote(tag)}")
+        if self.description is not None:
+            operator = (
+                "description_is" if self.exact_description else "description_contains"
+            )
+            terms.append(f"{operator}:{quote(self.description)}")
+        if self.start_date:
+            terms.append(f"date_after:{self.start_date.isoformat()}")
+        if self.end_date:
+            terms.append(f"date_before:{self.end_date.isoformat()}")
+        return terms
+
+    def to_search_string(self) -> str:
+        """Return the query in the Firefly III search language."""
+        return " ".join(self.server_terms())
+
+    def apply_locally(
+        self, transactions: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily apply the predicates the server cannot express."""
+        result: Iterable[Dict[str, Any]] = transactions
+        if self.single_part:
+            result = iter_single_part(result)
+        for predicate in self.client_predicates:
+            result = filter(predicate, result)
+        return iter(result)
+
+    def apply_all_locally(
+        self, transactions: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily apply every predicate on the client.
+
+        Used for already downloaded transactions; the type and date range are
+        assumed to have been applied when fetching.
+        """
+        result: Iterable[Dict[str, Any]] = transactions
+        if self.without_category:
+            result = iter_without_category(result)
+        for tag in self.without_tags:
+            result = iter_without_tag(result, tag)
+        if self.description is not None:
+            result = iter_by_description(
+                result, self.description, self.exact_description
+            )
+        return self.apply_locally(result)
+
+    def stream(
+        self, client: "FireflyClient", limit: int = 1000, **fetch_kwargs: Any
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily fetch the matching transactions.
+
+        If no predicate needs the search endpoint (only type and dates are
+        set), the regular transaction listing is used instead.
+        """
+        needs_search = (
+            self.without_category or self.without_tags or self.description is not None
+        )
+        if needs_search:
+            raw = client.iter_search_transactions(
+                self.to_search_string(), limit, **fetch_kwargs
+            )
+        else:
+            raw = client.iter_transactions(
+                self.tx_type or "all",
+                limit,
+                self.start_date,
+                self.end_date,
+                **fetch_kwargs,
+            )
+        return self.apply_locally(raw)
+
+    def fetch(
+        self, client: "FireflyClient", limit: int = 1000, **fetch_kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        """Fetch the matching transactions as a list."""
+        return list(self.stream(client, limit, **fetch_kwargs))
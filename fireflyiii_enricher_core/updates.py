@@ -0,0 +1,143 @@
+"""Builders of transaction update (PUT) payloads."""
+
+from typing import Any, Dict, List
+
+
+class IdenticalDataError(RuntimeError):
+    """Raised when an update would not change the transaction."""
+
+
+def update_payload(
+    changes: Dict[str, Any] | List[Dict[str, Any]],
+    *,
+    apply_rules: bool = True,
+    fire_webhooks: bool = True,
+) -> Dict[str, Any]:
+    """
+    Wrap split-level ``changes`` into a transaction update (PUT) payload.
+
+    A single dict changes the first split; a list (see :func:`split_update`)
+    is sent as the complete ``transactions`` array. ``apply_rules`` and
+    ``fire_webhooks`` ask Firefly III to run its rules and webhooks on the
+    updated transaction.
+    """
+    return {
+        "apply_rules": apply_rules,
+        "fire_webhooks": fire_webhooks,
+        "transactions": changes if isinstance(changes, list) else [changes],
+    }
+
+
+def split_update(
+    existing: Dict[str, Any], changes: Dict[str, Any], split_index: int | None
+) -> Dict[str, Any] | List[Dict[str, Any]]:
+    """
+    Address split-level ``changes`` to one split of ``existing``.
+
+    ``split_index=None`` means the first split. The changes of a single part
+    transaction are returned unchanged; otherwise every split is listed by
+    its ``transaction_journal_id`` and only the target one carries the
+    changes: Firefly III deletes the splits that are missing from an update.
+    """
+    splits = existing.get("data", {}).get("attributes", {}).get("transactions", [])
+    if split_index is None:
+        if len(splits) <= 1:
+            return changes
+        split_index = 0
+    _existing_split(existing, split_index)
+    return [
+        {
+            "transaction_journal_id": sub["transaction_journal_id"],
+            **(changes if index == split_index else {}),
+        }
+        for index, sub in enumerate(splits)
+    ]
+
+
+def _existing_split(existing: Dict[str, Any], split_index: int) -> Dict[str, Any]:
+    """Return split ``split_index`` of a transaction document."""
+    splits = existing.get("data", {}).get("attributes", {}).get("transactions", [{}])
+    if not 0 <= split_index < len(splits):
+        raise RuntimeError(f"Transaction has no split {split_index}")
+    split: Dict[str, Any] = splits[split_index]
+    return split
+
+
+def description_change(
+    existing: Dict[str, Any], new_description: str, split_index: int = 0
+) -> Dict[str, Any]:
+    """
+    Return the split changes that set a new description.
+
+    ``existing`` is the transaction document as returned by
+    ``GET /api/v1/transactions/{id}``; ``split_index`` selects the split the
+    change is checked against.
+
+    Raises:
+        IdenticalDataError: If the new description is identical to the current one.
+        RuntimeError: If the transaction has no such split.
+    """
+    old_desc = _existing_split(existing, split_index).get("description") or ""
+    if new_description == old_desc:
+        raise IdenticalDataError("New data is identical to the current one.")
+    return {"description": new_description}
+
+
+def notes_change(
+    existing: Dict[str, Any], new_notes: str, split_index: int = 0
+) -> Dict[str, Any]:
+    """
+    Return the split changes that replace the notes.
+
+    Raises:
+        IdenticalDataError: If the new notes are identical to the current ones.
+        RuntimeError: If the transaction has no such split.
+    """
+    old_notes = _existing_split(existing, split_index).get("notes", "") or ""
+    if new_notes == old_notes:
+        raise IdenticalDataError("New data is identical to the current one.")
+    return {"notes": new_notes}
+
+
+def category_change(
+    existing: Dict[str, Any], new_category_id: int, split_index: int = 0
+) -> Dict[str, Any]:
+    """
+    Return the split changes that assign a category.
+
+    Raises:
+        IdenticalDataError: If the transaction already has this category.
+        RuntimeError: If the transaction has no such split.
+    """
+    old_category = _existing_split(existing, split_index).get("category_id", "")
+    if old_category is not None:
+        if old_category == str(new_category_id):
+            raise IdenticalDataError("New data is identical to the current one.")
+    return {"category_id": str(new_category_id)}
+
+
+def tag_change(
+    existing: Dict[str, Any], new_tag: str, split_index: int | None = None
+) -> Dict[str, Any]:
+    """
+    Return the split changes that attach a tag.
+
+    The changes hold the complete new tag list; ``existing`` is not modified.
+    Without ``split_index`` the transaction must be single part.
+
+    Raises:
+        IdenticalDataError: If the split already has the tag.
+        RuntimeError: If the transaction is not single part and no
+            ``split_index`` is given, or if it has no such split.
+    """
+    if split_index is None:
+        old_sub_transactions = (
+            existing.get("data", {}).get("attributes", {}).get("transactions", [])
+        )
+        if len(old_sub_transactions) != 1:
+            raise RuntimeError("Transaction is not single part")
+        split_index = 0
+    tags = _existing_split(existing, split_index).get("tags") or []
+    if new_tag in tags:
+        raise IdenticalDataError("New data is identical to the current one.")
+    return {"tags": [*tags, new_tag]}
@@ -0,0 +1,308 @@
+"""In-process fake Firefly III API used by the tests."""
+
+import hashlib
+import json
+import shlex
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+
+def make_transaction(
+    index: int, start: date = date(2024, 1, 1), splits: int = 1
+) -> Dict[str, Any]:
+    """Build a raw withdrawal in the Firefly JSON:API format."""
+    tx_date = start + timedelta(days=index % 365)
+    return {
+        "type": "transactions",
+        "id": str(index + 1),
+        "attributes": {
+            "created_at": "2024-01-01T00:00:00+00:00",
+            "updated_at": "2024-01-01T00:00:00+00:00",
+            "transactions": [
+                {
+                    "transaction_journal_id": str(
+                        index + 1 if part == 0 else 1_000_000 + index * 10 + part
+                    ),
+                    "type": "withdrawal",
+                    "date": f"{tx_date.isoformat()}T00:00:00+00:00",
+                    "amount": f"{(index % 500) + 1 + part}.{index % 100:02d}",
+                    "description": f"Shop {index % 50}",
+                    "category_id": None,
+                    "category_name": None,
+                    "tags": [],
+                    "notes": None,
+                }
+                for part in range(splits)
+            ],
+        },
+    }
+
+
+def _first_date(transaction: Dict[str, Any]) -> str:
+    date_value: str = transaction["attributes"]["transactions"][0]["date"][:10]
+    return date_value
+
+
+def make_category(index: int) -> Dict[str, Any]:
+    """Build a raw category in the Firefly JSON:API format."""
+    return {
+        "type": "categories",
+        "id": str(index + 1),
+        "attributes": {"name": f"Category {index + 1}"},
+    }
+
+
+# pylint: disable=too-many-instance-attributes
+class FakeFirefly:
+    """Threaded HTTP server that mimics the Firefly III endpoints we use."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        transactions: int = 0,
+        categories: int = 0,
+        page_size: int = 50,
+        *,
+        throttle_every: int = 0,
+        latency: float = 0.0,
+        split_every: int = 0,
+        etags: bool = False,
+        ignore_close: bool = False,
+    ) -> None:
+        self.transactions: List[Dict[str, Any]] = [
+            make_transaction(i, splits=3 if split_every and i % split_every == 0 else 1)
+            for i in range(transactions)
+        ]
+        self.categories: List[Dict[str, Any]] = [
+            make_category(i) for i in range(categories)
+        ]
+        self.page_size = page_size
+        self.requests: List[str] = []
+        self.payloads: List[Dict[str, Any]] = []
+        self.revision = 0
+        self.queries: List[str] = []
+        self.pages: List[int] = []
+        self.throttle_every = throttle_every
+        self.throttled = 0
+        self.latency = latency
+        self.etags = etags
+        self.ignore_close = ignore_close
+        self.not_modified = 0
+        self._by_id = {tx["id"]: tx for tx in self.transactions}
+        self._dated: List[Dict[str, Any]] = []
+        self._dates: List[str] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def __enter__(self) -> "FakeFirefly":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def record(self, method: str, path: str) -> bool:
+        """Remember a request; return ``True`` if it must be answered with 429."""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.requests.append(f"{method} {path}")
+            if self.throttle_every and len(self.requests) % self.throttle_every == 0:
+                self.throttled += 1
+                return True
+            return False
+
+    def page(
+        self, items: List[Dict[str, Any]], path: str, query: Dict[str, List[str]]
+    ) -> Dict[str, Any]:
+        """Return a JSON:API page of ``items`` for the given query."""
+        limit = min(int(query.get("limit", [self.page_size])[0]), self.page_size)
+        page = int(query.get("page", ["1"])[0])
+        self.pages.append(page)
+        total_pages = max((len(items) + limit - 1) // limit, 1)
+        chunk = items[(page - 1) * limit : page * limit]
+        next_link = f"{self.url}{path}?page={page + 1}" if page < total_pages else None
+        return {
+            "data": chunk,
+            "meta": {
+                "pagination": {
+                    "total": len(items),
+                    "count": len(chunk),
+                    "per_page": limit,
+                    "current_page": page,
+                    "total_pages": total_pages,
+                }
+            },
+            "links": {"self": f"{self.url}{path}?page={page}", "next": next_link},
+        }
+
+    def filter_by_date(
+        self, items: List[Dict[str, Any]], query: Dict[str, List[str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply the ``start``/``end`` query parameters to transactions.
+
+        Like a database index, a date-sorted copy of the stored transactions
+        answers each range in logarithmic time; ranged results are in date
+        order.
+        """
+        if "start" not in query and "end" not in query:
+            return items
+        start = query.get("start", [""])[0]
+        end = query.get("end", ["9999-12-31"])[0]
+        with self._lock:
+            if len(self._dated) != len(items):
+                self._dated = sorted(items, key=_first_date)
+                self._dates = [_first_date(tx) for tx in self._dated]
+        low = bisect_left(self._dates, start)
+        return self._dated[low : bisect_right(self._dates, end, low)]
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Evaluate the subset of the search language used by the library."""
+        items = self.transactions
+        for term in shlex.split(query):
+            negate = term.startswith("-")
+            operator, _, value = term.lstrip("-").partition(":")
+            items = [tx for tx in items if self._term(tx, operator, value) != negate]
+        return items
+
+    @staticmethod
+    def _term(tx: Dict[str, Any], operator: str, value: str) -> bool:
+        splits = tx["attributes"]["transactions"]
+        checks: Dict[str, Callable[[Dict[str, Any]], bool]] = {
+            "type": lambda sub: sub["type"] == value,
+            "has_no_category": lambda sub: sub["category_id"] is None,
+            "tag_is": lambda sub: value in sub["tags"],
+            "description_is": lambda sub: sub["description"].lower() == value.lower(),
+            "description_contains": lambda sub: value.lower()
+            in sub["description"].lower(),
+            "date_after": lambda sub: sub["date"][:10] >= value,
+            "date_before": lambda sub: sub["date"][:10] <= value,
+        }
+        return any(checks[operator](sub) for sub in splits)
+
+    @staticmethod
+    def apply_update(tx: Dict[str, Any], changes: List[Dict[str, Any]]) -> None:
+        """
+        Apply PUT ``transactions`` the way Firefly III does.
+
+        Splits are matched by ``transaction_journal_id`` (without journal ids,
+        by position) and splits missing from the list are deleted.
+        """
+        subs = tx["attributes"]["transactions"]
+        if not any("transaction_journal_id" in change for change in changes):
+            for sub, change in zip(subs, changes):
+                sub.update(change)
+            del subs[len(changes) :]
+            return
+        by_journal = {sub["transaction_journal_id"]: sub for sub in subs}
+        kept = []
+        for change in changes:
+            sub = by_journal[change["transaction_journal_id"]]
+            sub.update(change)
+            kept.append(sub)
+        subs[:] = kept
+
+    def find_transaction(self, transaction_id: str) -> Dict[str, Any] | None:
+        """Return the stored transaction with the given id."""
+        return self._by_id.get(transaction_id)
+
+    def _handler_class(self) -> type:  # pylint: disable=too-many-statements
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Request handler bound to the enclosing fake server."""
+
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args: Any) -> None:  # pylint: disable=W0221
+                return
+
+            def parse_request(self) -> bool:
+                # Like some proxies, optionally keep the socket open even when
+                # the client asks for ``Connection: close``.
+                parsed = super().parse_request()
+                if fake.ignore_close:
+                    self.close_connection = False
+                return parsed
+
+            def _send(self, status: int, body: Any) -> None:
+                payload = json.dumps(body).encode()
+                if status == 200 and self.command == "GET" and fake.etags:
+                    etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        fake.not_modified += 1
+                        status, payload = 304, b""
+                    self.send_response(status)
+                    self.send_header("ETag", etag)
+                else:
+                    self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.send_header("Content-Type", "application/vnd.api+json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self) -> None:  # pylint: disable=invalid-name
+                """Serve list and detail endpoints."""
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                if fake.record("GET", parsed.path):
+                    self._send(429, {"message": "Too Many Attempts."})
+                    return
+                if parsed.path == "/api/v1/transactions":
+                    items = fake.filter_by_date(fake.transactions, query)
+                    self._send(200, fake.page(items, parsed.path, query))
+                elif parsed.path == "/api/v1/search/transactions":
+                    fake.queries.append(query["query"][0])
+                    items = fake.search(query["query"][0])
+                    self._send(200, fake.page(items, parsed.path, query))
+                elif parsed.path == "/api/v1/categories":
+                    self._send(200, fake.page(fake.categories, parsed.path, query))
+                elif parsed.path.startswith("/api/v1/transactions/"):
+                    tx = fake.find_transaction(parsed.path.rsplit("/", 1)[1])
+                    if tx is None:
+                        self._send(404, {"message": "Not found"})
+                    else:
+                        self._send(200, {"data": tx})
+                else:
+                    self._send(404, {"message": "Not found"})
+
+            def do_PUT(self) -> None:  # pylint: disable=invalid-name
+                """Apply a transaction update to the stored data."""
+                parsed = urlparse(self.path)
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                fake.payloads.append(payload)
+                if fake.record("PUT", parsed.path):
+                    self._send(429, {"message": "Too Many Attempts."})
+                    return
+                tx = fake.find_transaction(parsed.path.rsplit("/", 1)[1])
+                if tx is None:
+                    self._send(404, {"message": "Not found"})
+                    return
+                with fake._lock:  # pylint: disable=protected-access
+                    fake.revision += 1
+                    tx["attributes"]["updated_at"] = f"rev-{fake.revision}"
+                    fake.apply_update(tx, payload.get("transactions", []))
+                self._send(200, {"data": tx})
+
+        return Handler
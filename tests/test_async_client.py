@@ -0,0 +1,118 @@
+"""Tests for AsyncFireflyClient against the fake Firefly server."""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from tests.fake_firefly import FakeFirefly
+
+pytest.importorskip("httpx")
+
+# pylint: disable=wrong-import-position
+from fireflyiii_enricher_core.async_client import AsyncFireflyClient  # noqa: E402
+from fireflyiii_enricher_core.firefly_client import (  # noqa: E402
+    SimplifiedCategory,
+)
+
+TOKEN = "test-token"
+
+
+def test_fetch_transactions_and_categories() -> None:
+    """Test paginated fetches return every item in order."""
+
+    async def run(url: str) -> None:
+        async with AsyncFireflyClient(url, TOKEN) as client:
+            transactions = await client.fetch_transactions()
+            categories = await client.fetch_categories(simplified=True)
+        assert [tx["id"] for tx in transactions] == [str(i) for i in range(1, 96)]
+        assert categories[0] == SimplifiedCategory(id="1", name="Category 1")
+        assert len(categories) == 12
+
+    with FakeFirefly(transactions=95, categories=12, page_size=10) as server:
+        asyncio.run(run(server.url))
+
+
+def test_pages_in_flight_are_bounded() -> None:
+    """Test a lazily consumed listing requests at most ``concurrency`` pages ahead."""
+
+    async def run(url: str) -> List[int]:
+        async with AsyncFireflyClient(url, TOKEN, concurrency=3) as client:
+            pages = client._iter_pages(  # pylint: disable=protected-access
+                f"{url}/api/v1/transactions", {"limit": 10}
+            )
+            assert len(await anext(pages)) == 10
+            assert len(await anext(pages)) == 10
+            await asyncio.sleep(0.2)
+            requested = sorted(server.pages)
+            await pages.aclose()
+        return requested
+
+    with FakeFirefly(transactions=200, page_size=10) as server:
+        assert asyncio.run(run(server.url)) == [1, 2, 3, 4]
+
+
+def test_closing_a_listing_settles_its_requests() -> None:
+    """Test closing a listing early leaves no page request running."""
+
+    async def run(url: str) -> None:
+        async with AsyncFireflyClient(url, TOKEN, concurrency=3) as client:
+            pages = client._iter_pages(  # pylint: disable=protected-access
+                f"{url}/api/v1/transactions", {"limit": 10}
+            )
+            await anext(pages)
+            await anext(pages)
+            await pages.aclose()
+            assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    with FakeFirefly(transactions=200, page_size=10, latency=0.05) as server:
+        asyncio.run(run(server.url))
+
+
+def test_concurrent_updates() -> None:
+    """Test many updates can run concurrently through the bounded client."""
+
+    async def run(url: str) -> None:
+        async with AsyncFireflyClient(url, TOKEN, concurrency=5) as client:
+            await asyncio.gather(
+                *(client.add_tag_to_transaction(i, "done") for i in range(1, 41)),
+                *(client.update_transaction_notes(i, "note") for i in range(41, 51)),
+            )
+            with pytest.raises(RuntimeError, match="identical"):
+                await client.update_transaction_notes(41, "note")
+            response = await client.add_tag_to_transaction(1, "done")
+            assert response["data"]["attributes"]["transactions"][0]["tags"] == ["done"]
+
+    with FakeFirefly(transactions=50) as server:
+        asyncio.run(run(server.url))
+        subs = [tx["attributes"]["transactions"][0] for tx in server.transactions]
+    assert all(sub["tags"] == ["done"] for sub in subs[:40])
+    assert server.requests.count("PUT /api/v1/transactions/1") == 1
+    assert all(sub["notes"] == "note" for sub in subs[40:])
+
+
+def test_updates_keep_other_splits() -> None:
+    """Test updates of split transactions change the first split only."""
+
+    async def run(url: str) -> None:
+        async with AsyncFireflyClient(url, TOKEN) as client:
+            await client.update_transaction_notes(1, "noted")
+            await client.assign_transaction_category(1, 7)
+
+    with FakeFirefly(transactions=6, split_every=3) as server:
+        asyncio.run(run(server.url))
+        subs = server.transactions[0]["attributes"]["transactions"]
+    assert [sub["notes"] for sub in subs] == ["noted", None, None]
+    assert [sub["category_id"] for sub in subs] == ["7", None, None]
+
+
+def test_http_error_is_wrapped() -> None:
+    """Test HTTP errors surface as RuntimeError like the sync client."""
+
+    async def run(url: str) -> None:
+        async with AsyncFireflyClient(url, TOKEN) as client:
+            with pytest.raises(RuntimeError, match="HTTP error"):
+                await client.update_transaction_description(999, "x")
+
+    with FakeFirefly(transactions=1) as server:
+        asyncio.run(run(server.url))
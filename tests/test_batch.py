@@ -0,0 +1,92 @@
+"""Tests for the concurrent batch update API."""
+
+from fireflyiii_enricher_core.batch import (
+    TransactionUpdate,
+    UpdateStatus,
+    apply_updates,
+)
+from fireflyiii_enricher_core.firefly_client import FireflyClient, simplify_splits
+from tests.fake_firefly import FakeFirefly
+
+TOKEN = "test-token"
+
+
+def test_known_state_skips_get_requests() -> None:
+    """Test updates against fetched transactions only send PUT requests."""
+    with FakeFirefly(transactions=30) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            known = client.fetch_transactions()
+            server.requests.clear()
+            results = apply_updates(
+                client,
+                [(tx["id"], TransactionUpdate(tag="done")) for tx in known],
+                known=known,
+            )
+        assert {result.status for result in results} == {UpdateStatus.APPLIED}
+        assert all(request.startswith("PUT") for request in server.requests)
+        assert len(server.requests) == 30
+        assert known[0]["attributes"]["transactions"][0]["tags"] == ["done"]
+
+
+def test_updates_target_splits() -> None:
+    """Test a bulk update tags each split of split transactions separately."""
+    with FakeFirefly(transactions=10, split_every=5) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            known = client.fetch_transactions()
+            splits = simplify_splits(known)
+            server.requests.clear()
+            results = apply_updates(
+                client,
+                [
+                    (
+                        split.transaction_id,
+                        TransactionUpdate(
+                            tag=f"s{split.split_index}", split_index=split.split_index
+                        ),
+                    )
+                    for split in splits
+                ],
+                known=known,
+            )
+        assert len(results) == len(splits) == 14
+        assert {result.status for result in results} == {UpdateStatus.APPLIED}
+        assert len(server.requests) == 14
+        subs = server.transactions[5]["attributes"]["transactions"]
+    assert [sub["tags"] for sub in subs] == [["s0"], ["s1"], ["s2"]]
+    assert known[5]["attributes"]["transactions"][2]["tags"] == ["s2"]
+
+
+def test_unaddressed_updates_keep_other_splits() -> None:
+    """Test an update without split_index leaves the other splits in place."""
+    with FakeFirefly(transactions=6, split_every=3) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            results = apply_updates(client, [("1", TransactionUpdate(notes="noted"))])
+        assert results[0].status is UpdateStatus.APPLIED
+        subs = server.transactions[0]["attributes"]["transactions"]
+    assert [sub["notes"] for sub in subs] == ["noted", None, None]
+
+
+def test_result_report() -> None:
+    """Test applied, skipped-identical and failed items are reported in order."""
+    with FakeFirefly(transactions=3) as server:
+        server.transactions[1]["attributes"]["transactions"][0]["notes"] = "same"
+        with FireflyClient(server.url, TOKEN) as client:
+            results = apply_updates(
+                client,
+                [
+                    (1, TransactionUpdate(notes="new")),
+                    (2, TransactionUpdate(notes="same")),
+                    (99, TransactionUpdate(notes="new")),
+                    (1, TransactionUpdate(category_id=4, description="Shop 0")),
+                ],
+                max_workers=2,
+            )
+        sub = server.transactions[0]["attributes"]["transactions"][0]
+    assert [result.status for result in results] == [
+        UpdateStatus.APPLIED,
+        UpdateStatus.SKIPPED_IDENTICAL,
+        UpdateStatus.FAILED,
+        UpdateStatus.APPLIED,
+    ]
+    assert sub["notes"] == "new"
+    assert sub["category_id"] == "4"
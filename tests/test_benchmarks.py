@@ -0,0 +1,44 @@
+"""Smoke tests for the benchmark harness."""
+
+import json
+from pathlib import Path
+
+from benchmarks.run import (
+    BENCHMARKS,
+    IMPORT_STATEMENTS,
+    BenchConfig,
+    compare,
+    main,
+    run_benchmarks,
+)
+
+
+def test_report_covers_every_benchmark() -> None:
+    """Test a tiny run times every benchmark per size and the imports once."""
+    config = BenchConfig(sizes=[30], page_size=10, updates=5, processes=2, repeat=1)
+    report = run_benchmarks(config)
+    keys = {result["key"] for result in report["results"]}
+    assert {"fetch_throttled@30", "update_notes_batch@30", "match_fuzzy@30"} <= keys
+    assert "import_client@0" in keys
+    assert len(keys) == len(report["results"]) == 17 + len(IMPORT_STATEMENTS)
+    assert all(result["seconds"] > 0 for result in report["results"])
+    assert report["meta"]["config"]["sizes"] == [30]
+    assert set(BENCHMARKS) == {"fetch", "updates", "pipeline", "matchers"}
+
+
+def test_compare_flags_regressions(tmp_path: Path) -> None:
+    """Test slower results beyond the tolerance are reported."""
+    baseline = {"results": [{"key": "a@1", "seconds": 1.0}]}
+    slower = {"results": [{"key": "a@1", "seconds": 1.5}, {"key": "b@1", "seconds": 9}]}
+    assert compare(slower, baseline, tolerance=0.25) == [
+        "a@1: 1.0000s -> 1.5000s (1.50x)"
+    ]
+    assert not compare(slower, baseline, tolerance=0.6)
+
+    output = tmp_path / "bench.json"
+    args = ["--sizes", "20", "--only", "pipeline", "--repeat", "1"]
+    assert main([*args, "--output", str(output)]) == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    report["results"][0]["seconds"] /= 1000
+    output.write_text(json.dumps(report), encoding="utf-8")
+    assert main([*args, "--baseline", str(output)]) == 1
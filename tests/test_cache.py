@@ -0,0 +1,71 @@
+"""Tests for the local transaction cache."""
+
+from datetime import date
+from pathlib import Path
+
+from fireflyiii_enricher_core.cache import CachingFireflyClient, TransactionCache
+from fireflyiii_enricher_core.instrumentation import LatencyAggregator
+from tests.fake_firefly import FakeFirefly
+
+TOKEN = "test-token"
+
+
+def test_incremental_sync(tmp_path: Path) -> None:
+    """Test later syncs only fetch the overlap window and rewrite changes."""
+    with FakeFirefly(transactions=400, page_size=100) as server:
+        with TransactionCache(tmp_path) as cache:
+            client = CachingFireflyClient(server.url, TOKEN, cache, overlap_days=10)
+            assert len(client.fetch_transactions()) == 400
+            assert cache.synced_until("withdrawal") == date.today()
+
+            cache.mark_synced("withdrawal", date(2024, 12, 1))
+            server.requests.clear()
+            report = client.sync()
+            assert report.start_date == date(2024, 11, 21)
+            assert report.fetched < 400
+            assert report.written == 0
+            assert cache.stats.unchanged == report.fetched
+            assert len(server.requests) == 1
+
+
+def test_cached_fetch_is_instrumented(tmp_path: Path) -> None:
+    """Test a cached fetch still reports its operation and synced pages."""
+    metrics = LatencyAggregator()
+    with FakeFirefly(transactions=30, page_size=10) as server:
+        with TransactionCache(tmp_path) as cache:
+            client = CachingFireflyClient(server.url, TOKEN, cache)
+            client.add_hook(metrics)
+            assert len(client.fetch_transactions()) == 30
+    (operation,) = metrics.operations
+    assert operation.name == "fetch_transactions"
+    assert (operation.pages, operation.items) == (3, 30)
+    assert cache.stats.writes == 30
+
+
+def test_updates_write_through(tmp_path: Path) -> None:
+    """Test updates made through the client refresh the cached row."""
+    with FakeFirefly(transactions=5) as server:
+        with TransactionCache(tmp_path / "cache.sqlite") as cache:
+            client = CachingFireflyClient(server.url, TOKEN, cache)
+            client.fetch_transactions()
+            client.update_transaction_notes(3, "enriched")
+            cached = cache.get(3)
+            assert cached is not None
+            assert cached["attributes"]["transactions"][0]["notes"] == "enriched"
+            assert cache.simplified()[2].notes == "enriched"
+            assert cache.get(42) is None
+            assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_eviction_and_invalidation(tmp_path: Path) -> None:
+    """Test eviction by date, invalidation and clearing."""
+    with FakeFirefly(transactions=60) as server:
+        with TransactionCache(tmp_path) as cache:
+            CachingFireflyClient(server.url, TOKEN, cache).sync()
+            assert cache.evict_before(date(2024, 1, 31)) == 30
+            cache.invalidate(45)
+            assert len(cache) == 29
+            assert cache.evict_stale(max_age=3600) == 0
+            cache.clear()
+            assert len(cache) == 0
+            assert cache.synced_until("withdrawal") is None
@@ -1,18 +1,31 @@
 """Unit tests for FireflyClient class."""
 
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from typing import Any, Dict
 from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
 
-from fireflyiii_enricher_core.firefly_client import FireflyClient
+from fireflyiii_enricher_core.firefly_client import (
+    FireflyClient,
+    date_windows,
+    filter_without_category,
+    filter_without_tag,
+    iter_simplified,
+    iter_without_category,
+    iter_without_tag,
+    simplify_splits,
+    simplify_transactions,
+)
+from tests.fake_firefly import FakeFirefly
 
 BASE_URL = "https://demo.firefly.local"
 TOKEN = "test-token"
 
 
-@patch("fireflyiii_enricher_core.firefly_client.requests.request")
+@patch("fireflyiii_enricher_core.firefly_client.requests.Session.request")
 def test_fetch_transactions(mock_request: MagicMock) -> None:
     """Test fetching paginated transactions."""
     mock_request.side_effect = [
@@ -27,7 +40,7 @@ def test_fetch_transactions(mock_request: MagicMock) -> None:
     assert len(result) == 3
 
 
-@patch("fireflyiii_enricher_core.firefly_client.requests.request")
+@patch("fireflyiii_enricher_core.firefly_client.requests.Session.request")
 def test_fetch_categories(mock_request: MagicMock) -> None:
     """Test fetching paginated categories."""
     mock_request.side_effect = [
@@ -42,7 +55,7 @@ def test_fetch_categories(mock_request: MagicMock) -> None:
     assert len(result) == 3
 
 
-@patch("fireflyiii_enricher_core.firefly_client.requests.request")
+@patch("fireflyiii_enricher_core.firefly_client.requests.Session.request")
 def test_update_description_success(mock_request: MagicMock) -> None:
     """Test successful update of transaction description."""
     mock_request.return_value = MockResponse({})
@@ -50,7 +63,7 @@ def test_update_description_success(mock_request: MagicMock) -> None:
     client.update_transaction_description(123, "Test")
 
 
-@patch("fireflyiii_enricher_core.firefly_client.requests.request")
+@patch("fireflyiii_enricher_core.firefly_client.requests.Session.request")
 def test_update_transaction_notes_success(mock_request: MagicMock) -> None:
     """Test successful update of transaction notes."""
     mock_request.return_value = MockResponse({})
@@ -58,7 +71,7 @@ def test_update_transaction_notes_success(mock_request: MagicMock) -> None:
     client.update_transaction_notes(123, "Some note")
 
 
-@patch("fireflyiii_enricher_core.firefly_client.requests.request")
+@patch("fireflyiii_enricher_core.firefly_client.requests.Session.request")
 def test_add_tag_to_transaction(mock_request: MagicMock) -> None:
     """Test successful adding of a tag to a transaction."""
     mock_response_data = {
@@ -73,7 +86,7 @@ def test_add_tag_to_transaction(mock_request: MagicMock) -> None:
     client.add_tag_to_transaction(123, "processed")
 
 
-@patch("fireflyiii_enricher_core.firefly_client.requests.request")
+@patch("fireflyiii_enricher_core.firefly_client.requests.Session.request")
 def test_timeout_handling(mock_request: MagicMock) -> None:
     """Test timeout exception is handled and re-raised."""
     mock_request.side_effect = requests.Timeout()
@@ -82,7 +95,7 @@ def test_timeout_handling(mock_request: MagicMock) -> None:
         client.fetch_transactions()
 
 
-@patch("fireflyiii_enricher_core.firefly_client.requests.request")
+@patch("fireflyiii_enricher_core.firefly_client.requests.Session.request")
 def test_json_decode_error(mock_request: MagicMock) -> None:
     """Test JSON decode error is handled gracefully."""
 
@@ -103,6 +116,209 @@ def test_json_decode_error(mock_request: MagicMock) -> None:
         client.fetch_transactions()
 
 
+@patch("fireflyiii_enricher_core.firefly_client.requests.Session.request")
+def test_configurable_timeout(mock_request: MagicMock) -> None:
+    """Test the configured timeout is passed to every request."""
+    mock_request.return_value = MockResponse({"data": [], "links": {}})
+    client = FireflyClient(BASE_URL, TOKEN, timeout=(3, 30))
+    client.fetch_transactions()
+    assert mock_request.call_args.kwargs["timeout"] == (3, 30)
+
+
+def test_connections_are_reused() -> None:
+    """Test pages are fetched over a single kept-alive connection."""
+    with FakeFirefly(transactions=120, page_size=20) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            assert len(client.fetch_transactions()) == 120
+            stats = client.connection_stats()
+    assert stats.opened == 1
+    assert stats.reused == 5
+
+
+@pytest.mark.parametrize("ignore_close", [False, True])
+def test_keep_alive_disabled(ignore_close: bool) -> None:
+    """Test every request opens a new connection without keep-alive."""
+    with FakeFirefly(transactions=60, page_size=20, ignore_close=ignore_close) as srv:
+        with FireflyClient(srv.url, TOKEN, keep_alive=False) as client:
+            client.fetch_transactions()
+            stats = client.connection_stats()
+    assert (stats.opened, stats.requests, stats.reused) == (3, 3, 0)
+
+
+def test_fetch_transactions_parallel() -> None:
+    """Test parallel pagination returns every page in order."""
+    with FakeFirefly(transactions=230, page_size=20) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            result = client.fetch_transactions(parallel=True, max_workers=4)
+    assert [tx["id"] for tx in result] == [str(i) for i in range(1, 231)]
+
+
+@patch("fireflyiii_enricher_core.firefly_client.requests.Session.request")
+def test_fetch_categories_parallel_fallback(mock_request: MagicMock) -> None:
+    """Test parallel mode falls back to links.next without pagination meta."""
+    mock_request.side_effect = [
+        MockResponse({"data": [{"id": "1"}], "links": {"next": "some_url"}}),
+        MockResponse({"data": [{"id": "2"}], "links": {"next": None}}),
+    ]
+    client = FireflyClient(BASE_URL, TOKEN)
+    result = client.fetch_categories(parallel=True)
+    assert [category["id"] for category in result if isinstance(category, dict)] == [
+        "1",
+        "2",
+    ]
+
+
+def test_iter_transactions_is_lazy() -> None:
+    """Test iter_transactions only requests pages as they are consumed."""
+    with FakeFirefly(transactions=100, page_size=10) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            stream = client.iter_transactions()
+            first = [next(stream) for _ in range(10)]
+            assert len(server.requests) == 1
+            assert len(first) + len(list(stream)) == 100
+            assert len(server.requests) == 10
+
+
+def test_lazy_pipeline_matches_list_helpers() -> None:
+    """Test the iter_* pipeline yields the same result as the list helpers."""
+    with FakeFirefly(transactions=60, page_size=25) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            raw = client.fetch_transactions()
+            raw[0]["attributes"]["transactions"][0]["category_id"] = "5"
+            raw[1]["attributes"]["transactions"][0]["tags"] = ["done"]
+            expected = simplify_transactions(
+                filter_without_tag(filter_without_category(raw), "done")
+            )
+            lazy = iter_simplified(
+                iter_without_tag(iter_without_category(iter(raw)), "done")
+            )
+            assert list(lazy) == expected
+            assert len(expected) == 58
+
+
+def test_category_registry() -> None:
+    """Test categories are fetched once and resolved by normalized name."""
+    with FakeFirefly(transactions=3, categories=30, page_size=10) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            assert client.categories.resolve("  category   7 ") == "7"
+            assert client.categories.get(12) is not None
+            assert client.categories.find("missing") is None
+            assert len(server.requests) == 3
+
+            client.assign_transaction_category_by_name(2, "CATEGORY 5")
+            with pytest.raises(KeyError):
+                client.assign_transaction_category_by_name(2, "missing")
+            assert len(server.requests) == 5
+
+            client.categories.refresh()
+            assert len(server.requests) == 8
+        sub = server.transactions[1]["attributes"]["transactions"][0]
+    assert sub["category_id"] == "5"
+
+
+def test_category_registry_refreshes_once_under_concurrency() -> None:
+    """Test concurrent resolvers share a single category refresh."""
+    with FakeFirefly(categories=30, page_size=10, latency=0.01) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                ids = list(
+                    executor.map(
+                        client.categories.resolve,
+                        [f"Category {i}" for i in range(1, 9)],
+                    )
+                )
+    assert ids == [str(i) for i in range(1, 9)]
+    assert server.requests == ["GET /api/v1/categories"] * 3
+
+
+def test_split_aware_updates() -> None:
+    """Test every split is flattened and updates target a single split."""
+    with FakeFirefly(transactions=6, split_every=3) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            splits = simplify_splits(client.fetch_transactions())
+            assert [split.key for split in splits[:4]] == [
+                ("1", 0),
+                ("1", 1),
+                ("1", 2),
+                ("2", 0),
+            ]
+            assert splits[1].split_count == 3
+            assert splits[1].amount_minor == 200
+
+            with pytest.raises(RuntimeError, match="not single part"):
+                client.add_tag_to_transaction(1, "x")
+            client.add_tag_to_transaction(1, "x", split_index=1)
+            client.update_transaction_notes(1, "third", split_index=2)
+            with pytest.raises(RuntimeError, match="no split 3"):
+                client.update_transaction_notes(1, "nope", split_index=3)
+        subs = server.transactions[0]["attributes"]["transactions"]
+    assert len(subs) == 3
+    assert [sub["tags"] for sub in subs] == [[], ["x"], []]
+    assert [sub["notes"] for sub in subs] == [None, None, "third"]
+
+
+def test_unaddressed_updates_keep_other_splits() -> None:
+    """Test updates without split_index change the first split and keep the rest."""
+    with FakeFirefly(transactions=6, split_every=3) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            client.update_transaction_description(1, "first")
+            client.update_transaction_notes(1, "noted")
+        subs = server.transactions[0]["attributes"]["transactions"]
+    assert [sub["description"] for sub in subs] == ["first", "Shop 0", "Shop 0"]
+    assert [sub["notes"] for sub in subs] == ["noted", None, None]
+
+
+def test_add_tag_is_idempotent() -> None:
+    """Test tagging an already tagged transaction sends no PUT."""
+    with FakeFirefly(transactions=2) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            client.add_tag_to_transaction(1, "x")
+            response = client.add_tag_to_transaction(1, "x")
+    assert response["data"]["attributes"]["transactions"][0]["tags"] == ["x"]
+    assert server.requests == [
+        "GET /api/v1/transactions/1",
+        "PUT /api/v1/transactions/1",
+        "GET /api/v1/transactions/1",
+    ]
+
+
+def test_date_windows() -> None:
+    """Test ranges are cut into clipped months or fixed day counts."""
+    windows = date_windows(date(2024, 1, 15), date(2024, 3, 10))
+    assert windows == [
+        (date(2024, 1, 15), date(2024, 1, 31)),
+        (date(2024, 2, 1), date(2024, 2, 29)),
+        (date(2024, 3, 1), date(2024, 3, 10)),
+    ]
+    assert date_windows(date(2024, 1, 1), date(2024, 1, 5), 2)[-1] == (
+        date(2024, 1, 5),
+        date(2024, 1, 5),
+    )
+    with pytest.raises(ValueError):
+        date_windows(date(2024, 1, 1), date(2024, 1, 5), 0)
+
+
+def test_sharded_fetch_streams_in_date_order() -> None:
+    """Test windows are fetched shallowly, deduplicated and date ordered."""
+    with FakeFirefly(transactions=400, page_size=10) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            result = list(
+                client.iter_transactions_sharded(
+                    limit=10,
+                    start_date=date(2024, 1, 1),
+                    end_date=date(2024, 12, 31),
+                    max_workers=3,
+                    max_pages=2,
+                )
+            )
+            with pytest.raises(ValueError):
+                next(client.iter_transactions_sharded())
+    dates = [tx["attributes"]["transactions"][0]["date"] for tx in result]
+    assert len({tx["id"] for tx in result}) == len(result) == 400
+    assert dates == sorted(dates)
+    assert max(server.pages) <= 2
+
+
 class MockResponse:
     """Generic mock response for testing purposes."""
 
@@ -0,0 +1,102 @@
+"""Tests for the pluggable JSON decoders and the lean page parser."""
+
+import json
+from typing import Iterator
+
+import pytest
+
+from fireflyiii_enricher_core import codec
+from fireflyiii_enricher_core.codec import (
+    get_decoder,
+    iter_compact_transactions,
+    parse_transaction_page,
+)
+from fireflyiii_enricher_core.firefly_client import FireflyClient, iter_compact
+from tests.fake_firefly import FakeFirefly, make_transaction
+
+TOKEN = "test-token"
+
+
+@pytest.fixture
+def fresh_lean_parser() -> Iterator[None]:
+    """Build the page parser afresh and drop it again after the test."""
+    codec._lean_parser.cache_clear()  # pylint: disable=protected-access
+    yield
+    codec._lean_parser.cache_clear()  # pylint: disable=protected-access
+
+
+def _page_bytes(count: int) -> bytes:
+    transactions = [make_transaction(i) for i in range(count)]
+    transactions[0]["attributes"]["transactions"][0]["tags"] = ["a", "b"]
+    transactions[1]["attributes"]["transactions"][0]["category_name"] = "Food"
+    document = {
+        "data": transactions,
+        "meta": {"pagination": {"total_pages": 3}},
+        "links": {"next": "http://x/next"},
+    }
+    return json.dumps(document).encode()
+
+
+def test_decoders_agree() -> None:
+    """Test every installed decoder returns the stdlib result."""
+    payload = _page_bytes(5)
+    expected = json.loads(payload)
+    for name in ("auto", *codec.DECODERS):
+        try:
+            decoder = get_decoder(name)
+        except ImportError:
+            continue
+        assert decoder(payload) == expected
+        with pytest.raises(ValueError):
+            decoder(b"{not json")
+    with pytest.raises(ValueError, match="Unknown JSON decoder"):
+        get_decoder("yaml")
+
+
+@pytest.mark.parametrize("lean", [True, False])
+def test_lean_parser_matches_compact(
+    lean: bool,
+    fresh_lean_parser: None,  # pylint: disable=redefined-outer-name,unused-argument
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the lean parser equals ``iter_compact`` over the full document."""
+    if not lean:
+
+        def unavailable() -> None:
+            raise ImportError("msgspec")
+
+        monkeypatch.setattr(codec, "_msgspec_page_decoder", unavailable)
+    payload = _page_bytes(20)
+    page = parse_transaction_page(payload)
+    assert page["data"] == list(iter_compact(json.loads(payload)["data"]))
+    assert page["data"][1].category == "Food"
+    assert page["meta"]["pagination"]["total_pages"] == 3
+    assert page["links"]["next"] == "http://x/next"
+    with pytest.raises(ValueError):
+        parse_transaction_page(b'{"data": [{"id": "1"}]}')
+
+
+def test_client_decoders_over_http() -> None:
+    """Test the client-wide decoder and lean pages against the fake server."""
+    with FakeFirefly(transactions=120, page_size=25) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            expected = client.fetch_transactions()
+        with FireflyClient(
+            server.url, TOKEN, json_decoder=get_decoder("auto")
+        ) as client:
+            assert client.fetch_transactions(parallel=True) == expected
+            compact = list(iter_compact_transactions(client, parallel=True))
+            assert compact == list(iter_compact(expected))
+            assert list(iter_compact_transactions(client, limit=50)) == compact
+
+
+def test_client_decoder_errors_are_mapped() -> None:
+    """Test decoder failures surface as the usual RuntimeError."""
+
+    def broken(_: bytes) -> None:
+        raise ValueError("nope")
+
+    with FakeFirefly(transactions=3) as server:
+        with FireflyClient(server.url, TOKEN, json_decoder=broken) as client:
+            with pytest.raises(RuntimeError, match="Failed to parse JSON response"):
+                client.fetch_transactions()
@@ -0,0 +1,93 @@
+"""Tests for the NumPy-backed TransactionFrame."""
+
+from typing import Any
+
+import pytest
+
+from tests.fake_firefly import make_transaction
+
+np = pytest.importorskip("numpy")
+
+# pylint: disable=wrong-import-position
+from fireflyiii_enricher_core.firefly_client import (  # noqa: E402
+    SimplifiedItem,
+    filter_by_description,
+    filter_single_part,
+    filter_without_category,
+    filter_without_tag,
+    simplify_transactions,
+)
+from fireflyiii_enricher_core.frame import TransactionFrame  # noqa: E402
+from fireflyiii_enricher_core.matcher import (  # noqa: E402
+    FuzzyTransactionMatcher,
+    IndexedTransactionMatcher,
+)
+
+
+def make_raw(count: int) -> list[dict[str, Any]]:
+    """Build raw transactions with some categories, tags and splits set."""
+    raw = [make_transaction(i) for i in range(count)]
+    for index, tx in enumerate(raw):
+        sub = tx["attributes"]["transactions"][0]
+        if index % 3 == 0:
+            sub["category_id"] = "1"
+        if index % 4 == 0:
+            sub["tags"] = ["done", "x"]
+        if index % 10 == 0:
+            tx["attributes"]["transactions"].append(dict(sub))
+    return raw
+
+
+def test_masks_match_filter_helpers() -> None:
+    """Test vectorized masks select what the filter helpers keep."""
+    raw = make_raw(500)
+    frame = TransactionFrame.from_transactions(raw)
+    mask = (
+        frame.single_part()
+        & frame.without_category()
+        & frame.without_tag("done")
+        & frame.by_description("shop 1", exact_match=False)
+    )
+    expected = filter_by_description(
+        filter_without_tag(filter_without_category(filter_single_part(raw)), "done"),
+        "shop 1",
+        exact_match=False,
+    )
+    assert frame.raw(mask) == expected
+    assert frame.simplified(frame.by_description("Shop 7")) == simplify_transactions(
+        filter_by_description(raw, "Shop 7")
+    )
+    assert len(frame.select(mask)) == len(expected)
+
+
+def test_vectorized_join_matches_matchers() -> None:
+    """Test the join returns the same pairs as the matcher classes."""
+    raw = make_raw(400)
+    simplified = simplify_transactions(raw)
+    records = [SimplifiedItem(tx.date, -tx.amount) for tx in simplified[::7]]
+    frame = TransactionFrame(raw)
+
+    rows, positions = frame.match(records)
+    exact = IndexedTransactionMatcher(records)
+    expected = [
+        (row, records.index(record))
+        for row, tx in enumerate(simplified)
+        for record in exact.match(tx)
+    ]
+    assert list(zip(rows.tolist(), positions.tolist())) == expected
+
+    rows, positions = frame.match(records, date_window=2, amount_tolerance=0.03)
+    fuzzy = FuzzyTransactionMatcher(records, date_window=2, amount_tolerance=0.03)
+    position_of = {id(record): index for index, record in enumerate(records)}
+    assert sorted(zip(rows.tolist(), positions.tolist())) == sorted(
+        (row, position_of[id(candidate.record)])
+        for row, tx in enumerate(simplified)
+        for candidate in fuzzy.candidates(tx)
+    )
+    assert np.all(np.diff(rows) >= 0)
+
+    rows, _ = frame.match(records, date_window=1, amount_tolerance=250.0)
+    fuzzy = FuzzyTransactionMatcher(records, date_window=1, amount_tolerance=250.0)
+    assert len(rows) == sum(len(fuzzy.candidates(tx)) for tx in simplified)
+    with pytest.raises(ValueError):
+        frame.match(records, amount_tolerance=-1)
@@ -0,0 +1,59 @@
+"""Tests for the conditional-request response cache."""
+
+from fireflyiii_enricher_core.firefly_client import FireflyClient
+from fireflyiii_enricher_core.http_cache import ResponseCache
+from tests.fake_firefly import FakeFirefly
+
+TOKEN = "test-token"
+
+
+def test_repeated_gets_are_revalidated() -> None:
+    """Test unchanged responses come back as 304s and are served from memory."""
+    cache = ResponseCache()
+    with FakeFirefly(transactions=5, categories=30, page_size=10, etags=True) as server:
+        with FireflyClient(server.url, TOKEN, response_cache=cache) as client:
+            first = client.fetch_categories()
+            assert client.fetch_categories() == first
+            assert server.not_modified == 3
+            assert (cache.stats.hits, cache.stats.misses) == (3, 3)
+
+            client.update_transaction_notes(2, "one")
+            client.update_transaction_notes(2, "two")
+            assert (
+                client.get_transaction(2)["data"]["attributes"]["transactions"][0][
+                    "notes"
+                ]
+                == "two"
+            )
+            # Transaction listings are not opted in.
+            client.fetch_transactions()
+            client.fetch_transactions()
+    assert server.not_modified == 3
+    assert cache.stats.hit_ratio == 3 / 9
+    assert len(cache) == 4
+
+
+def test_size_limits_and_opt_in() -> None:
+    """Test LRU eviction by entry count and bytes, and per-endpoint opt-in."""
+    cache = ResponseCache(max_entries=2, max_bytes=100, endpoints=())
+    url = "http://x/api/v1/tags"
+    assert cache.key("GET", url) is None
+    cache.enable("GET /api/v1/tags")
+    assert cache.key("GET", url, {"page": 2, "limit": 5}) == f"{url}?limit=5&page=2"
+
+    assert cache.store("a", b"x" * 10, {"ETag": '"a"'}) is not None
+    assert cache.store("b", b"x" * 10, {"Last-Modified": "yesterday"}) is not None
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.store("c", b"x" * 10, {"ETag": '"c"'})
+    assert cache.get("b") is None and len(cache) == 2
+    cache.store("d", b"x" * 90, {"ETag": '"d"'})
+    assert [key for key in ("a", "c", "d") if cache.get(key)] == ["c", "d"]
+    assert cache.size == 100
+    assert cache.store("e", b"{}", {}) is None  # nothing to revalidate with
+    assert cache.stats.evictions == 2
+
+    entry = cache.store("f", b"", {"ETag": '"f"', "Last-Modified": "now"})
+    assert entry is not None
+    assert entry.validators() == {"If-None-Match": '"f"', "If-Modified-Since": "now"}
+    cache.disable("GET /api/v1/tags")
+    assert cache.key("GET", url) is None
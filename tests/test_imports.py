@@ -0,0 +1,53 @@
+"""Tests for the lazily loaded public API."""
+
+import subprocess
+import sys
+
+import pytest
+
+import fireflyiii_enricher_core
+from fireflyiii_enricher_core import filters, models
+
+HTTP_MODULES = ("requests", "urllib3", "httpx", "numpy")
+
+
+def loaded_modules(statement: str) -> set[str]:
+    """Run ``statement`` in a new interpreter and return the loaded HTTP modules."""
+    check = f"import sys; {statement}; print(' '.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", check], capture_output=True, text=True, check=True
+    ).stdout
+    return set(output.split()) & set(HTTP_MODULES)
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import fireflyiii_enricher_core",
+        "from fireflyiii_enricher_core import SimplifiedTx, simplify_transactions",
+        "from fireflyiii_enricher_core import TransactionQuery, reconcile",
+        "import fireflyiii_enricher_core.matcher",
+        "import fireflyiii_enricher_core.batch",
+        "import fireflyiii_enricher_core.codec",
+    ],
+)
+def test_light_imports_skip_http_stack(statement: str) -> None:
+    """Test the models, filters and matchers load without requests."""
+    assert not loaded_modules(statement)
+
+
+def test_client_import_loads_requests() -> None:
+    """Test accessing the client imports its dependencies on demand."""
+    assert "requests" in loaded_modules(
+        "from fireflyiii_enricher_core import FireflyClient"
+    )
+
+
+def test_lazy_attributes_resolve() -> None:
+    """Test the package re-exports the defining modules' objects."""
+    assert fireflyiii_enricher_core.SimplifiedTx is models.SimplifiedTx
+    assert fireflyiii_enricher_core.iter_splits is filters.iter_splits
+    assert "FireflyClient" in dir(fireflyiii_enricher_core)
+    assert set(fireflyiii_enricher_core.__all__) <= set(dir(fireflyiii_enricher_core))
+    with pytest.raises(AttributeError):
+        getattr(fireflyiii_enricher_core, "missing")
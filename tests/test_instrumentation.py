@@ -0,0 +1,89 @@
+"""Tests for request hooks and the latency aggregator."""
+
+from typing import List
+
+import pytest
+
+from fireflyiii_enricher_core.firefly_client import FireflyClient
+from fireflyiii_enricher_core.instrumentation import (
+    Event,
+    LatencyAggregator,
+    OperationEvent,
+    RequestEvent,
+    endpoint_of,
+    percentile,
+)
+from fireflyiii_enricher_core.retry import RetryPolicy
+from tests.fake_firefly import FakeFirefly
+
+TOKEN = "test-token"
+
+
+def test_aggregator_reports_per_endpoint() -> None:
+    """Test requests are grouped by endpoint with ids normalized away."""
+    metrics = LatencyAggregator()
+    with FakeFirefly(transactions=50, page_size=10) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            client.add_hook(metrics)
+            client.fetch_transactions(parallel=True)
+            client.update_transaction_notes(3, "checked")
+    report = metrics.report()
+    listing = report["GET /api/v1/transactions"]
+    assert listing.calls == 5
+    assert listing.errors == 0
+    assert 0 < listing.p50 <= listing.p95
+    assert listing.payload_bytes > 0
+    assert report["GET /api/v1/transactions/{id}"].calls == 1
+    assert report["PUT /api/v1/transactions/{id}"].calls == 1
+
+    operations = {event.name: event for event in metrics.operations}
+    assert operations["fetch_transactions"].pages == 5
+    assert operations["fetch_transactions"].items == 50
+    assert operations["put_transaction"].pages == 0
+    assert "update_transaction_notes" in operations
+
+
+def test_events_carry_retries_and_errors() -> None:
+    """Test attempts, backoff and failures are reported on request events."""
+    events: List[Event] = []
+    policy = RetryPolicy(max_attempts=2, backoff_base=0.001)
+    with FakeFirefly(transactions=10, throttle_every=1) as server:
+        with FireflyClient(server.url, TOKEN, retry_policy=policy) as client:
+            client.add_hook(events.append)
+            with pytest.raises(RuntimeError):
+                client.fetch_transactions()
+            client.remove_hook(events.append)
+            assert not client.hooks
+    assert len(events) == 2
+    request, operation = events[0], events[1]
+    assert isinstance(request, RequestEvent)
+    assert request.attempts == 2
+    assert request.status == 429
+    assert request.error is not None and "429" in request.error
+    assert isinstance(operation, OperationEvent)
+    assert operation.error == request.error
+
+
+def test_calls_inside_except_blocks_succeed() -> None:
+    """Test an exception being handled by the caller is not reported."""
+    metrics = LatencyAggregator()
+    with FakeFirefly(transactions=5) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            client.add_hook(metrics)
+            try:
+                raise KeyError("unrelated")
+            except KeyError:
+                client.fetch_transactions()
+    assert metrics.report()["GET /api/v1/transactions"].errors == 0
+    assert [event.error for event in metrics.operations] == [None]
+
+
+def test_helpers() -> None:
+    """Test endpoint normalization and nearest-rank percentiles."""
+    assert (
+        endpoint_of("put", "http://x/api/v1/transactions/42?x=1")
+        == "PUT /api/v1/transactions/{id}"
+    )
+    assert percentile([], 0.5) == 0
+    assert percentile([3.0, 1.0, 2.0, 4.0], 0.5) == 2.0
+    assert percentile([float(i) for i in range(1, 101)], 0.95) == 95.0
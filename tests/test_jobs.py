@@ -0,0 +1,114 @@
+"""Tests for resumable enrichment jobs."""
+
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from fireflyiii_enricher_core.batch import TransactionUpdate
+from fireflyiii_enricher_core.firefly_client import FireflyClient
+from fireflyiii_enricher_core.jobs import CheckpointLog, run_job
+from tests.fake_firefly import FakeFirefly
+
+TOKEN = "test-token"
+
+
+class CrashError(Exception):
+    """Stands in for the process dying mid-run."""
+
+
+def test_resume_skips_completed_work(tmp_path: Path) -> None:
+    """Test a restarted job rereads only its last done page and skips done ids."""
+    with FakeFirefly(transactions=50, page_size=10) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+
+            def crashing(tx: Dict[str, Any]) -> TransactionUpdate:
+                if int(tx["id"]) == 25:
+                    raise CrashError
+                return TransactionUpdate(tag="enriched")
+
+            with CheckpointLog(tmp_path, "tagging") as checkpoint:
+                with pytest.raises(CrashError):
+                    run_job(client, checkpoint, crashing, limit=10)
+                assert checkpoint.last_page == 2
+                assert len(checkpoint.applied_ids()) == 20
+
+            server.requests.clear()
+            with CheckpointLog(tmp_path, "tagging") as checkpoint:
+                report = run_job(
+                    client,
+                    checkpoint,
+                    lambda tx: TransactionUpdate(tag="enriched"),
+                    limit=10,
+                    max_workers=4,
+                )
+            puts = [r for r in server.requests if r.startswith("PUT")]
+            gets = [r for r in server.requests if r.startswith("GET")]
+            assert (report.resumed_after_page, report.last_page) == (2, 5)
+            assert (report.pages, report.applied, report.failed) == (4, 30, [])
+            assert report.already_done == 10
+            assert len(puts) == 30 and len(gets) == 4
+            tags = [
+                tx["attributes"]["transactions"][0]["tags"]
+                for tx in server.transactions
+            ]
+            assert all(tag == ["enriched"] for tag in tags)
+
+
+@pytest.mark.parametrize("deleted, rechecked", [(3, 7), (12, 8)])
+def test_resume_after_deletions(tmp_path: Path, deleted: int, rechecked: int) -> None:
+    """
+    Test transactions shifted onto completed pages are still updated.
+
+    A few deletions are caught by rereading the last done page; more than a
+    page makes the job rescan from the first one.
+    """
+    with FakeFirefly(transactions=50, page_size=10) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+
+            def crashing(tx: Dict[str, Any]) -> TransactionUpdate:
+                if int(tx["id"]) == 25:
+                    raise CrashError
+                return TransactionUpdate(tag="enriched")
+
+            with CheckpointLog(tmp_path, "tagging") as checkpoint:
+                with pytest.raises(CrashError):
+                    run_job(client, checkpoint, crashing, limit=10)
+                assert (checkpoint.last_page, checkpoint.last_id) == (2, "20")
+
+            del server.transactions[:deleted]
+            with CheckpointLog(tmp_path, "tagging") as checkpoint:
+                report = run_job(
+                    client,
+                    checkpoint,
+                    lambda tx: TransactionUpdate(tag="enriched"),
+                    limit=10,
+                )
+    assert (report.applied, report.failed) == (30, [])
+    assert report.already_done == rechecked
+    tags = [tx["attributes"]["transactions"][0]["tags"] for tx in server.transactions]
+    assert all(tag == ["enriched"] for tag in tags)
+
+
+def test_failures_hold_back_the_checkpoint(tmp_path: Path) -> None:
+    """Test failed updates keep their page open and are retried."""
+    with FakeFirefly(transactions=20, page_size=10) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            with CheckpointLog(tmp_path / "jobs.sqlite", "notes") as checkpoint:
+                report = run_job(
+                    client,
+                    checkpoint,
+                    lambda tx: TransactionUpdate(
+                        category_name="Missing" if tx["id"] == "3" else None,
+                        notes="checked",
+                    ),
+                    limit=10,
+                )
+                assert len(report.failed) == 1
+                assert report.last_page == 0 and checkpoint.last_page == 0
+                assert len(checkpoint.applied_ids()) == 19
+
+                with pytest.raises(ValueError):
+                    run_job(client, checkpoint, lambda tx: None, limit=20)
+                checkpoint.reset()
+                assert checkpoint.last_page == 0 and not checkpoint.applied_ids()
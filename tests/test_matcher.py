@@ -0,0 +1,111 @@
+"""Tests for the transaction matchers."""
+
+from datetime import date
+
+from fireflyiii_enricher_core.firefly_client import (
+    SimplifiedItem,
+    SimplifiedTx,
+    simplify_splits,
+    simplify_transactions,
+)
+from fireflyiii_enricher_core.matcher import (
+    FuzzyTransactionMatcher,
+    IndexedTransactionMatcher,
+    TransactionMatcher,
+)
+from tests.fake_firefly import make_transaction
+
+
+def make_tx(tx_id: str, tx_date: date, amount: float) -> SimplifiedTx:
+    """Build a SimplifiedTx with placeholder text fields."""
+    return SimplifiedTx(
+        date=tx_date,
+        amount=amount,
+        id=tx_id,
+        description="",
+        tags=[],
+        notes="",
+        category="",
+    )
+
+
+def test_indexed_matcher_agrees_with_linear_scan() -> None:
+    """Test the hash index finds the same records as TransactionMatcher.match."""
+    records = [
+        SimplifiedItem(date(2024, 1, day % 28 + 1), -(day % 7) - 0.1)
+        for day in range(200)
+    ]
+    transactions = [
+        make_tx(str(i), date(2024, 1, i % 30 + 1), (i % 9) + 0.1) for i in range(60)
+    ]
+    matcher = IndexedTransactionMatcher(records)
+    for tx, matches in matcher.match_all(transactions):
+        assert matches == TransactionMatcher.match(tx, records)
+    assert len(matcher) == 200
+
+
+def test_match_uses_minor_units() -> None:
+    """Test float representation noise does not break exact matching."""
+    record = SimplifiedItem(date(2024, 5, 1), 0.1 + 0.2)
+    tx = make_tx("1", date(2024, 5, 1), -0.3)
+    assert TransactionMatcher.match_all([tx], [record]) == [(tx, [record])]
+
+
+def test_fuzzy_matcher_ranks_candidates() -> None:
+    """Test candidates inside the window are returned best match first."""
+    exact = SimplifiedItem(date(2024, 3, 10), -25.0)
+    later = SimplifiedItem(date(2024, 3, 12), -25.0)
+    rounded = SimplifiedItem(date(2024, 3, 10), -25.02)
+    too_late = SimplifiedItem(date(2024, 3, 14), -25.0)
+    too_far = SimplifiedItem(date(2024, 3, 10), -25.10)
+    matcher = FuzzyTransactionMatcher(
+        [too_far, too_late, rounded, later, exact],
+        date_window=3,
+        amount_tolerance=0.05,
+    )
+    candidates = matcher.candidates(make_tx("1", date(2024, 3, 10), 25.0))
+    assert [candidate.record for candidate in candidates] == [exact, rounded, later]
+    assert candidates[0].score == 1.0
+    assert candidates[1].amount_delta == 2
+    assert candidates[2].day_delta == 2
+
+
+def test_fuzzy_matcher_without_tolerance_is_exact() -> None:
+    """Test a zero window behaves like the exact matcher."""
+    records = [SimplifiedItem(date(2024, 1, d), -float(d)) for d in range(1, 29)]
+    transactions = [make_tx(str(d), date(2024, 1, d), d) for d in range(1, 29)]
+    fuzzy = FuzzyTransactionMatcher(records, date_window=0)
+    exact = IndexedTransactionMatcher(records)
+    for tx, candidates in fuzzy.match_all(transactions):
+        assert [candidate.record for candidate in candidates] == exact.match(tx)
+
+
+def test_compact_transactions_match_directly() -> None:
+    """Test CompactTx records are matched without converting them back."""
+    raw = [make_transaction(i) for i in range(300)]
+    raw[7]["attributes"]["transactions"][0]["category_name"] = "Food"
+    compact = simplify_transactions(raw, compact=True)
+    simplified = simplify_transactions(raw)
+    assert not hasattr(compact[0], "__dict__")
+    assert compact[7].amount_minor == 807
+    assert compact[7].date == simplified[7].date
+    assert compact[7].category == "Food"
+    records = [SimplifiedItem(tx.date, -tx.amount) for tx in simplified[::3]]
+    by_compact = IndexedTransactionMatcher(records).match_all(compact)
+    by_simplified = IndexedTransactionMatcher(records).match_all(simplified)
+    assert [m for _, m in by_compact] == [m for _, m in by_simplified]
+    fuzzy = FuzzyTransactionMatcher(compact, date_window=1)
+    assert fuzzy.candidates(records[0])[0].record is compact[0]
+
+
+def test_matching_individual_splits() -> None:
+    """Test bank records are matched against each split of a split transaction."""
+    splits = simplify_splits([make_transaction(4, splits=3), make_transaction(5)])
+    records = [SimplifiedItem(split.date, float(-split.amount)) for split in splits]
+    matched = IndexedTransactionMatcher(splits).match_all(records)
+    assert [[split.key for split in found] for _, found in matched] == [
+        [("5", 0)],
+        [("5", 1)],
+        [("5", 2)],
+        [("6", 0)],
+    ]
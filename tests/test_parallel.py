@@ -0,0 +1,60 @@
+"""Tests for the multi-process reconciliation pipeline."""
+
+from datetime import timedelta
+from typing import Any
+
+from fireflyiii_enricher_core.firefly_client import (
+    SimplifiedItem,
+    iter_simplified,
+    simplify_transactions,
+)
+from fireflyiii_enricher_core.matcher import FuzzyTransactionMatcher
+from fireflyiii_enricher_core.parallel import reconcile
+from fireflyiii_enricher_core.search import TransactionQuery
+from tests.fake_firefly import make_transaction
+
+
+def _data() -> tuple[list[dict[str, Any]], list[SimplifiedItem]]:
+    transactions = [make_transaction(i * 7 % 400, splits=1 + i % 3) for i in range(400)]
+    for tx in transactions[::4]:
+        tx["attributes"]["transactions"][0]["category_id"] = "1"
+    records = [
+        SimplifiedItem(tx.date + timedelta(days=i % 3 - 1), -tx.amount)
+        for i, tx in enumerate(simplify_transactions(transactions[::2]))
+    ]
+    return transactions, records
+
+
+def test_matches_do_not_depend_on_sharding() -> None:
+    """Test in-process, sharded and multi-process runs give identical results."""
+    transactions, records = _data()
+    query = TransactionQuery(without_category=True, single_part=True)
+    single = reconcile(
+        transactions, records, query=query, date_window=2, processes=1, shards=1
+    )
+    sharded = reconcile(
+        transactions, records, query=query, date_window=2, processes=1, shards=13
+    )
+    pooled = reconcile(transactions, records, query=query, date_window=2, processes=2)
+    assert single == sharded == pooled
+
+    kept = list(query.apply_all_locally(transactions))
+    matcher = FuzzyTransactionMatcher(records, date_window=2)
+    expected = sorted(
+        (int(tx.id), round(candidate.score, 9))
+        for tx in iter_simplified(kept)
+        for candidate in matcher.candidates(tx)
+    )
+    position = {str(tx["id"]): i for i, tx in enumerate(transactions)}
+    assert all(position[m.transaction_id] == m.tx_index for m in single)
+    assert (
+        sorted((int(m.transaction_id), round(m.score, 9)) for m in single) == expected
+    )
+    assert len(single) > 20
+
+
+def test_empty_inputs() -> None:
+    """Test nothing to match returns no matches without starting a pool."""
+    transactions, records = _data()
+    assert not reconcile([], records)
+    assert not reconcile(transactions, [])
@@ -0,0 +1,106 @@
+"""Tests for the dry-run update planner."""
+
+import pytest
+
+from fireflyiii_enricher_core.batch import TransactionUpdate, UpdateStatus
+from fireflyiii_enricher_core.firefly_client import FireflyClient
+from fireflyiii_enricher_core.planner import execute_plan, plan_updates
+from fireflyiii_enricher_core.updates import (
+    IdenticalDataError,
+    description_change,
+    notes_change,
+    tag_change,
+)
+from tests.fake_firefly import FakeFirefly, make_transaction
+
+TOKEN = "test-token"
+
+
+def test_identical_checks_are_exact() -> None:
+    """Test substrings of the current value are real changes."""
+    existing = {"data": make_transaction(0)}
+    split = existing["data"]["attributes"]["transactions"][0]
+    split.update(description="Shop 12", notes="paid by card", tags=["a"])
+    assert description_change(existing, "Shop 1") == {"description": "Shop 1"}
+    assert notes_change(existing, "paid") == {"notes": "paid"}
+    with pytest.raises(IdenticalDataError):
+        notes_change(existing, "paid by card")
+    with pytest.raises(IdenticalDataError):
+        tag_change(existing, "a")
+    assert tag_change(existing, "b") == {"tags": ["a", "b"]}
+    assert split["tags"] == ["a"]
+
+
+def test_plan_merges_and_diffs() -> None:
+    """Test updates are merged per transaction and current values dropped."""
+    transactions = [make_transaction(i) for i in range(4)]
+    transactions[1]["attributes"]["transactions"][0]["tags"] = ["done"]
+    transactions[3] = make_transaction(3, splits=2)
+    plan = plan_updates(
+        transactions,
+        [
+            ("1", TransactionUpdate(notes="a")),
+            ("1", TransactionUpdate(tag="done")),
+            ("1", TransactionUpdate(category_id=7)),
+            ("2", TransactionUpdate(tag="done", description="Shop 1")),
+            ("3", TransactionUpdate(notes="x")),
+            ("3", TransactionUpdate(notes="")),
+            ("4", TransactionUpdate(notes="second", split_index=1)),
+            ("4", TransactionUpdate(tag="t")),
+            ("99", TransactionUpdate(notes="x")),
+        ],
+        apply_rules=False,
+    )
+    assert [write.transaction_id for write in plan.writes] == ["1", "4"]
+    assert plan.writes[0].payload == {
+        "notes": "a",
+        "category_id": "7",
+        "tags": ["done"],
+    }
+    assert plan.writes[0].merged == 3
+    assert plan.writes[1].payload == [
+        {"transaction_journal_id": "4"},
+        {"transaction_journal_id": "1000031", "notes": "second"},
+    ]
+    assert plan.unchanged == ["2", "3"]
+    assert [tx_id for tx_id, _ in plan.errors] == ["4", "99"]
+    assert (len(plan), plan.requested, plan.field_changes) == (2, 9, 4)
+    report = plan.report()
+    assert "apply_rules=False, fire_webhooks=True" in report
+    assert "PUT 1 split 0 notes: '' -> 'a'" in report
+
+
+def test_execute_sends_one_put_per_transaction() -> None:
+    """Test execution writes only planned transactions with the batch flags."""
+    with FakeFirefly(transactions=10, categories=3) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            transactions = client.fetch_transactions()
+            updates = [
+                (tx["id"], change)
+                for tx in transactions[:5]
+                for change in (
+                    TransactionUpdate(tag="seen"),
+                    TransactionUpdate(category_name="Category 2"),
+                )
+            ]
+            plan = plan_updates(
+                transactions,
+                updates,
+                resolve_category=client.categories.resolve,
+                apply_rules=False,
+                fire_webhooks=False,
+            )
+            server.requests.clear()
+            results = execute_plan(client, plan)
+            again = plan_updates(transactions, updates[::2])
+    assert [result.status for result in results] == [UpdateStatus.APPLIED] * 5
+    assert sorted(server.requests) == [
+        f"PUT /api/v1/transactions/{i}" for i in range(1, 6)
+    ]
+    assert all(
+        payload["apply_rules"] is False and payload["fire_webhooks"] is False
+        for payload in server.payloads
+    )
+    stored = server.transactions[0]["attributes"]["transactions"][0]
+    assert (stored["tags"], stored["category_id"]) == (["seen"], "2")
+    assert not again.writes and len(again.unchanged) == 5
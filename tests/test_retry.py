@@ -0,0 +1,62 @@
+"""Tests for retries and adaptive rate limiting of the request layer."""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from fireflyiii_enricher_core.firefly_client import FireflyClient
+from fireflyiii_enricher_core.retry import RateLimiter, RetryPolicy, parse_retry_after
+from tests.fake_firefly import FakeFirefly
+
+TOKEN = "test-token"
+FAST_RETRY = RetryPolicy(max_attempts=5, backoff_base=0.001)
+
+
+def test_throttled_requests_are_retried() -> None:
+    """Test 429 answers are retried and counted while pages stay in order."""
+    limiter = RateLimiter(rate=1000, burst=10, min_rate=100)
+    with FakeFirefly(transactions=300, page_size=20, throttle_every=4) as server:
+        with FireflyClient(
+            server.url, TOKEN, retry_policy=FAST_RETRY, rate_limiter=limiter
+        ) as client:
+            result = client.fetch_transactions(parallel=True)
+            stats = client.request_stats
+        assert [tx["id"] for tx in result] == [str(i) for i in range(1, 301)]
+        assert stats.throttled == server.throttled > 0
+        assert stats.retries == stats.throttled
+        assert stats.requests == len(server.requests)
+    assert limiter.throttles == stats.throttled
+    assert limiter.acquired == stats.requests
+
+
+def test_without_retry_policy_errors_are_terminal() -> None:
+    """Test the default client still fails on the first 429."""
+    with FakeFirefly(transactions=10, throttle_every=1) as server:
+        with FireflyClient(server.url, TOKEN) as client:
+            with pytest.raises(RuntimeError, match="HTTP error: 429"):
+                client.fetch_transactions()
+            assert client.request_stats.failures == 1
+
+
+def test_backoff_and_retry_after() -> None:
+    """Test exponential backoff with jitter and Retry-After parsing."""
+    policy = RetryPolicy(backoff_base=1, backoff_max=5, jitter=0.5)
+    assert 1 <= policy.delay(2) <= 2
+    assert policy.delay(10) <= 5
+    assert policy.delay(1, retry_after=7.5) == 7.5
+    assert parse_retry_after("3") == 3
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 < (parse_retry_after(format_datetime(later, usegmt=True)) or 0) <= 30
+    assert parse_retry_after("soon") is None
+
+
+def test_rate_limiter_adapts() -> None:
+    """Test the bucket halves its rate on 429 and recovers on success."""
+    limiter = RateLimiter(rate=10, min_rate=4, increase_step=1)
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.rate == 4
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.rate == 10
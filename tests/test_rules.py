@@ -0,0 +1,76 @@
+"""Tests for compiled description rule sets."""
+
+import random
+
+import pytest
+
+from fireflyiii_enricher_core.batch import TransactionUpdate
+from fireflyiii_enricher_core.filters import filter_by_description
+from fireflyiii_enricher_core.rules import DescriptionRule, RuleSet
+from tests.fake_firefly import make_transaction
+
+
+def test_rule_kinds_and_order() -> None:
+    """Test exact, overlapping substring and regex rules in rule order."""
+    rules = RuleSet(
+        [
+            DescriptionRule(r"\bprime\b", kind="regex", tag="video"),
+            DescriptionRule("AMAZON", category="Shopping"),
+            DescriptionRule("amazon prime", category="Subscriptions"),
+            DescriptionRule("zon", tag="z"),
+            DescriptionRule("Straße", kind="exact", tag="street"),
+        ]
+    )
+    assert [r.pattern for r in rules.matches("Amazon Prime EU")] == [
+        r"\bprime\b",
+        "AMAZON",
+        "amazon prime",
+        "zon",
+    ]
+    assert rules.first("STRASSE") == rules.rules[4]
+    assert rules.first("Strassenbahn") is None
+    assert rules.matches("Zonk") == (rules.rules[3],)
+    with pytest.raises(ValueError):
+        RuleSet([DescriptionRule("")])
+
+
+def test_matches_agree_with_single_filters() -> None:
+    """Test one compiled pass equals one filter_by_description per rule."""
+    generator = random.Random(7)
+    transactions = [make_transaction(i) for i in range(300)]
+    for tx in transactions:
+        words = generator.choices(["ab", "ba", "abab", "shop", "b", "x"], k=3)
+        tx["attributes"]["transactions"][0]["description"] = " ".join(words)
+    patterns = ["ab", "bab", "b a", "shop", "x", "ab ab", "aba"]
+    rules = RuleSet([DescriptionRule(p) for p in patterns])
+    classified = {tx["id"]: rules_ for tx, rules_ in rules.classify(transactions)}
+    for pattern in patterns:
+        expected = {
+            tx["id"] for tx in filter_by_description(transactions, pattern, False)
+        }
+        assert {
+            tx_id
+            for tx_id, matched in classified.items()
+            if any(rule.pattern == pattern for rule in matched)
+        } == expected
+    assert rules.cache_info().hits > 0
+
+
+def test_updates_for_planner() -> None:
+    """Test updates take the first category and every tag."""
+    transactions = [make_transaction(i) for i in range(3)]
+    rules = RuleSet(
+        [
+            DescriptionRule("shop 1", kind="exact", category="One", tag="t"),
+            DescriptionRule("shop", category="Shops", tag="t"),
+            DescriptionRule("shop", tag="s"),
+        ]
+    )
+    updates = rules.updates(transactions)
+    assert updates[:3] == [
+        ("1", TransactionUpdate(category_name="Shops")),
+        ("1", TransactionUpdate(tag="t")),
+        ("1", TransactionUpdate(tag="s")),
+    ]
+    assert ("2", TransactionUpdate(category_name="One")) in updates
+    assert len(updates) == 9
@@ -0,0 +1,55 @@
+"""Tests for server-side transaction search queries."""
+
+from datetime import date
+
+from fireflyiii_enricher_core.firefly_client import (
+    FireflyClient,
+    filter_by_description,
+    filter_without_category,
+    filter_without_tag,
+)
+from fireflyiii_enricher_core.search import TransactionQuery
+from tests.fake_firefly import FakeFirefly
+
+TOKEN = "test-token"
+
+
+def test_to_search_string() -> None:
+    """Test predicates are translated into search operators."""
+    query = TransactionQuery(
+        without_category=True,
+        without_tags=("allegro done",),
+        description="allegro",
+        exact_description=False,
+        start_date=date(2024, 1, 1),
+    )
+    assert query.to_search_string() == (
+        'type:withdrawal has_no_category:true -tag_is:"allegro done" '
+        "description_contains:allegro date_after:2024-01-01"
+    )
+
+
+def test_fetch_matches_client_side_filters() -> None:
+    """Test the server-side query returns what the filter helpers would keep."""
+    with FakeFirefly(transactions=200, page_size=25) as server:
+        for tx in server.transactions[:40]:
+            tx["attributes"]["transactions"][0]["category_id"] = "1"
+        for tx in server.transactions[40:60]:
+            tx["attributes"]["transactions"][0]["tags"] = ["done"]
+        with FireflyClient(server.url, TOKEN) as client:
+            everything = client.fetch_transactions()
+            expected = filter_by_description(
+                filter_without_tag(filter_without_category(everything), "done"),
+                "shop 7",
+            )
+            server.requests.clear()
+            query = TransactionQuery(
+                without_category=True,
+                without_tags=("done",),
+                description="Shop 7",
+                single_part=True,
+            )
+            result = query.fetch(client)
+        assert result == expected
+        assert server.requests == ["GET /api/v1/search/transactions"]
+        assert list(query.apply_all_locally(everything)) == expected